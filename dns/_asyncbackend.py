@@ -98,3 +98,25 @@ class Backend:  # pragma: no cover
 
     async def wait_for(self, awaitable, timeout):
         raise NotImplementedError
+
+    def make_event(self):
+        """Return an event object with ``set()``, ``is_set()``, and an
+        awaitable ``wait()``."""
+        raise NotImplementedError
+
+    def make_task_group(self):
+        """Return an async context manager for running tasks concurrently.
+
+        The object it yields has ``start_soon(afn, *args)`` to start a task,
+        and ``cancel()`` to cancel all of its tasks.  Exiting the context
+        waits for all the tasks to finish.  Tasks must handle their own
+        exceptions, and the body of the context should not raise.
+        """
+        raise NotImplementedError
+
+    def spawn(self, afn, *args):
+        """Run ``afn(*args)`` in a background task and do not wait for it.
+
+        The task must handle its own exceptions.
+        """
+        raise NotImplementedError
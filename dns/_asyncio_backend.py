@@ -13,6 +13,10 @@ import dns.inet
 
 _is_win32 = sys.platform == "win32"
 
+# The event loop only keeps weak references to tasks, so we keep strong
+# references to background tasks until they are done.
+_background_tasks: set[asyncio.Task] = set()
+
 
 def _get_running_loop():
     try:
@@ -201,6 +205,30 @@ else:
     _HTTPTransport = dns._asyncbackend.NullTransport  # pyright: ignore
 
 
+class _TaskGroup:
+    def __init__(self):
+        self.tasks = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.cancel()
+        while self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        return False
+
+    def start_soon(self, afn, *args):
+        task = _get_running_loop().create_task(afn(*args))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def cancel(self):
+        for task in self.tasks:
+            task.cancel()
+
+
 class Backend(dns._asyncbackend.Backend):
     def name(self):
         return "asyncio"
@@ -263,3 +291,14 @@ class Backend(dns._asyncbackend.Backend):
 
     async def wait_for(self, awaitable, timeout):
         return await _maybe_wait_for(awaitable, timeout)
+
+    def make_event(self):
+        return asyncio.Event()
+
+    def make_task_group(self):
+        return _TaskGroup()
+
+    def spawn(self, afn, *args):
+        task = _get_running_loop().create_task(afn(*args))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
@@ -24,6 +24,43 @@ class SSLWantWriteError(Exception):
     pass
 
 
+class SSLZeroReturnError(Exception):
+    pass
+
+
+class SSLSession:
+    time: int = 0
+    timeout: int = 0
+
+
+class MemoryBIO:
+    def read(self, *args, **kwargs) -> bytes:  # pyright: ignore
+        raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
+
+    def write(self, *args, **kwargs) -> int:  # pyright: ignore
+        raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
+
+    def write_eof(self) -> None:
+        raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
+
+
+class SSLObject:
+    session: SSLSession | None = None
+    session_reused: bool = False
+
+    def do_handshake(self) -> None:
+        raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
+
+    def read(self, *args, **kwargs) -> bytes:  # pyright: ignore
+        raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
+
+    def write(self, *args, **kwargs) -> int:  # pyright: ignore
+        raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
+
+    def getpeercert(self) -> Any:
+        raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
+
+
 class SSLContext:
     def __init__(self) -> None:
         self.minimum_version: Any = TLSVersion.TLSv1_2
@@ -33,11 +70,17 @@ class SSLContext:
     def wrap_socket(self, *args, **kwargs) -> "SSLSocket":  # pyright: ignore
         raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
 
+    def wrap_bio(self, *args, **kwargs) -> SSLObject:  # pyright: ignore
+        raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
+
     def set_alpn_protocols(self, *args, **kwargs):  # pyright: ignore
         raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
 
 
 class SSLSocket:
+    session: SSLSession | None = None
+    session_reused: bool = False
+
     def pending(self) -> bool:
         raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
 
@@ -50,6 +93,9 @@ class SSLSocket:
     def getpeercert(self) -> Any:
         raise Exception("no ssl support")  # pylint: disable=broad-exception-raised
 
+    def close(self) -> None:
+        pass
+
     def __enter__(self):
         return self
 
@@ -189,6 +189,27 @@ else:
     _HTTPTransport = dns._asyncbackend.NullTransport  # pyright: ignore
 
 
+class _TaskGroup:
+    def __init__(self):
+        self.nursery_manager = trio.open_nursery()
+        self.nursery: trio.Nursery | None = None
+
+    async def __aenter__(self):
+        self.nursery = await self.nursery_manager.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return await self.nursery_manager.__aexit__(exc_type, exc_value, traceback)
+
+    def start_soon(self, afn, *args):
+        assert self.nursery is not None
+        self.nursery.start_soon(afn, *args)
+
+    def cancel(self):
+        assert self.nursery is not None
+        self.nursery.cancel_scope.cancel()
+
+
 class Backend(dns._asyncbackend.Backend):
     def name(self):
         return "trio"
@@ -253,3 +274,14 @@ class Backend(dns._asyncbackend.Backend):
         raise dns.exception.Timeout(
             timeout=timeout
         )  # pragma: no cover  lgtm[py/unreachable-statement]
+
+    def make_event(self):
+        return trio.Event()
+
+    def make_task_group(self):
+        return _TaskGroup()
+
+    def spawn(self, afn, *args):
+        # There is no nursery to hand, so the task is a system task, which
+        # is why it must not raise.
+        trio.lowlevel.spawn_system_task(afn, *args)
@@ -31,6 +31,7 @@ import dns.exception
 import dns.inet
 import dns.message
 import dns.name
+import dns.opcode
 import dns.quic
 import dns.rdatatype
 import dns.transaction
@@ -42,11 +43,17 @@ from dns.query import (
     HTTPVersion,
     NoDOH,
     NoDOQ,
+    TLSSessionCache,
     UDPMode,
     _check_status,
     _compute_times,
     _matches_destination,
+    _multiplexer_key,
+    _multiplexer_response_key,
     _remaining,
+    _ResponseFilter,
+    _resume_tls_session,
+    _save_tls_session,
     have_doh,
     make_ssl_context,
 )
@@ -142,6 +149,9 @@ async def receive_udp(
     :rtype: tuple
     """
 
+    response_filter = None
+    if ignore_errors and query is not None:
+        response_filter = _ResponseFilter(query)
     wire = b""
     while True:
         wire, from_address = await sock.recvfrom(65535, _timeout(expiration))
@@ -149,6 +159,8 @@ async def receive_udp(
             sock.family, from_address, destination, ignore_unexpected
         ):
             continue
+        if response_filter is not None and not response_filter.accepts(wire):
+            continue
         received_time = time.time()
         try:
             r = dns.message.from_wire(
@@ -314,6 +326,215 @@ async def udp_with_fallback(
         return (response, True)
 
 
+class _MultiplexerWaiter:
+    def __init__(self, backend: dns.asyncbackend.Backend) -> None:
+        self.items: list[Any] = []
+        self.event = backend.make_event()
+
+    def put(self, item: Any) -> None:
+        self.items.append(item)
+        self.event.set()
+
+
+class UDPMultiplexer:
+    """Send many concurrent UDP queries over a small pool of sockets.
+
+    This is the asynchronous version of :py:class:`dns.query.UDPMultiplexer`.
+    Responses are received by a background task per socket.  A multiplexer
+    must only be used with one backend and event loop, and should be closed
+    when it is no longer needed, e.g. by using it as an asynchronous context
+    manager.
+    """
+
+    def __init__(self, sockets: int = 4) -> None:
+        if sockets < 1:
+            raise ValueError("sockets must be at least 1")
+        self.sockets = sockets
+        self._closed = False
+        self._pools: dict[int, list[dns.asyncbackend.DatagramSocket]] = {}
+        self._pending: dict[tuple, _MultiplexerWaiter] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+
+    async def close(self) -> None:
+        """Close the multiplexer's sockets.  Queries which are still waiting
+        for responses raise :py:exc:`EOFError`."""
+        if self._closed:
+            return
+        self._closed = True
+        pools = list(self._pools.values())
+        self._pools = {}
+        for pool in pools:
+            for s in pool:
+                await s.close()
+        for waiter in self._pending.values():
+            waiter.put(EOFError("multiplexer closed"))
+
+    async def _pool(
+        self, af: int, backend: dns.asyncbackend.Backend
+    ) -> list[dns.asyncbackend.DatagramSocket]:
+        # Get the sockets for the address family, creating them and their
+        # receiver tasks if needed.
+        if self._closed:
+            raise EOFError("multiplexer closed")
+        pool = self._pools.get(af)
+        if pool is not None:
+            return pool
+        pool = []
+        try:
+            for _ in range(self.sockets):
+                s = await backend.make_socket(
+                    af, socket.SOCK_DGRAM, 0, (dns.inet.any_for_af(af), 0)
+                )
+                pool.append(s)
+        except Exception:
+            for s in pool:
+                await s.close()
+            raise
+        if self._closed or af in self._pools:
+            # We lost a race with close() or another query.
+            for s in pool:
+                await s.close()
+            return await self._pool(af, backend)
+        self._pools[af] = pool
+        for index, s in enumerate(pool):
+            backend.spawn(self._receive, af, index, s)
+        return pool
+
+    async def _receive(
+        self, af: int, index: int, s: dns.asyncbackend.DatagramSocket
+    ) -> None:
+        while True:
+            try:
+                wire, from_address = await s.recvfrom(65535, None)
+            except OSError:
+                if self._closed:
+                    return
+                # E.g. an ICMP error for an earlier query; the query will
+                # time out.
+                continue
+            except Exception:
+                # The socket was closed.
+                return
+            received_time = time.time()
+            key = _multiplexer_response_key(af, from_address, wire)
+            if key is None:
+                continue
+            waiter = self._pending.get((index,) + key)
+            if waiter is not None:
+                waiter.put((wire, received_time))
+
+    async def query(
+        self,
+        q: dns.message.Message,
+        where: str,
+        timeout: float | None = None,
+        port: int = 53,
+        one_rr_per_rrset: bool = False,
+        ignore_trailing: bool = False,
+        raise_on_truncation: bool = False,
+        backend: dns.asyncbackend.Backend | None = None,
+        ignore_errors: bool = False,
+    ) -> dns.message.Message:
+        """Return the response obtained after sending a query via UDP.
+
+        The parameters are as for :py:func:`dns.asyncquery.udp`.  Responses
+        from unexpected sources are always ignored.
+        """
+
+        if not backend:
+            backend = dns.asyncbackend.get_default_backend()
+        if backend.datagram_connection_required():
+            # We can't share unconnected sockets.
+            return await udp(
+                q,
+                where,
+                timeout,
+                port,
+                ignore_unexpected=True,
+                one_rr_per_rrset=one_rr_per_rrset,
+                ignore_trailing=ignore_trailing,
+                raise_on_truncation=raise_on_truncation,
+                backend=backend,
+                ignore_errors=ignore_errors,
+            )
+        wire = q.to_wire()
+        begin_time, expiration = _compute_times(timeout)
+        af = dns.inet.af_for_address(where)
+        destination = _lltuple((where, port), af)
+        key = _multiplexer_key(af, destination, q.id)
+        pool = await self._pool(af, backend)
+        # Use a random socket, avoiding any already waiting for a response
+        # with this ID from this nameserver.
+        start = random.randrange(len(pool))
+        for i in range(len(pool)):
+            index = (start + i) % len(pool)
+            if (index,) + key not in self._pending:
+                break
+        else:
+            return await udp(
+                q,
+                where,
+                timeout,
+                port,
+                ignore_unexpected=True,
+                one_rr_per_rrset=one_rr_per_rrset,
+                ignore_trailing=ignore_trailing,
+                raise_on_truncation=raise_on_truncation,
+                backend=backend,
+                ignore_errors=ignore_errors,
+            )
+        waiter = _MultiplexerWaiter(backend)
+        self._pending[(index,) + key] = waiter
+        response_filter = _ResponseFilter(q) if ignore_errors else None
+        try:
+            await send_udp(pool[index], wire, destination, expiration)
+            while True:
+                if not waiter.items:
+                    waiter.event = backend.make_event()
+                    await backend.wait_for(waiter.event.wait(), _timeout(expiration))
+                    continue
+                item = waiter.items.pop(0)
+                if isinstance(item, Exception):
+                    raise item
+                response_wire, received_time = item
+                if response_filter is not None and not response_filter.accepts(
+                    response_wire
+                ):
+                    continue
+                try:
+                    r = dns.message.from_wire(
+                        response_wire,
+                        keyring=q.keyring,
+                        request_mac=q.mac,
+                        one_rr_per_rrset=one_rr_per_rrset,
+                        ignore_trailing=ignore_trailing,
+                        raise_on_truncation=raise_on_truncation,
+                    )
+                except dns.message.Truncated as e:
+                    # See the comment in query.py for details.
+                    if ignore_errors and not q.is_response(e.message()):
+                        continue
+                    raise
+                except Exception:
+                    if ignore_errors:
+                        continue
+                    raise
+                if not q.is_response(r):
+                    if ignore_errors:
+                        continue
+                    raise BadResponse
+                r.time = received_time - begin_time
+                return r
+        finally:
+            self._pending.pop((index,) + key, None)
+
+
 async def send_tcp(
     sock: dns.asyncbackend.StreamSocket,
     what: dns.message.Message | bytes,
@@ -448,6 +669,106 @@ async def tcp(
         return r
 
 
+class _TLSStreamSocket(dns.asyncbackend.StreamSocket):
+    """A TLS stream socket layered over a plain backend stream socket using
+    an :py:class:`ssl.SSLObject`.
+
+    The backends' own TLS support gives no access to the TLS session, so
+    this is used when sessions are to be resumed.
+    """
+
+    def __init__(
+        self,
+        sock: dns.asyncbackend.StreamSocket,
+        ssl_context: ssl.SSLContext,
+        server_hostname: str | None,
+    ) -> None:
+        super().__init__(sock.family, socket.SOCK_STREAM)
+        self.sock = sock
+        # The BIOs are typed as Any because pyright gets confused between the
+        # _no_ssl compatibility types and the real ones.
+        self.incoming: Any = ssl.MemoryBIO()
+        self.outgoing: Any = ssl.MemoryBIO()
+        self.ssl = ssl_context.wrap_bio(
+            self.incoming,
+            self.outgoing,
+            server_side=False,
+            server_hostname=server_hostname,
+        )
+
+    async def _flush(self, timeout):
+        data = self.outgoing.read()
+        if data:
+            await self.sock.sendall(data, timeout)
+
+    async def _fill(self, timeout):
+        data = await self.sock.recv(65535, timeout)
+        if data == b"":
+            self.incoming.write_eof()
+        else:
+            self.incoming.write(data)
+
+    async def handshake(self, expiration: float | None) -> None:
+        while True:
+            try:
+                self.ssl.do_handshake()
+                break
+            except ssl.SSLWantReadError:
+                await self._flush(_timeout(expiration))
+                await self._fill(_timeout(expiration))
+        await self._flush(_timeout(expiration))
+
+    async def sendall(self, what, timeout):
+        self.ssl.write(what)
+        await self._flush(timeout)
+
+    async def recv(self, size, timeout):
+        while True:
+            try:
+                return self.ssl.read(size)
+            except ssl.SSLWantReadError:
+                await self._flush(timeout)
+                await self._fill(timeout)
+            except ssl.SSLZeroReturnError:
+                return b""
+
+    async def close(self):
+        await self.sock.close()
+
+    async def getpeername(self):
+        return await self.sock.getpeername()
+
+    async def getsockname(self):
+        return await self.sock.getsockname()
+
+    async def getpeercert(self, timeout):
+        return self.ssl.getpeercert()
+
+
+async def _make_tls_session_socket(
+    backend: dns.asyncbackend.Backend,
+    af: int,
+    source: Any,
+    destination: Any,
+    expiration: float | None,
+    ssl_context: ssl.SSLContext,
+    server_hostname: str | None,
+    session_cache: TLSSessionCache,
+    session_key: tuple,
+) -> _TLSStreamSocket:
+    sock = await backend.make_socket(
+        af, socket.SOCK_STREAM, 0, source, destination, _timeout(expiration)
+    )
+    try:
+        s = _TLSStreamSocket(sock, ssl_context, server_hostname)
+        _resume_tls_session(s.ssl, session_cache, session_key)
+        await s.handshake(expiration)
+    except Exception:
+        await sock.close()
+        raise
+    return s
+
+
 async def tls(
     q: dns.message.Message,
     where: str,
@@ -462,13 +783,15 @@ async def tls(
     ssl_context: ssl.SSLContext | None = None,
     server_hostname: str | None = None,
     verify: bool | str = True,
+    session_cache: TLSSessionCache | None = None,
 ) -> dns.message.Message:
     """Return the response obtained after sending a query via TLS.
 
     :param sock: The socket to use. If ``None`` (the default), a socket is
         created. Note that if a socket is provided, it must be a connected
         SSL stream socket, and *where*, *port*, *source*, *source_port*,
-        *backend*, *ssl_context*, and *server_hostname* are ignored.
+        *backend*, *ssl_context*, *server_hostname*, and *session_cache* are
+        ignored.
     :type sock: :py:class:`dns.asyncbackend.StreamSocket` or ``None``
     :param backend: The async backend. If ``None`` (the default), dnspython
         will use the default backend.
@@ -478,26 +801,46 @@ async def tls(
     parameters, exceptions, and return type of this method.
     """
     begin_time, expiration = _compute_times(timeout)
+    session_key = None
     if sock:
         cm: contextlib.AbstractAsyncContextManager = NullContext(sock)
     else:
         if ssl_context is None:
-            ssl_context = make_ssl_context(verify, server_hostname is not None, ["dot"])
+            if session_cache is not None:
+                ssl_context = session_cache.ssl_context(verify, server_hostname)
+            else:
+                ssl_context = make_ssl_context(
+                    verify, server_hostname is not None, ["dot"]
+                )
         af = dns.inet.af_for_address(where)
         stuple = _source_tuple(af, source, source_port)
         dtuple = (where, port)
         if not backend:
             backend = dns.asyncbackend.get_default_backend()
-        cm = await backend.make_socket(
-            af,
-            socket.SOCK_STREAM,
-            0,
-            stuple,
-            dtuple,
-            timeout,
-            ssl_context,
-            server_hostname,
-        )
+        if session_cache is not None:
+            session_key = (_lltuple(dtuple, af), server_hostname, ssl_context)
+            cm = await _make_tls_session_socket(
+                backend,
+                af,
+                stuple,
+                dtuple,
+                expiration,
+                ssl_context,
+                server_hostname,
+                session_cache,
+                session_key,
+            )
+        else:
+            cm = await backend.make_socket(
+                af,
+                socket.SOCK_STREAM,
+                0,
+                stuple,
+                dtuple,
+                timeout,
+                ssl_context,
+                server_hostname,
+            )
     async with cm as s:
         timeout = _timeout(expiration)
         response = await tcp(
@@ -512,11 +855,336 @@ async def tls(
             s,
             backend,
         )
+        if session_key is not None:
+            # With TLS 1.3, the session is only available once we have read
+            # something after the handshake.
+            _save_tls_session(cast(_TLSStreamSocket, s).ssl, session_cache, session_key)
         end_time = time.time()
         response.time = end_time - begin_time
         return response
 
 
+class _PooledConnection:
+    """A TCP or TLS connection over which queries are pipelined.
+
+    A background task reads the responses and hands them to the queries
+    they answer.
+    """
+
+    def __init__(self, backend: dns.asyncbackend.Backend) -> None:
+        self.sock: Any = None
+        self.backend = backend
+        # Set when the connection attempt has finished, successfully or not.
+        self.connected = backend.make_event()
+        self.closed = False
+        self.pending: dict[int, _MultiplexerWaiter] = {}
+        self.sending = False
+        self.sent = backend.make_event()
+        self.error: Exception | None = None
+        self.last_used = time.time()
+
+    async def connect(self, connect: Any, expiration: float | None) -> None:
+        try:
+            sock = await connect(self.backend, _timeout(expiration))
+            if self.closed:
+                await sock.close()
+                raise EOFError("connection pool closed")
+            self.sock = sock
+            self.backend.spawn(self._receive)
+        except BaseException as e:
+            self._fail(e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self.connected.set()
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                ldata = await _read_exactly(self.sock, 2, None)
+                (l,) = struct.unpack("!H", ldata)
+                wire = await _read_exactly(self.sock, l, None)
+                if len(wire) < 2:
+                    continue
+                waiter = self.pending.get(int.from_bytes(wire[:2], "big"))
+                # If there is no waiter, it is a late response to a query
+                # which timed out, and we drop it.
+                if waiter is not None:
+                    waiter.put(wire)
+        except Exception as e:
+            self._fail(e)
+            await self.sock.close()
+
+    def _fail(self, e: BaseException) -> None:
+        if self.error is None:
+            if not isinstance(e, Exception):
+                # The task using the connection was cancelled; the other
+                # queries on it must not see the cancellation.
+                e = EOFError("connection abandoned")
+            self.error = e
+            for waiter in self.pending.values():
+                waiter.put(e)
+
+    async def exchange(self, id: int, tcpmsg: bytes, expiration: float | None) -> bytes:
+        """Send *tcpmsg*, the length-prefixed query with ID *id*, and return
+        the wire format of its response.  The caller must have reserved
+        *id* in *pending*."""
+        waiter = self.pending[id]
+        try:
+            await self.backend.wait_for(self.connected.wait(), _timeout(expiration))
+            if self.error is not None:
+                raise self.error
+            # Only one task may send at a time.
+            while self.sending:
+                await self.backend.wait_for(self.sent.wait(), _timeout(expiration))
+            self.sending = True
+            self.sent = self.backend.make_event()
+            try:
+                await self.sock.sendall(tcpmsg, _timeout(expiration))
+            except BaseException as e:
+                # We may have sent part of the message, even if we were
+                # cancelled, so the connection is unusable.
+                self._fail(e)
+                raise
+            finally:
+                self.sending = False
+                self.sent.set()
+            while not waiter.items:
+                waiter.event = self.backend.make_event()
+                await self.backend.wait_for(waiter.event.wait(), _timeout(expiration))
+            item = waiter.items[0]
+            if isinstance(item, Exception):
+                raise item
+            return item
+        finally:
+            del self.pending[id]
+            self.last_used = time.time()
+
+    async def close(self) -> None:
+        self.closed = True
+        self._fail(EOFError("connection pool closed"))
+        if self.sock is not None:
+            await self.sock.close()
+
+
+class ConnectionPool:
+    """A pool of persistent TCP and TLS connections to nameservers.
+
+    This is the asynchronous version of :py:class:`dns.query.ConnectionPool`.
+    A pool must only be used with one backend and event loop, and should be
+    closed when it is no longer needed, e.g. by using it as an asynchronous
+    context manager.
+    """
+
+    def __init__(self, max_pipelined: int = 100, idle_timeout: float = 30.0) -> None:
+        if max_pipelined < 1:
+            raise ValueError("max_pipelined must be at least 1")
+        self.max_pipelined = max_pipelined
+        self.idle_timeout = idle_timeout
+        self._closed = False
+        self._connections: dict[tuple, list[_PooledConnection]] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+
+    async def close(self) -> None:
+        """Close all of the pool's connections."""
+        self._closed = True
+        connections = self._connections
+        self._connections = {}
+        for pool in connections.values():
+            for connection in pool:
+                await connection.close()
+
+    async def _reserve(
+        self, key: tuple, id: int, backend: dns.asyncbackend.Backend
+    ) -> _PooledConnection | None:
+        # Find a connection which can take another query with this ID, and
+        # reserve the ID on it.
+        if self._closed:
+            raise EOFError("connection pool closed")
+        pool = self._connections.get(key, [])
+        now = time.time()
+        for connection in pool[:]:
+            if connection.error is not None or (
+                not connection.pending
+                and now - connection.last_used > self.idle_timeout
+            ):
+                pool.remove(connection)
+                await connection.close()
+                continue
+            if (
+                len(connection.pending) < self.max_pipelined
+                and id not in connection.pending
+            ):
+                connection.pending[id] = _MultiplexerWaiter(backend)
+                return connection
+        return None
+
+    async def _query(
+        self,
+        q: dns.message.Message,
+        key: tuple,
+        connect: Any,
+        timeout: float | None,
+        one_rr_per_rrset: bool,
+        ignore_trailing: bool,
+        backend: dns.asyncbackend.Backend | None,
+        connected: Any = None,
+    ) -> dns.message.Message:
+        if not backend:
+            backend = dns.asyncbackend.get_default_backend()
+        tcpmsg = q.to_wire(prepend_length=True)
+        begin_time, expiration = _compute_times(timeout)
+        while True:
+            connection = await self._reserve(key, q.id, backend)
+            reused = connection is not None
+            if connection is None:
+                # Queries made while we connect will wait for this connection
+                # rather than making their own.
+                connection = _PooledConnection(backend)
+                connection.pending[q.id] = _MultiplexerWaiter(backend)
+                self._connections.setdefault(key, []).append(connection)
+                await connection.connect(connect, expiration)
+            try:
+                wire = await connection.exchange(q.id, tcpmsg, expiration)
+                if not reused and connected is not None:
+                    # The first response on a new connection has arrived.
+                    connected(connection.sock)
+                break
+            except (EOFError, ConnectionError):
+                # The nameserver may have closed an idle connection just as
+                # we reused it, so try once more with a new one.
+                if not reused:
+                    raise
+        received_time = time.time()
+        r = dns.message.from_wire(
+            wire,
+            keyring=q.keyring,
+            request_mac=q.mac,
+            one_rr_per_rrset=one_rr_per_rrset,
+            ignore_trailing=ignore_trailing,
+        )
+        r.time = received_time - begin_time
+        if not q.is_response(r):
+            raise BadResponse
+        return r
+
+    async def tcp(
+        self,
+        q: dns.message.Message,
+        where: str,
+        timeout: float | None = None,
+        port: int = 53,
+        one_rr_per_rrset: bool = False,
+        ignore_trailing: bool = False,
+        backend: dns.asyncbackend.Backend | None = None,
+    ) -> dns.message.Message:
+        """Return the response obtained after sending a query via TCP.
+
+        The parameters are as for :py:func:`dns.asyncquery.tcp`.
+        """
+
+        af = dns.inet.af_for_address(where)
+
+        async def connect(backend, timeout):
+            return await backend.make_socket(
+                af, socket.SOCK_STREAM, 0, None, (where, port), timeout
+            )
+
+        return await self._query(
+            q,
+            (_lltuple((where, port), af),),
+            connect,
+            timeout,
+            one_rr_per_rrset,
+            ignore_trailing,
+            backend,
+        )
+
+    async def tls(
+        self,
+        q: dns.message.Message,
+        where: str,
+        timeout: float | None = None,
+        port: int = 853,
+        one_rr_per_rrset: bool = False,
+        ignore_trailing: bool = False,
+        backend: dns.asyncbackend.Backend | None = None,
+        ssl_context: ssl.SSLContext | None = None,
+        server_hostname: str | None = None,
+        verify: bool | str = True,
+        session_cache: TLSSessionCache | None = None,
+    ) -> dns.message.Message:
+        """Return the response obtained after sending a query via TLS.
+
+        The parameters are as for :py:func:`dns.asyncquery.tls`.
+        """
+
+        af = dns.inet.af_for_address(where)
+        destination = _lltuple((where, port), af)
+        if ssl_context is None and session_cache is not None:
+            ssl_context = session_cache.ssl_context(verify, server_hostname)
+        if ssl_context is None:
+            key: tuple = (destination, server_hostname, verify)
+        else:
+            key = (destination, server_hostname, ssl_context)
+
+        if session_cache is not None:
+            assert ssl_context is not None
+            context = ssl_context
+
+            async def connect_session(backend, timeout):
+                return await _make_tls_session_socket(
+                    backend,
+                    af,
+                    None,
+                    (where, port),
+                    _compute_times(timeout)[1],
+                    context,
+                    server_hostname,
+                    session_cache,
+                    key,
+                )
+
+            def connected(s):
+                _save_tls_session(s.ssl, session_cache, key)
+
+            return await self._query(
+                q,
+                key,
+                connect_session,
+                timeout,
+                one_rr_per_rrset,
+                ignore_trailing,
+                backend,
+                connected,
+            )
+
+        async def connect(backend, timeout):
+            context = ssl_context
+            if context is None:
+                context = make_ssl_context(verify, server_hostname is not None, ["dot"])
+            return await backend.make_socket(
+                af,
+                socket.SOCK_STREAM,
+                0,
+                None,
+                (where, port),
+                timeout,
+                context,
+                server_hostname,
+            )
+
+        return await self._query(
+            q, key, connect, timeout, one_rr_per_rrset, ignore_trailing, backend
+        )
+
+
 def _maybe_get_resolver(
     resolver: "dns.asyncresolver.Resolver | None",  # pyright: ignore
 ) -> "dns.asyncresolver.Resolver":  # pyright: ignore
@@ -750,7 +1418,11 @@ async def _http3(
                     where, port, source, source_port
                 )
             start, expiration = _compute_times(timeout)
-            stream = await the_connection.make_stream(timeout)  # type: ignore
+            # Queries are replayable, so may be sent as 0-RTT data.
+            early_data = q.opcode() == dns.opcode.QUERY
+            stream = await the_connection.make_stream(  # type: ignore
+                timeout, early_data
+            )
             async with stream:
                 # note that send_h3() does not need await
                 stream.send_h3(url, wire, post)
@@ -823,7 +1495,11 @@ async def quic(
                     where, port, source, source_port
                 )
             start, expiration = _compute_times(timeout)
-            stream = await the_connection.make_stream(timeout)  # type: ignore
+            # Queries are replayable, so may be sent as 0-RTT data.
+            early_data = q.opcode() == dns.opcode.QUERY
+            stream = await the_connection.make_stream(  # type: ignore
+                timeout, early_data
+            )
             async with stream:
                 await stream.send(wire, True)
                 wire = await stream.receive(_remaining(expiration))
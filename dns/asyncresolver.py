@@ -17,14 +17,18 @@
 
 """Asynchronous DNS stub resolver."""
 
+import collections
 import socket
 import time
+from collections.abc import AsyncIterator, Iterable
 from typing import Any
 
 import dns._ddr
 import dns.asyncbackend
 import dns.asyncquery
+import dns.exception
 import dns.inet
+import dns.message
 import dns.name
 import dns.nameserver
 import dns.query
@@ -44,6 +48,21 @@ _tcp = dns.asyncquery.tcp
 class Resolver(dns.resolver.BaseResolver):
     """Asynchronous DNS stub resolver."""
 
+    hedge_delay: float | None
+    hedge_adaptive: bool
+
+    def reset(self) -> None:
+        """Reset all resolver configuration to the defaults."""
+
+        super().reset()
+        self.hedge_delay = None
+        self.hedge_adaptive = False
+
+    def _uses_nameserver_statistics(self) -> bool:
+        return self.rtt_selection or (
+            self.hedge_delay is not None and self.hedge_adaptive
+        )
+
     async def resolve(
         self,
         qname: dns.name.Name | str,
@@ -73,42 +92,270 @@ class Resolver(dns.resolver.BaseResolver):
         )
         if not backend:
             backend = dns.asyncbackend.get_default_backend()
+        return await self._coalesced_resolve(
+            resolution, source, source_port, lifetime, backend
+        )
+
+    async def _coalesced_resolve(
+        self,
+        resolution: dns.resolver._Resolution,
+        source: str | None,
+        source_port: int,
+        lifetime: float | None,
+        backend: dns.asyncbackend.Backend,
+    ) -> dns.resolver.Answer:
+        """Run *resolution*, sharing it with concurrent identical resolutions
+        if query coalescing is enabled."""
+        raise_on_no_answer = resolution.raise_on_no_answer
+        flight_key = self._flight_key(resolution)
+        if flight_key is None:
+            return await self._resolve(
+                resolution, source, source_port, lifetime, backend
+            )
+        # A flight's event can only be waited for in the event loop which
+        # made it, so resolutions in different loops are not coalesced.
+        key = (flight_key, dns.nameserver._current_event_loop(backend))
         start = time.time()
         while True:
-            request, answer = resolution.next_request()
-            # Note we need to say "if answer is not None" and not just
-            # "if answer" because answer implements __len__, and python
-            # will call that.  We want to return if we have an answer
-            # object, including in cases where its length is 0.
-            if answer is not None:
-                # cache hit!
-                return answer
-            assert request is not None  # needed for type checking
-            done = False
-            while not done:
-                nameserver, tcp, backoff = resolution.next_nameserver()
-                if backoff:
-                    await backend.sleep(backoff)
-                timeout = self._compute_timeout(start, lifetime, resolution.errors)
-                try:
-                    response = await nameserver.async_query(
-                        request,
-                        timeout=timeout,
-                        source=source,
-                        source_port=source_port,
-                        max_size=tcp,
-                        backend=backend,
-                    )
-                except Exception as ex:
-                    _, done = resolution.query_result(None, ex)
-                    continue
-                answer, done = resolution.query_result(response, None)
+            flight, leader = self._join_flight(key, backend.make_event)
+            if leader:
+                break
+            try:
+                await backend.wait_for(
+                    flight.event.wait(), self._remaining_lifetime(start, lifetime)
+                )
+            except dns.exception.Timeout:
+                raise dns.resolver.LifetimeTimeout(
+                    timeout=time.time() - start, errors=[]
+                )
+            if not flight.abandoned():
+                return flight.result(raise_on_no_answer)
+        # We are the leader.  The NoAnswer check is done by each waiter.
+        resolution.raise_on_no_answer = False
+        try:
+            flight.answer = await self._resolve(
+                resolution, source, source_port, lifetime, backend
+            )
+        except BaseException as e:
+            flight.exception = e
+            raise
+        finally:
+            self._end_flight(key, flight)
+        return flight.result(raise_on_no_answer)
+
+    async def _resolve(
+        self,
+        resolution: dns.resolver._Resolution,
+        source: str | None,
+        source_port: int,
+        lifetime: float | None,
+        backend: dns.asyncbackend.Backend,
+    ) -> dns.resolver.Answer:
+        start = time.time()
+        shortened = False
+        try:
+            while True:
+                request, answer = resolution.next_request()
                 # Note we need to say "if answer is not None" and not just
                 # "if answer" because answer implements __len__, and python
                 # will call that.  We want to return if we have an answer
                 # object, including in cases where its length is 0.
                 if answer is not None:
+                    # cache hit!
+                    if resolution.prefetch:
+                        self._prefetch(
+                            resolution, source, source_port, lifetime, backend
+                        )
                     return answer
+                assert request is not None  # needed for type checking
+                request_lifetime, shortened = self._request_lifetime(
+                    resolution, lifetime
+                )
+                if self.hedge_delay is not None:
+                    answer = await self._hedged_exchange(
+                        resolution,
+                        request,
+                        start,
+                        request_lifetime,
+                        source,
+                        source_port,
+                        backend,
+                    )
+                    if answer is not None:
+                        return answer
+                    continue
+                done = False
+                while not done:
+                    nameserver, tcp, backoff = resolution.next_nameserver()
+                    if backoff:
+                        await backend.sleep(backoff)
+                    timeout = self._compute_timeout(
+                        start, request_lifetime, resolution.errors
+                    )
+                    try:
+                        response = await nameserver.async_query(
+                            request,
+                            timeout=timeout,
+                            source=source,
+                            source_port=source_port,
+                            max_size=tcp,
+                            backend=backend,
+                        )
+                    except Exception as ex:
+                        _, done = resolution.query_result(None, ex)
+                        continue
+                    answer, done = resolution.query_result(response, None)
+                    # Note we need to say "if answer is not None" and not just
+                    # "if answer" because answer implements __len__, and python
+                    # will call that.  We want to return if we have an answer
+                    # object, including in cases where its length is 0.
+                    if answer is not None:
+                        return answer
+        except (dns.resolver.LifetimeTimeout, dns.resolver.NoNameservers):
+            answer = resolution.stale_answer()
+            if answer is None:
+                raise
+            if shortened:
+                # We gave up waiting to serve stale, but keep trying to
+                # refresh the answer.
+                self._prefetch(resolution, source, source_port, lifetime, backend)
+            if answer.rrset is None and resolution.raise_on_no_answer:
+                raise NoAnswer(response=answer.response)
+            return answer
+
+    def _hedge_delay(self, nameserver: dns.nameserver.Nameserver) -> float:
+        """How long to wait for *nameserver* before also querying the next
+        nameserver."""
+        assert self.hedge_delay is not None
+        if self.hedge_adaptive:
+            statistics = self._get_nameserver_statistics(nameserver)
+            if statistics is not None and statistics.srtt is not None:
+                # Approximately the 95th percentile of the RTT, assuming it
+                # is normally distributed.
+                return statistics.srtt + 2 * statistics.rttvar
+        return self.hedge_delay
+
+    async def _hedged_exchange(
+        self,
+        resolution: dns.resolver._Resolution,
+        request: dns.message.QueryMessage,
+        start: float,
+        lifetime: float | None,
+        source: str | None,
+        source_port: int,
+        backend: dns.asyncbackend.Backend,
+    ) -> dns.resolver.Answer | None:
+        """Query the nameservers for *request*, starting a query to the next
+        nameserver whenever the outstanding ones have not answered within the
+        hedge delay.
+
+        The first usable response wins and the other queries are cancelled.
+        Returns the answer, or ``None`` if the query name does not exist and
+        the resolution should move on to the next query name.
+        """
+
+        # Each result is a (nameserver, tcp, query_start, response, exception)
+        # tuple.  Whenever a query finishes, it appends its result and sets
+        # the current wakeup event.
+        results: list[tuple[Any, bool, float, Any, Exception | None]] = []
+        wakeup = [backend.make_event()]
+
+        async def attempt(nameserver, tcp, query_start, timeout):
+            try:
+                response = await nameserver.async_query(
+                    request,
+                    timeout=timeout,
+                    source=source,
+                    source_port=source_port,
+                    max_size=tcp,
+                    backend=backend,
+                )
+                results.append((nameserver, tcp, query_start, response, None))
+            except Exception as ex:
+                results.append((nameserver, tcp, query_start, None, ex))
+            wakeup[0].set()
+
+        answer = None
+        error = None
+        async with backend.make_task_group() as tg:
+            try:
+                outstanding = 0
+                hedge_at = 0.0
+                done = False
+                while not done:
+                    can_hedge = resolution.retry_with_tcp or (
+                        len(resolution.current_nameservers) > 0
+                    )
+                    if (
+                        outstanding == 0
+                        or resolution.retry_with_tcp
+                        or (can_hedge and time.time() >= hedge_at)
+                    ):
+                        nameserver, tcp, backoff = resolution.next_nameserver()
+                        if backoff:
+                            await backend.sleep(backoff)
+                        timeout = self._compute_timeout(
+                            start, lifetime, resolution.errors
+                        )
+                        tg.start_soon(
+                            attempt, nameserver, tcp, resolution.query_start, timeout
+                        )
+                        outstanding += 1
+                        hedge_at = time.time() + self._hedge_delay(nameserver)
+                        continue
+                    if not results:
+                        wakeup[0] = backend.make_event()
+                        try:
+                            await backend.wait_for(
+                                wakeup[0].wait(),
+                                max(hedge_at - time.time(), 0) if can_hedge else None,
+                            )
+                        except dns.exception.Timeout:
+                            pass
+                    while results and not done:
+                        nameserver, tcp, query_start, response, ex = results.pop(0)
+                        outstanding -= 1
+                        # query_result() works on the current nameserver.
+                        resolution.nameserver = nameserver
+                        resolution.tcp_attempt = tcp
+                        resolution.query_start = query_start
+                        answer, done = resolution.query_result(response, ex)
+            except Exception as e:
+                error = e
+            tg.cancel()
+        if error is not None:
+            raise error
+        return answer
+
+    def _prefetch(
+        self,
+        resolution: dns.resolver._Resolution,
+        source: str | None,
+        source_port: int,
+        lifetime: float | None,
+        backend: dns.asyncbackend.Backend,
+    ) -> None:
+        """Refresh the cached answer *resolution* just returned in a
+        background task."""
+        refresh = dns.resolver._Resolution(
+            self,
+            resolution.qname,
+            resolution.rdtype,
+            resolution.rdclass,
+            resolution.tcp,
+            False,
+            False,
+        )
+        refresh.refresh = True
+
+        async def run() -> None:
+            try:
+                await self._resolve(refresh, source, source_port, lifetime, backend)
+            except Exception:
+                # The cached answer will just expire.
+                pass
+
+        backend.spawn(run)
 
     async def resolve_address(
         self, ipaddr: str, *args: Any, **kwargs: Any
@@ -178,27 +425,39 @@ class Resolver(dns.resolver.BaseResolver):
 
         raise_on_no_answer = modified_kwargs.pop("raise_on_no_answer", True)
         lifetime = modified_kwargs.pop("lifetime", None)
+        backend = modified_kwargs.get("backend")
+        if not backend:
+            backend = dns.asyncbackend.get_default_backend()
         start = time.time()
-        v6 = await self.resolve(
-            name,
-            dns.rdatatype.AAAA,
-            raise_on_no_answer=False,
-            lifetime=self._compute_timeout(start, lifetime),
-            **modified_kwargs,
-        )
-        # Note that setting name ensures we query the same name
-        # for A as we did for AAAA.  (This is just in case search lists
-        # are active by default in the resolver configuration and
-        # we might be talking to a server that says NXDOMAIN when it
-        # wants to say NOERROR no data.
-        name = v6.qname
-        v4 = await self.resolve(
-            name,
-            dns.rdatatype.A,
-            raise_on_no_answer=False,
-            lifetime=self._compute_timeout(start, lifetime),
-            **modified_kwargs,
-        )
+        results: dict[dns.rdatatype.RdataType, dns.resolver.Answer | Exception] = {}
+
+        async def resolve_family(rdtype: dns.rdatatype.RdataType) -> None:
+            try:
+                results[rdtype] = await self.resolve(
+                    name,
+                    rdtype,
+                    raise_on_no_answer=False,
+                    lifetime=self._compute_timeout(start, lifetime),
+                    **modified_kwargs,
+                )
+            except Exception as e:
+                results[rdtype] = e
+
+        async with backend.make_task_group() as tg:
+            tg.start_soon(resolve_family, dns.rdatatype.AAAA)
+            tg.start_soon(resolve_family, dns.rdatatype.A)
+        v6 = results[dns.rdatatype.AAAA]
+        if isinstance(v6, Exception):
+            raise v6
+        v4, redo = self._check_v4_result(results.get(dns.rdatatype.A), v6)
+        if redo:
+            v4 = await self.resolve(
+                v6.qname,
+                dns.rdatatype.A,
+                raise_on_no_answer=False,
+                lifetime=self._compute_timeout(start, lifetime),
+                **modified_kwargs,
+            )
         answers = dns.resolver.HostAnswers.make(
             v6=v6, v4=v4, add_empty=not raise_on_no_answer
         )
@@ -206,6 +465,104 @@ class Resolver(dns.resolver.BaseResolver):
             raise NoAnswer(response=v6.response)
         return answers
 
+    async def resolve_many(
+        self,
+        queries: Iterable[tuple[dns.name.Name | str, dns.rdatatype.RdataType | str]],
+        concurrency: int = 100,
+        rate: float | None = None,
+        rdclass: dns.rdataclass.RdataClass | str = dns.rdataclass.IN,
+        tcp: bool = False,
+        source: str | None = None,
+        raise_on_no_answer: bool = True,
+        source_port: int = 0,
+        lifetime: float | None = None,
+        search: bool | None = None,
+        backend: dns.asyncbackend.Backend | None = None,
+    ) -> AsyncIterator[
+        tuple[
+            dns.name.Name | str,
+            dns.rdatatype.RdataType | str,
+            dns.resolver.Answer | Exception,
+        ]
+    ]:
+        """Resolve many questions concurrently.
+
+        This is an asynchronous generator; use it with ``async for``.  See
+        :py:meth:`dns.resolver.Resolver.resolve_many` for the documentation
+        of the parameters and results, and
+        :py:meth:`dns.asyncresolver.Resolver.resolve` for *backend*.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if not backend:
+            backend = dns.asyncbackend.get_default_backend()
+        rate_limiter = dns.resolver._RateLimiter(rate) if rate is not None else None
+        # The resolutions run in a task group owned by a background task, so
+        # that we never yield to our caller from inside the task group.
+        # Whenever a resolution finishes, it appends its result and sets the
+        # current wakeup event.
+        iterator = iter(queries)
+        results: collections.deque = collections.deque()
+        wakeup = [backend.make_event()]
+        finished = backend.make_event()
+        stopped = False
+        failure: list[Exception] = []
+        group: list = []
+
+        async def work() -> None:
+            assert backend is not None  # for mypy
+            while not stopped and not failure:
+                try:
+                    qname, rdtype = next(iterator)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    failure.append(e)
+                    break
+                result: dns.resolver.Answer | Exception
+                try:
+                    resolution = dns.resolver._Resolution(
+                        self, qname, rdtype, rdclass, tcp, raise_on_no_answer, search
+                    )
+                    resolution.rate_limiter = rate_limiter
+                    result = await self._coalesced_resolve(
+                        resolution, source, source_port, lifetime, backend
+                    )
+                except Exception as e:
+                    result = e
+                results.append((qname, rdtype, result))
+                wakeup[0].set()
+            wakeup[0].set()
+
+        async def run() -> None:
+            assert backend is not None  # for mypy
+            try:
+                async with backend.make_task_group() as tg:
+                    group.append(tg)
+                    for _ in range(concurrency):
+                        tg.start_soon(work)
+            finally:
+                finished.set()
+                wakeup[0].set()
+
+        backend.spawn(run)
+        try:
+            while True:
+                while results:
+                    yield results.popleft()
+                if failure:
+                    raise failure[0]
+                if finished.is_set():
+                    break
+                wakeup[0] = backend.make_event()
+                await wakeup[0].wait()
+        finally:
+            # If the caller stopped early, cancel the rest and wait for them.
+            stopped = True
+            if group:
+                group[0].cancel()
+            await finished.wait()
+
     # pylint: disable=redefined-outer-name
 
     async def canonical_name(self, name: dns.name.Name | str) -> dns.name.Name:
@@ -342,6 +699,30 @@ async def resolve_name(
     return await get_default_resolver().resolve_name(name, family, **kwargs)
 
 
+async def resolve_many(
+    queries: Iterable[tuple[dns.name.Name | str, dns.rdatatype.RdataType | str]],
+    concurrency: int = 100,
+    rate: float | None = None,
+    **kwargs: Any,
+) -> AsyncIterator[
+    tuple[
+        dns.name.Name | str,
+        dns.rdatatype.RdataType | str,
+        dns.resolver.Answer | Exception,
+    ]
+]:
+    """Resolve many questions concurrently using the default resolver.
+
+    See :py:func:`dns.asyncresolver.Resolver.resolve_many` for more
+    information on the parameters.
+    """
+
+    async for result in get_default_resolver().resolve_many(
+        queries, concurrency, rate, **kwargs
+    ):
+        yield result
+
+
 async def canonical_name(name: dns.name.Name | str) -> dns.name.Name:
     """Determine the canonical name of *name*.
 
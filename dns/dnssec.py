@@ -1085,7 +1085,7 @@ def _sign_zone_nsec(
     delegation = None
     last_secure = None
 
-    for name in sorted(txn.iterate_names()):
+    for name in sorted(txn.iterate_names(), key=dns.name.Name.sort_key):
         if delegation and name.is_subdomain(delegation):
             # names below delegations are not secure
             continue
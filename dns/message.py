@@ -21,7 +21,10 @@ import contextlib
 import dataclasses
 import enum
 import io
+import struct
+import threading
 import time
+from collections.abc import Iterator
 from typing import Any, cast
 
 import dns.edns
@@ -159,6 +162,7 @@ class Message:
     """A DNS message."""
 
     _section_enum = MessageSection
+    _lazy: "_LazySections | None" = None
 
     def __init__(self, id: int | None = None):
         if id is None:
@@ -182,10 +186,58 @@ class Message:
         self.time = 0.0
         self.wire: bytes | None = None
 
+    def __getattr__(self, name):
+        # This is only called for attributes which are not set.  In a message
+        # read lazily by from_wire(), these are the sections and the OPT record
+        # until they have been read.
+        lazy = self._lazy
+        if lazy is None or name not in ("sections", "opt"):
+            raise AttributeError(name)
+        if name == "opt":
+            lazy.read_opt(self)
+        else:
+            lazy.read_all(self)
+        return self.__dict__[name]
+
+    def __copy__(self):
+        # The lazy state belongs to this message, so read everything first.
+        self._read_lazy()
+        copy = self.__class__.__new__(self.__class__)
+        copy.__dict__.update(self.__dict__)
+        return copy
+
+    def __getstate__(self):
+        # The wire reader in the lazy state cannot be pickled.
+        self._read_lazy()
+        return self.__dict__
+
+    def _read_lazy(self) -> None:
+        lazy = self._lazy
+        if lazy is not None:
+            lazy.read_all(self)
+
+    def _lazy_opt(self) -> "_LazySections | None":
+        # Return the lazy state if the OPT record has been neither read nor
+        # replaced, so the EDNS header fields can be taken from it.
+        lazy = self._lazy
+        if lazy is not None and lazy.opt_offset is not None:
+            if "opt" not in self.__dict__:
+                return lazy
+        return None
+
+    def _section(self, number: int) -> list[dns.rrset.RRset]:
+        lazy = self._lazy
+        if lazy is not None:
+            return lazy.read_section(self, number)
+        return self.sections[number]
+
     @property
     def question(self) -> list[dns.rrset.RRset]:
         """The question section."""
-        return self.sections[0]
+        lazy = self._lazy
+        if lazy is None:
+            return self.sections[0]
+        return lazy.read_section(self, 0)
 
     @question.setter
     def question(self, v):
@@ -194,7 +246,10 @@ class Message:
     @property
     def answer(self) -> list[dns.rrset.RRset]:
         """The answer section."""
-        return self.sections[1]
+        lazy = self._lazy
+        if lazy is None:
+            return self.sections[1]
+        return lazy.read_section(self, 1)
 
     @answer.setter
     def answer(self, v):
@@ -203,7 +258,10 @@ class Message:
     @property
     def authority(self) -> list[dns.rrset.RRset]:
         """The authority section."""
-        return self.sections[2]
+        lazy = self._lazy
+        if lazy is None:
+            return self.sections[2]
+        return lazy.read_section(self, 2)
 
     @authority.setter
     def authority(self, v):
@@ -212,7 +270,10 @@ class Message:
     @property
     def additional(self) -> list[dns.rrset.RRset]:
         """The additional data section."""
-        return self.sections[3]
+        lazy = self._lazy
+        if lazy is None:
+            return self.sections[3]
+        return lazy.read_section(self, 3)
 
     @additional.setter
     def additional(self, v):
@@ -356,7 +417,9 @@ class Message:
         :rtype: int
         """
 
-        for i, our_section in enumerate(self.sections):
+        lazy = self._lazy
+        sections = lazy.sections if lazy is not None else self.sections
+        for i, our_section in enumerate(sections):
             if section is our_section:
                 return self._section_enum(i)
         raise ValueError("unknown section")
@@ -371,7 +434,7 @@ class Message:
         """
 
         section = self._section_enum.make(number)
-        return self.sections[section]
+        return self._section(section)
 
     def find_rrset(
         self,
@@ -799,6 +862,10 @@ class Message:
         :type pad: int
         """
 
+        lazy = self._lazy
+        if lazy is not None:
+            # The OPT record from the wire, if any, is replaced.
+            lazy.discard_opt(self)
         if edns is None or edns is False:
             edns = -1
         elif edns is True:
@@ -822,13 +889,16 @@ class Message:
 
     @property
     def edns(self) -> int:
-        if self.opt:
+        if self._lazy_opt() is not None or self.opt:
             return (self.ednsflags & 0xFF0000) >> 16
         else:
             return -1
 
     @property
     def ednsflags(self) -> int:
+        lazy = self._lazy_opt()
+        if lazy is not None:
+            return lazy.ednsflags
         if self.opt:
             return self.opt.ttl
         else:
@@ -843,6 +913,9 @@ class Message:
 
     @property
     def payload(self) -> int:
+        lazy = self._lazy_opt()
+        if lazy is not None:
+            return lazy.payload
         if self.opt:
             rdata = cast(dns.rdtypes.ANY.OPT.OPT, self.opt[0])
             return rdata.payload
@@ -1078,6 +1151,156 @@ def _message_factory_from_opcode(opcode):
         return Message
 
 
+def _skip_name(wire, current, end):
+    """Skip over the possibly compressed name at *current* in *wire* without
+    decoding it, returning the offset after it.
+    """
+    while True:
+        if current >= end:
+            raise dns.exception.FormError
+        length = wire[current]
+        current += 1
+        if length == 0:
+            return current
+        elif length < 64:
+            current += length
+        elif length >= 192:
+            return current + 1
+        else:
+            raise dns.name.BadLabelType
+
+
+def _skip_rr(wire, current, end):
+    """Skip over the record at *current* in *wire* without decoding its owner
+    name or rdata.
+
+    Returns a ``(rdtype, rdclass, ttl, rdlen, next)`` tuple, where *next* is
+    the offset of the next record.
+    """
+    current = _skip_name(wire, current, end)
+    if current + 10 > end:
+        raise dns.exception.FormError
+    rdtype, rdclass, ttl, rdlen = struct.unpack_from("!HHIH", wire, current)
+    current += 10 + rdlen
+    if current > end:
+        raise dns.exception.FormError
+    return (rdtype, rdclass, ttl, rdlen, current)
+
+
+class _LazySections:
+    """The records of a message read lazily by a :py:class:`_WireReader`.
+
+    The answer, authority, and additional sections are recorded as runs of
+    ``(offset, count)`` records, and are read the first time they are
+    accessed.  The OPT record is recorded separately, with the EDNS flags and
+    payload from its header, so its options are only read if they are
+    accessed.  The TSIG record, if any, is read (and validated) at once.
+    """
+
+    def __init__(self, reader: "_WireReader"):
+        assert reader.message is not None
+        self.reader = reader
+        self.sections: list[list[dns.rrset.RRset]] = reader.message.sections
+        self.pending: dict[int, list[tuple[int, int]]] = {}
+        self.opt_offset: int | None = None
+        self.tsig_offset: int | None = None
+        self.ednsflags = 0
+        self.payload = 0
+        # A message may be read by several threads, so only one of them
+        # reads each part, and the others wait for it.
+        self.lock = threading.RLock()
+
+    def _read(self, section_number, runs):
+        reader = self.reader
+        parser = reader.parser
+        current = parser.current
+        try:
+            for offset, count in runs:
+                reader.parser.seek(offset)
+                reader._get_section(section_number, count)
+        except Exception as e:
+            if reader.continue_on_error:
+                reader._add_error(e)
+            else:
+                raise
+        finally:
+            # A section may be read while the reader is reading the TSIG
+            # record, if the keyring is a callable which looks at it.
+            parser.current = current
+
+    def _read_opt(self, message, offset):
+        # The OPT record is read here rather than by _get_section(), so that
+        # the message's opt is only set once it is complete.  The index pass
+        # has already checked its name and position.
+        reader = self.reader
+        parser = reader.parser
+        current = parser.current
+        opt = None
+        try:
+            parser.seek(offset)
+            name = parser.get_name()
+            _, payload, ttl, rdlen = parser.get_struct("!HHIH")
+            with parser.restrict_to(rdlen):
+                rd = dns.rdata.from_wire_parser(
+                    dns.rdataclass.RdataClass(payload), dns.rdatatype.OPT, parser
+                )
+            opt = dns.rrset.from_rdata(name, ttl, rd)
+        except Exception as e:
+            if reader.continue_on_error:
+                reader._add_error(e)
+            else:
+                raise
+        finally:
+            parser.current = current
+            message.opt = opt
+
+    def _finish(self, message):
+        if "opt" in message.__dict__:
+            # The OPT record has been read or replaced.
+            self.opt_offset = None
+        if not self.pending and self.opt_offset is None:
+            message.sections = self.sections
+            message._lazy = None
+
+    def read_section(self, message: Message, number: int) -> list[dns.rrset.RRset]:
+        with self.lock:
+            runs = self.pending.pop(number, None)
+            if runs is not None:
+                try:
+                    self._read(number, runs)
+                finally:
+                    self._finish(message)
+            return self.sections[number]
+
+    def read_opt(self, message: Message) -> None:
+        with self.lock:
+            offset = self.opt_offset
+            if offset is None or "opt" in message.__dict__:
+                # The OPT record has been read, or was replaced before it was
+                # read.
+                self.discard_opt(message)
+                return
+            self.opt_offset = None
+            try:
+                self._read_opt(message, offset)
+            finally:
+                self._finish(message)
+
+    def discard_opt(self, message: Message) -> None:
+        with self.lock:
+            self.opt_offset = None
+            if "opt" not in message.__dict__:
+                message.opt = None
+            self._finish(message)
+
+    def read_all(self, message: Message) -> None:
+        with self.lock:
+            if self.opt_offset is not None:
+                self.read_opt(message)
+            for number in list(self.pending):
+                self.read_section(message, number)
+
+
 class _WireReader:
     """Wire format reader.
 
@@ -1093,6 +1316,9 @@ class _WireReader:
     continue_on_error: try to extract as much information as possible from
     the message, accumulating MessageErrors in the *errors* attribute instead of
     raising them.
+    lazy: only index the answer, authority, and additional sections, and read
+    them when they are accessed?
+    pool: the dns.name.NamePool to intern names with, or None.
     """
 
     def __init__(
@@ -1105,9 +1331,13 @@ class _WireReader:
         keyring=None,
         multi=False,
         continue_on_error=False,
+        lazy=False,
+        pool=None,
     ):
         self.parser = dns.wire.Parser(wire)
+        self.parser.pool = pool
         self.message = None
+        self.sections = None
         self.initialize_message = initialize_message
         self.question_only = question_only
         self.one_rr_per_rrset = one_rr_per_rrset
@@ -1115,14 +1345,15 @@ class _WireReader:
         self.keyring = keyring
         self.multi = multi
         self.continue_on_error = continue_on_error
+        self.lazy = lazy
         self.errors = []
 
     def _get_question(self, section_number, qcount):
         """Read the next *qcount* records from the wire data and add them to
         the question section.
         """
-        assert self.message is not None
-        section = self.message.sections[section_number]
+        assert self.message is not None and self.sections is not None
+        section = self.sections[section_number]
         for _ in range(qcount):
             qname = self.parser.get_name(self.message.origin)
             rdtype, rdclass = self.parser.get_struct("!HH")
@@ -1143,14 +1374,16 @@ class _WireReader:
         section_number: the section of the message to which to add records
         count: the number of records to read
         """
-        assert self.message is not None
-        section = self.message.sections[section_number]
+        assert self.message is not None and self.sections is not None
+        section = self.sections[section_number]
         force_unique = self.one_rr_per_rrset
         for i in range(count):
             rr_start = self.parser.current
             absolute_name = self.parser.get_name()
             if self.message.origin is not None:
                 name = absolute_name.relativize(self.message.origin)
+                if self.parser.pool is not None:
+                    name = self.parser.pool.intern(name)
             else:
                 name = absolute_name
             rdtype, rdclass, ttl, rdlen = self.parser.get_struct("!HHIH")
@@ -1204,7 +1437,7 @@ class _WireReader:
                     if key:
                         self.message.keyring = key
                         self.message.tsig_ctx = dns.tsig.validate(
-                            self.parser.wire,
+                            self.message.wire,
                             key,
                             absolute_name,
                             rd,
@@ -1237,6 +1470,91 @@ class _WireReader:
                 else:
                     raise
 
+    def _index_section(self, section_number, count, lazy):
+        """Skip over the next *count* records, recording where they are in
+        *lazy* so that they can be read later.
+
+        The OPT and TSIG records are checked as they would be when read.
+        """
+        assert self.message is not None
+        parser = self.parser
+        wire = parser.wire
+        end = parser.end
+        current = parser.current
+        runs = []
+        run_start = current
+        run_count = 0
+        for i in range(count):
+            rr_start = current
+            rdtype, rdclass, ttl, rdlen, current = _skip_rr(wire, current, end)
+            if rdtype == dns.rdatatype.OPT:
+                self.parser.seek(rr_start)
+                if (
+                    section_number != MessageSection.ADDITIONAL
+                    or lazy.opt_offset is not None
+                    or parser.get_name() != dns.name.root
+                ):
+                    raise BadEDNS
+                lazy.opt_offset = rr_start
+                lazy.ednsflags = ttl
+                lazy.payload = rdclass
+            elif rdtype == dns.rdatatype.TSIG:
+                if (
+                    section_number != MessageSection.ADDITIONAL
+                    or rdclass != dns.rdatatype.ANY
+                    or i != count - 1
+                ):
+                    raise BadTSIG
+                lazy.tsig_offset = rr_start
+            else:
+                run_count += 1
+                continue
+            if run_count > 0:
+                runs.append((run_start, run_count))
+            run_start = current
+            run_count = 0
+        if run_count > 0:
+            runs.append((run_start, run_count))
+        if runs:
+            lazy.pending[section_number] = runs
+        parser.seek(current)
+
+    def _index_sections(self, ancount, aucount, adcount):
+        """Index the answer, authority, and additional sections so they are
+        read when they are accessed.
+
+        Returns ``False`` if the sections are malformed and
+        *continue_on_error* is set, in which case they should be read at once
+        so as much of them as possible is read.
+        """
+        assert self.message is not None
+        start = self.parser.current
+        lazy = _LazySections(self)
+        try:
+            self._index_section(MessageSection.ANSWER, ancount, lazy)
+            self._index_section(MessageSection.AUTHORITY, aucount, lazy)
+            self._index_section(MessageSection.ADDITIONAL, adcount, lazy)
+        except dns.exception.FormError:
+            if not self.continue_on_error:
+                raise
+            self.parser.seek(start)
+            return False
+        if lazy.pending or lazy.opt_offset is not None:
+            # The message's sections and OPT record are now read by its
+            # __getattr__() when they are first accessed.
+            del self.message.sections
+            if lazy.opt_offset is not None:
+                del self.message.opt
+            self.message._lazy = lazy
+        if lazy.tsig_offset is not None:
+            # The TSIG is validated now, with the rest of the message available
+            # to a keyring callable.
+            end = self.parser.current
+            self.parser.seek(lazy.tsig_offset)
+            self._get_section(MessageSection.ADDITIONAL, 1)
+            self.parser.seek(end)
+        return True
+
     def read(self):
         """Read a wire format DNS message and build a dns.message.Message
         object."""
@@ -1247,7 +1565,13 @@ class _WireReader:
         factory = _message_factory_from_opcode(dns.opcode.from_flags(flags))
         self.message = factory(id=id)
         self.message.flags = dns.flags.Flag(flags)
-        self.message.wire = self.parser.wire
+        wire = self.parser.wire
+        if not isinstance(wire, bytes):
+            # The message keeps its own copy, as the caller's buffer may be
+            # reused.
+            wire = wire.tobytes()
+        self.message.wire = wire
+        self.sections = self.message.sections
         self.initialize_message(self.message)
         self.one_rr_per_rrset = self.message._get_one_rr_per_rrset(
             self.one_rr_per_rrset
@@ -1256,13 +1580,14 @@ class _WireReader:
             self._get_question(MessageSection.QUESTION, qcount)
             if self.question_only:
                 return self.message
-            self._get_section(MessageSection.ANSWER, ancount)
-            self._get_section(MessageSection.AUTHORITY, aucount)
-            self._get_section(MessageSection.ADDITIONAL, adcount)
+            if not self.lazy or not self._index_sections(ancount, aucount, adcount):
+                self._get_section(MessageSection.ANSWER, ancount)
+                self._get_section(MessageSection.AUTHORITY, aucount)
+                self._get_section(MessageSection.ADDITIONAL, adcount)
             if not self.ignore_trailing and self.parser.remaining() != 0:
                 raise TrailingJunk
             if self.multi and self.message.tsig_ctx and not self.message.had_tsig:
-                self.message.tsig_ctx.update(self.parser.wire)
+                self.message.tsig_ctx.update(self.message.wire)
         except Exception as e:
             if self.continue_on_error:
                 self._add_error(e)
@@ -1272,7 +1597,7 @@ class _WireReader:
 
 
 def from_wire(
-    wire: bytes,
+    wire: bytes | bytearray | memoryview,
     keyring: Any | None = None,
     request_mac: bytes | None = b"",
     xfr: bool = False,
@@ -1284,6 +1609,8 @@ def from_wire(
     ignore_trailing: bool = False,
     raise_on_truncation: bool = False,
     continue_on_error: bool = False,
+    lazy: bool = False,
+    pool: dns.name.NamePool | None = None,
 ) -> Message:
     """Convert a DNS wire format message into a message object.
 
@@ -1315,6 +1642,19 @@ def from_wire(
     :param continue_on_error: If ``True``, try to continue parsing on errors
         and accumulate them in the message's ``errors`` attribute.
     :type continue_on_error: bool
+    :param lazy: If ``True``, read only the header and question section, and
+        the header of any OPT record, at once.  The records of the answer,
+        authority, and additional sections are only located, and each section
+        is read when it is first accessed, as are the EDNS options.  A TSIG
+        record is still read and validated at once.  Errors in the records of
+        a section are raised (or, with *continue_on_error*, added to
+        ``errors``) when the section is read.
+    :type lazy: bool
+    :param pool: If not ``None``, the owner names and the names in rdata are
+        interned with this pool, so that names in messages kept together,
+        e.g. in a cache, share one object with equal names read with the
+        same pool.
+    :type pool: :py:class:`dns.name.NamePool` or ``None``
     :raises dns.message.ShortHeader: If the message is less than 12 octets.
     :raises dns.message.TrailingJunk: If trailing octets are present and
         *ignore_trailing* is ``False``.
@@ -1345,6 +1685,8 @@ def from_wire(
         keyring,
         multi,
         continue_on_error,
+        lazy,
+        pool,
     )
     try:
         m = reader.read()
@@ -1367,6 +1709,360 @@ def from_wire(
     return m
 
 
+class RRHeader:
+    """The header of a record in a :py:class:`dns.message.MessageView`.
+
+    *section* is the :py:class:`dns.message.MessageSection` of the record,
+    *name* is its owner name, *rdtype*, *rdclass*, and *ttl* are its type,
+    class, and TTL as they are in the wire format, and *rdata* is a
+    ``memoryview`` of its rdata in the message.
+    """
+
+    __slots__ = ["section", "name", "rdtype", "rdclass", "ttl", "rdata"]
+
+    def __init__(
+        self,
+        section: MessageSection,
+        name: dns.name.Name,
+        rdtype: dns.rdatatype.RdataType,
+        rdclass: dns.rdataclass.RdataClass,
+        ttl: int,
+        rdata: memoryview,
+    ):
+        self.section = section
+        self.name = name
+        self.rdtype = rdtype
+        self.rdclass = rdclass
+        self.ttl = ttl
+        self.rdata = rdata
+
+    def __repr__(self):
+        return (
+            f"<RRHeader {self.section.name} {self.name} "
+            f"{dns.rdataclass.to_text(self.rdclass)} "
+            f"{dns.rdatatype.to_text(self.rdtype)} {self.ttl}>"
+        )
+
+
+_ViewQuestion = tuple[dns.name.Name, dns.rdatatype.RdataType, dns.rdataclass.RdataClass]
+
+
+class MessageView:
+    """A read-only view of a DNS message in wire format.
+
+    The header is read when the view is made.  Everything else is read from
+    the wire format only when it is asked for, without making a
+    :py:class:`dns.message.Message`, RRsets, or rdata.  The wire format is not
+    copied, so if it is a ``bytearray`` it must not be changed while the view
+    is in use.
+
+    Use :py:meth:`to_message()` to get the full message.
+
+    :param wire: The message in DNS wire format.
+    :type wire: bytes, bytearray, or memoryview
+    :raises dns.message.ShortHeader: If the message is less than 12 octets.
+    """
+
+    def __init__(self, wire: bytes | bytearray | memoryview):
+        self.wire = memoryview(wire)
+        if len(self.wire) < 12:
+            raise ShortHeader
+        self.id, flags, *counts = struct.unpack_from("!HHHHHH", self.wire)
+        self.flags = dns.flags.Flag(flags)
+        self._counts = counts
+        self._question: list[_ViewQuestion] | None = None
+        self._records: list | None = None
+        self._opt: tuple[int, int, int, int] | None = None
+        self._options: tuple | None = None
+
+    def __repr__(self):
+        return "<DNS message view, ID " + repr(self.id) + ">"
+
+    def opcode(self) -> dns.opcode.Opcode:
+        """Return the opcode.
+
+        :rtype: :py:class:`dns.opcode.Opcode`
+        """
+        return dns.opcode.from_flags(int(self.flags))
+
+    def rcode(self) -> dns.rcode.Rcode:
+        """Return the rcode, including any extended rcode bits in the OPT
+        record.
+
+        :rtype: :py:class:`dns.rcode.Rcode`
+        """
+        return dns.rcode.from_flags(int(self.flags), self.ednsflags)
+
+    def section_count(self, section: int | str) -> int:
+        """Returns the number of records in the specified section, as given in
+        the header.
+
+        :param section: An ``int`` section number or a ``str`` section name.
+        :rtype: int
+        """
+        return self._counts[MessageSection.make(section)]
+
+    @property
+    def question(self) -> list[_ViewQuestion]:
+        """The question section, a list of ``(name, rdtype, rdclass)`` tuples."""
+        if self._question is None:
+            parser = dns.wire.Parser(self.wire, 12)
+            question = []
+            for _ in range(self._counts[MessageSection.QUESTION]):
+                name = parser.get_name()
+                rdtype, rdclass = parser.get_struct("!HH")
+                question.append(
+                    (
+                        name,
+                        dns.rdatatype.RdataType(rdtype),
+                        dns.rdataclass.RdataClass(rdclass),
+                    )
+                )
+            self._question = question
+        return self._question
+
+    @property
+    def qname(self) -> dns.name.Name | None:
+        """The name of the first question, or ``None`` if there is none."""
+        question = self.question
+        return question[0][0] if question else None
+
+    @property
+    def qtype(self) -> dns.rdatatype.RdataType | None:
+        """The type of the first question, or ``None`` if there is none."""
+        question = self.question
+        return question[0][1] if question else None
+
+    @property
+    def qclass(self) -> dns.rdataclass.RdataClass | None:
+        """The class of the first question, or ``None`` if there is none."""
+        question = self.question
+        return question[0][2] if question else None
+
+    def _get_records(self):
+        # Find the records without decoding their names or rdata.  Each is a
+        # (section, offset, rdtype, rdclass, ttl, rdata offset, rdlen) tuple.
+        if self._records is None:
+            wire = self.wire
+            end = len(wire)
+            current = 12
+            for _ in range(self._counts[MessageSection.QUESTION]):
+                current = _skip_name(wire, current, end) + 4
+            if current > end:
+                raise dns.exception.FormError
+            records = []
+            for section in (
+                MessageSection.ANSWER,
+                MessageSection.AUTHORITY,
+                MessageSection.ADDITIONAL,
+            ):
+                for _ in range(self._counts[section]):
+                    start = current
+                    rdtype, rdclass, ttl, rdlen, current = _skip_rr(wire, current, end)
+                    rdata_start = current - rdlen
+                    records.append(
+                        (section, start, rdtype, rdclass, ttl, rdata_start, rdlen)
+                    )
+                    if (
+                        rdtype == dns.rdatatype.OPT
+                        and section == MessageSection.ADDITIONAL
+                        and self._opt is None
+                    ):
+                        self._opt = (ttl, rdclass, rdata_start, rdlen)
+            self._records = records
+        return self._records
+
+    def rrs(self, section: int | str | None = None) -> Iterator[RRHeader]:
+        """Iterate over the headers of the records in the specified section,
+        or in the answer, authority, and additional sections if *section* is
+        ``None``.  OPT and TSIG records are included.
+
+        :param section: An ``int`` section number, a ``str`` section name, or
+            ``None``.
+        :raises dns.exception.FormError: If the message is malformed.
+        :rtype: iterator of :py:class:`dns.message.RRHeader`
+        """
+        if section is not None:
+            section = MessageSection.make(section)
+            if section == MessageSection.QUESTION:
+                raise ValueError("the question section has no records")
+        parser = dns.wire.Parser(self.wire)
+        for (
+            rr_section,
+            start,
+            rdtype,
+            rdclass,
+            ttl,
+            rdata_start,
+            rdlen,
+        ) in self._get_records():
+            if section is not None and rr_section != section:
+                continue
+            parser.seek(start)
+            name = parser.get_name()
+            yield RRHeader(
+                rr_section,
+                name,
+                dns.rdatatype.RdataType(rdtype),
+                dns.rdataclass.RdataClass(rdclass),
+                ttl,
+                self.wire[rdata_start : rdata_start + rdlen],
+            )
+
+    @property
+    def min_ttl(self) -> int | None:
+        """The smallest TTL of the records in the answer, authority, and
+        additional sections, not counting OPT and TSIG records, or ``None`` if
+        there are no such records.
+
+        The MINIMUM field of an SOA record in the authority section is counted
+        too, as it limits how long a negative response may be cached (RFC
+        2308).
+        """
+        min_ttl = None
+        wire = self.wire
+        for section, _, rdtype, _, ttl, rdata_start, rdlen in self._get_records():
+            if rdtype == dns.rdatatype.OPT or rdtype == dns.rdatatype.TSIG:
+                continue
+            if ttl > 0x7FFFFFFF:
+                ttl = 0
+            if (
+                rdtype == dns.rdatatype.SOA
+                and section == MessageSection.AUTHORITY
+                and rdlen >= 20
+            ):
+                (minimum,) = struct.unpack_from("!I", wire, rdata_start + rdlen - 4)
+                ttl = min(ttl, minimum)
+            if min_ttl is None or ttl < min_ttl:
+                min_ttl = ttl
+        return min_ttl
+
+    @property
+    def edns(self) -> int:
+        """The EDNS version, or -1 if there is no OPT record."""
+        self._get_records()
+        if self._opt is None:
+            return -1
+        return (self._opt[0] & 0xFF0000) >> 16
+
+    @property
+    def ednsflags(self) -> int:
+        """The EDNS flags, or 0 if there is no OPT record."""
+        self._get_records()
+        if self._opt is None:
+            return 0
+        return self._opt[0]
+
+    @property
+    def payload(self) -> int:
+        """The EDNS payload, or 0 if there is no OPT record."""
+        self._get_records()
+        if self._opt is None:
+            return 0
+        return self._opt[1]
+
+    @property
+    def options(self) -> tuple:
+        """The EDNS options."""
+        if self._options is None:
+            self._get_records()
+            if self._opt is None:
+                self._options = ()
+            else:
+                _, payload, rdata_start, rdlen = self._opt
+                parser = dns.wire.Parser(
+                    self.wire[rdata_start : rdata_start + rdlen].tobytes()
+                )
+                opt = cast(
+                    dns.rdtypes.ANY.OPT.OPT,
+                    dns.rdata.from_wire_parser(
+                        dns.rdataclass.RdataClass(payload), dns.rdatatype.OPT, parser
+                    ),
+                )
+                self._options = opt.options
+        return self._options
+
+    def get_options(self, otype: dns.edns.OptionType) -> list[dns.edns.Option]:
+        """Return the list of options of the specified type."""
+        return [option for option in self.options if option.otype == otype]
+
+    def to_message(self, **kwargs: Any) -> Message:
+        """Convert the view into a message object.
+
+        The keyword arguments are passed to :py:func:`dns.message.from_wire`.
+
+        :rtype: :py:class:`dns.message.Message`
+        """
+        return from_wire(self.wire.tobytes(), **kwargs)
+
+
+class WireTemplate:
+    """The wire format of a message, from which copies with a new ID and
+    with the TTLs reduced by the time elapsed can be made without parsing or
+    rendering the message, e.g. to answer from a cache of responses.
+
+    The offsets of the TTLs are found once, when the template is made.  The
+    TTLs of OPT and TSIG records are left alone, as the TTL of an OPT record
+    is the EDNS flags.  A TSIG signature is not recomputed, so TSIG-signed
+    messages should not be used.
+
+    :param wire: The message in DNS wire format.
+    :type wire: bytes, bytearray, or memoryview
+    :raises dns.message.ShortHeader: If the message is less than 12 octets.
+    :raises dns.exception.FormError: If the message is malformed.
+    """
+
+    _ttl_struct = struct.Struct("!I")
+
+    def __init__(self, wire: bytes | bytearray | memoryview):
+        template = bytearray(wire)
+        view = MessageView(template)
+        ttl_offsets = []
+        ttls = []
+        for _, _, rdtype, _, ttl, rdata_start, _ in view._get_records():
+            if rdtype == dns.rdatatype.OPT or rdtype == dns.rdatatype.TSIG:
+                continue
+            ttl_offsets.append(rdata_start - 6)
+            if ttl > 0x7FFFFFFF:
+                # Out of range TTLs are sent as 0 whatever *elapsed* is.
+                ttl = 0
+                self._ttl_struct.pack_into(template, rdata_start - 6, 0)
+            ttls.append(ttl)
+        self.wire = bytes(template)
+        #: The offsets of the TTLs in the wire format.
+        self.ttl_offsets = tuple(ttl_offsets)
+        #: The TTLs.
+        self.ttls = tuple(ttls)
+        #: The smallest TTL, as in :py:attr:`dns.message.MessageView.min_ttl`.
+        self.min_ttl = view.min_ttl
+
+    def to_wire(
+        self, id: int, elapsed: int = 0, buffer: bytearray | None = None
+    ) -> bytearray:
+        """Return a copy of the wire format with the ID set to *id* and the
+        TTLs reduced by *elapsed* seconds, to no less than 0.
+
+        :param id: The message ID.
+        :type id: int
+        :param elapsed: The number of seconds to subtract from each TTL.
+        :type elapsed: int
+        :param buffer: If not ``None``, the copy is made in this
+            ``bytearray``, which is returned, so a buffer can be reused.
+        :type buffer: bytearray or ``None``
+        :rtype: bytearray
+        """
+        if buffer is None:
+            buffer = bytearray(self.wire)
+        else:
+            buffer[:] = self.wire
+        buffer[0:2] = id.to_bytes(2, "big")
+        if elapsed > 0:
+            pack_into = self._ttl_struct.pack_into
+            for offset, ttl in zip(self.ttl_offsets, self.ttls, strict=True):
+                pack_into(buffer, offset, ttl - elapsed if ttl > elapsed else 0)
+        return buffer
+
+
 class _TextReader:
     """Text format reader.
 
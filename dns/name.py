@@ -22,7 +22,7 @@ import dataclasses
 import encodings.idna  # pyright: ignore
 import functools
 import struct
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
 from typing import Any
 
 import dns._features
@@ -45,7 +45,42 @@ else:  # pragma: no cover
     have_idna_2008 = False
 
 
-CompressType = dict["Name", int]
+_pointer = struct.Struct("!H")
+
+
+class CompressionTable(dict[bytes, int]):
+    """A name compression table.
+
+    The table maps the canonical (lowercased) wire form of each name suffix
+    written to the offset where it was written, so looking a suffix up hashes
+    a ``bytes`` instead of a :py:class:`dns.name.Name`.  Entries are added in
+    increasing offset order, so :py:meth:`rollback` only has to look at the
+    most recent ones.
+
+    A plain ``dict`` keyed by :py:class:`dns.name.Name` may still be used
+    as a compression table, but a ``CompressionTable`` is faster.
+    """
+
+    def rollback(self, where: int) -> None:
+        """Remove the entries for names written at offset *where* or after.
+
+        :param where: The offset the output is being truncated to.
+        :type where: int
+        """
+        while self:
+            key = next(reversed(self))
+            if self[key] < where:
+                break
+            del self[key]
+
+
+CompressType = dict["Name", int] | CompressionTable
+
+
+def _labels_to_wire(labels: Iterable[bytes]) -> bytes:
+    # Label lengths are less than 64, so lowercasing the result only changes
+    # the labels.
+    return b"".join([bytes((len(label),)) + label for label in labels])
 
 
 class NameRelation(dns.enum.IntEnum):
@@ -358,14 +393,17 @@ def _validate_labels(labels: tuple[bytes, ...]) -> None:
         raise EmptyLabel
 
 
-def _maybe_convert_to_binary(label: bytes | str) -> bytes:
+def _maybe_convert_to_binary(label: bytes | bytearray | memoryview | str) -> bytes:
     """If label is ``str``, convert it to ``bytes``.  If it is already
-    ``bytes`` just return it.
+    ``bytes`` just return it, and if it is a ``bytearray`` or ``memoryview``
+    (e.g. read by a parser over a ``memoryview``) copy it to ``bytes``.
 
     """
 
     if isinstance(label, bytes):
         return label
+    elif isinstance(label, (bytearray, memoryview)):
+        return bytes(label)
     else:
         return label.encode()
 
@@ -405,7 +443,9 @@ class Name:
     of the class are immutable.
     """
 
-    __slots__ = ["labels"]
+    # _hash and _canonical cache the hash and the lowercased wire form of
+    # the name, which are computed when first needed.
+    __slots__ = ["labels", "_hash", "_canonical"]
 
     def __init__(self, labels: Iterable[bytes | str]):
         """Initialize a DNS name.
@@ -416,6 +456,8 @@ class Name:
         blabels = [_maybe_convert_to_binary(x) for x in labels]
         self.labels = tuple(blabels)
         _validate_labels(self.labels)
+        self._hash = None
+        self._canonical = None
 
     def __copy__(self):
         return Name(self.labels)
@@ -430,6 +472,8 @@ class Name:
     def __setstate__(self, state):
         super().__setattr__("labels", state["labels"])
         _validate_labels(self.labels)
+        super().__setattr__("_hash", None)
+        super().__setattr__("_canonical", None)
 
     def is_absolute(self) -> bool:
         """Is the most significant label of this name the root label?
@@ -453,12 +497,22 @@ class Name:
         :rtype: int
         """
 
-        h = 0
-        for label in self.labels:
-            for c in label.lower():
-                h += (h << 3) + c
+        h = self._hash
+        if h is None:
+            h = hash(self._canonical_wire())
+            object.__setattr__(self, "_hash", h)
         return h
 
+    def _canonical_wire(self) -> bytes:
+        # The lowercased wire form of the name, which is not terminated by
+        # the root label if the name is relative.  Two names are equal if and
+        # only if their canonical wire forms are equal.
+        canonical = self._canonical
+        if canonical is None:
+            canonical = _labels_to_wire(self.labels).lower()
+            object.__setattr__(self, "_canonical", canonical)
+        return canonical
+
     def fullcompare(self, other: "Name") -> tuple[NameRelation, int, int]:
         """Compare two names, returning a 3-tuple
         ``(relation, order, nlabels)``.
@@ -505,34 +559,35 @@ class Name:
                 return (NameRelation.NONE, 1, 0)
             else:
                 return (NameRelation.NONE, -1, 0)
-        l1 = len(self.labels)
-        l2 = len(other.labels)
+        # If the canonical forms are already known, equal names need not be
+        # compared label by label.
+        canonical = self._canonical
+        if canonical is not None and canonical == other._canonical:
+            return (NameRelation.EQUAL, 0, len(self.labels))
+        labels1 = self.labels
+        labels2 = other.labels
+        l1 = len(labels1)
+        l2 = len(labels2)
         ldiff = l1 - l2
         if ldiff < 0:
             l = l1
         else:
             l = l2
 
-        order = 0
         nlabels = 0
-        namereln = NameRelation.NONE
-        while l > 0:
-            l -= 1
-            l1 -= 1
-            l2 -= 1
-            label1 = self.labels[l1].lower()
-            label2 = other.labels[l2].lower()
-            if label1 < label2:
-                order = -1
-                if nlabels > 0:
-                    namereln = NameRelation.COMMONANCESTOR
-                return (namereln, order, nlabels)
-            elif label1 > label2:
-                order = 1
-                if nlabels > 0:
-                    namereln = NameRelation.COMMONANCESTOR
-                return (namereln, order, nlabels)
+        while nlabels < l:
             nlabels += 1
+            label1 = labels1[-nlabels].lower()
+            label2 = labels2[-nlabels].lower()
+            if label1 != label2:
+                if label1 < label2:
+                    order = -1
+                else:
+                    order = 1
+                nlabels -= 1
+                if nlabels > 0:
+                    return (NameRelation.COMMONANCESTOR, order, nlabels)
+                return (NameRelation.NONE, order, nlabels)
         order = ldiff
         if ldiff < 0:
             namereln = NameRelation.SUPERDOMAIN
@@ -542,6 +597,27 @@ class Name:
             namereln = NameRelation.EQUAL
         return (namereln, order, nlabels)
 
+    def sort_key(self) -> tuple:
+        """Return a key which orders names in the same way as
+        :py:meth:`fullcompare`, i.e. relative names before absolute names,
+        and names with the same relativity in DNSSEC order.
+
+        The key is a tuple of a ``bool`` which is ``True`` if the name is
+        absolute, followed by the lowercased labels from most significant to
+        least significant, so that sorting a large number of names with
+        ``sorted(names, key=dns.name.Name.sort_key)`` compares the keys in C
+        instead of calling :py:meth:`fullcompare` for every comparison.  Keys
+        can also be used as the keys of a :py:class:`dns.btree.BTreeDict` or
+        :py:class:`dns.btree.BTreeSet`.
+
+        :rtype: tuple
+        """
+
+        labels = self.labels
+        if labels and labels[-1] == b"":
+            return (True, *[label.lower() for label in labels[-2::-1]])
+        return (False, *[label.lower() for label in labels[::-1]])
+
     def is_subdomain(self, other: "Name") -> bool:
         """Is self a subdomain of other?
 
@@ -577,17 +653,21 @@ class Name:
         :rtype: :py:class:`dns.name.Name`
         """
 
-        return Name([x.lower() for x in self.labels])
+        canonical = self._canonical_wire()
+        name = _from_valid_labels(tuple([x.lower() for x in self.labels]))
+        object.__setattr__(name, "_hash", self._hash)
+        object.__setattr__(name, "_canonical", canonical)
+        return name
 
     def __eq__(self, other):
         if isinstance(other, Name):
-            return self.fullcompare(other)[1] == 0
+            return self._canonical_wire() == other._canonical_wire()
         else:
             return False
 
     def __ne__(self, other):
         if isinstance(other, Name):
-            return self.fullcompare(other)[1] != 0
+            return self._canonical_wire() != other._canonical_wire()
         else:
             return True
 
@@ -703,9 +783,11 @@ class Name:
         :rtype: bytes
         """
 
-        digest = self.to_wire(origin=origin, canonicalize=True)
-        assert digest is not None
-        return digest
+        if self.is_absolute():
+            return self._canonical_wire()
+        if origin is None or not origin.is_absolute():
+            raise NeedAbsoluteNameOrOrigin
+        return self._canonical_wire() + origin._canonical_wire()
 
     def to_wire(
         self,
@@ -723,7 +805,7 @@ class Name:
             default), names will not be compressed.  Note that the compression
             code assumes that compression offset 0 is the start of *file*,
             and thus compression will not be correct if this is not the case.
-        :type compress: dict or ``None``
+        :type compress: :py:class:`dns.name.CompressionTable`, dict, or ``None``
         :param origin: If the name is relative and *origin* is not ``None``,
             then *origin* will be appended to it.
         :type origin: :py:class:`dns.name.Name` or ``None``
@@ -737,6 +819,8 @@ class Name:
         """
 
         if file is None:
+            if canonicalize:
+                return self.to_digestable(origin)
             out = bytearray()
             for label in self.labels:
                 out.append(len(label))
@@ -755,7 +839,7 @@ class Name:
                         out += label
             return bytes(out)
 
-        labels: Iterable[bytes]
+        labels: Sequence[bytes]
         if not self.is_absolute():
             if origin is None or not origin.is_absolute():
                 raise NeedAbsoluteNameOrOrigin
@@ -763,6 +847,28 @@ class Name:
             labels.extend(list(origin.labels))
         else:
             labels = self.labels
+        if compress is None or isinstance(compress, CompressionTable):
+            # Build the whole name and write it at once.
+            key = self.to_digestable(origin)
+            if canonicalize:
+                wire = key
+            else:
+                wire = _labels_to_wire(labels)
+            if compress is not None:
+                start = file.tell()
+                offset = 0
+                for label in labels[:-1]:
+                    suffix = key[offset:]
+                    pos = compress.get(suffix)
+                    if pos is not None:
+                        file.write(wire[:offset] + _pointer.pack(0xC000 + pos))
+                        return None
+                    pos = start + offset
+                    if pos <= 0x3FFF:
+                        compress[suffix] = pos
+                    offset += len(label) + 1
+            file.write(wire)
+            return None
         i = 0
         for label in labels:
             n = Name(labels[i:])
@@ -971,6 +1077,53 @@ root = Name([b""])
 empty = Name([])
 
 
+class NamePool:
+    """A pool of interned names.
+
+    Large zones and caches hold many names which are equal, e.g. the targets
+    of NS and MX records, and many more labels which are equal.  Interning
+    names with a pool makes names with the same labels share one
+    :py:class:`dns.name.Name`, and equal labels share one ``bytes``.
+
+    The pool refers to everything interned with it, so a pool is typically
+    made for one task, e.g. reading a zone, and then dropped; the names read
+    keep sharing their objects after the pool is gone.  A pool may also be
+    shared by several zones or kept for a cache, and emptied with
+    :py:meth:`clear`.
+    """
+
+    def __init__(self):
+        self.names: dict[tuple[bytes, ...], Name] = {}
+        self.labels: dict[bytes, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: Name) -> Name:
+        """Return the pooled name with the same labels as *name*, pooling a
+        name with interned labels if there is none.
+
+        Labels are compared case-sensitively, so names which differ only in
+        case are pooled separately.
+
+        :param name: The name to intern.
+        :type name: :py:class:`dns.name.Name`
+        :rtype: :py:class:`dns.name.Name`
+        """
+        pooled = self.names.get(name.labels)
+        if pooled is None:
+            intern_label = self.labels.setdefault
+            labels = tuple([intern_label(label, label) for label in name.labels])
+            pooled = _from_valid_labels(labels)
+            self.names[labels] = pooled
+        return pooled
+
+    def clear(self) -> None:
+        """Remove all names and labels from the pool."""
+        self.names.clear()
+        self.labels.clear()
+
+
 def from_unicode(
     text: str, origin: Name | None = root, idna_codec: IDNACodec | None = None
 ) -> Name:
@@ -1131,9 +1284,23 @@ def from_text(
     return Name(labels)
 
 
+def _from_valid_labels(labels: tuple[bytes, ...]) -> Name:
+    # Make a name from labels which are known to be valid, e.g. because they
+    # were just read from wire format, without checking them again.
+    name = Name.__new__(Name)
+    object.__setattr__(name, "labels", labels)
+    object.__setattr__(name, "_hash", None)
+    object.__setattr__(name, "_canonical", None)
+    return name
+
+
 def from_wire_parser(parser: dns.wirebase.Parser) -> Name:
     """Convert possibly compressed wire format into a :py:class:`dns.name.Name`.
 
+    The names read by *parser* are cached by the offsets of their labels, so
+    a compression pointer to a name which has been read already reuses it
+    instead of decoding it again.
+
     :param parser: The wire format parser.
     :type parser: :py:class:`dns.wirebase.Parser`
     :raises dns.name.BadPointer: if a compression pointer did not
@@ -1142,24 +1309,70 @@ def from_wire_parser(parser: dns.wirebase.Parser) -> Name:
     :rtype: :py:class:`dns.name.Name`
     """
 
-    labels = []
-    biggest_pointer = parser.current
-    with parser.restore_furthest():
-        count = parser.get_uint8()
-        while count != 0:
-            if count < 64:
-                labels.append(parser.get_bytes(count))
-            elif count >= 192:
-                current = (count & 0x3F) * 256 + parser.get_uint8()
-                if current >= biggest_pointer:
-                    raise BadPointer
-                biggest_pointer = current
-                parser.seek(current)
-            else:
-                raise BadLabelType
-            count = parser.get_uint8()
-        labels.append(b"")
-    return Name(labels)
+    names = parser.names
+    wire = parser.wire
+    end = parser.end
+    current = parser.current
+    biggest_pointer = current
+    after = -1
+    labels: list = []
+    offsets = []
+    length = 1
+    suffix = None
+    while True:
+        if current >= end:
+            raise dns.exception.FormError
+        count = wire[current]
+        if count == 0:
+            if after < 0:
+                after = current + 1
+            break
+        elif count < 64:
+            offsets.append(current)
+            start = current + 1
+            current = start + count
+            if current > end:
+                raise dns.exception.FormError
+            labels.append(wire[start:current])
+            length += count + 1
+        elif count >= 192:
+            if current + 1 >= end:
+                raise dns.exception.FormError
+            pointer = (count & 0x3F) * 256 + wire[current + 1]
+            if after < 0:
+                after = current + 2
+            if pointer >= biggest_pointer:
+                raise BadPointer
+            biggest_pointer = pointer
+            suffix = names.get(pointer)
+            if suffix is not None:
+                break
+            current = pointer
+        else:
+            raise BadLabelType
+    parser.current = after
+    if after > parser.furthest:
+        parser.furthest = after
+    if suffix is None:
+        if not labels:
+            return root
+        suffix_labels: tuple[bytes, ...] = (b"",)
+    else:
+        if not labels:
+            return suffix[0]
+        suffix_labels = suffix[0].labels
+        length += suffix[1] - 1
+    if length > 255:
+        raise NameTooLong
+    if isinstance(wire, memoryview):
+        labels = [bytes(label) for label in labels]
+    all_labels = tuple(labels) + suffix_labels
+    name = _from_valid_labels(all_labels)
+    names[offsets[0]] = (name, length)
+    for i in range(1, len(offsets)):
+        length -= len(all_labels[i - 1]) + 1
+        names[offsets[i]] = (_from_valid_labels(all_labels[i:]), length)
+    return name
 
 
 def from_wire(message: bytes, current: int) -> tuple[Name, int]:
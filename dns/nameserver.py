@@ -1,9 +1,14 @@
+import threading
+from typing import Any
 from urllib.parse import urlparse
 
 import dns.asyncbackend
 import dns.asyncquery
 import dns.message
+import dns.name
 import dns.query
+import dns.quic
+import dns.rdatatype
 
 
 class Nameserver:
@@ -75,8 +80,24 @@ class AddressAndPortNameserver(Nameserver):
 
 
 class Do53Nameserver(AddressAndPortNameserver):
-    def __init__(self, address: str, port: int = 53):
+    def __init__(
+        self,
+        address: str,
+        port: int = 53,
+        multiplexer: dns.query.UDPMultiplexer | None = None,
+        async_multiplexer: dns.asyncquery.UDPMultiplexer | None = None,
+        connection_pool: dns.query.ConnectionPool | None = None,
+        async_connection_pool: dns.asyncquery.ConnectionPool | None = None,
+    ):
         super().__init__(address, port)
+        # If set, UDP queries without an explicit source are sent through
+        # these shared sockets instead of a socket per query.
+        self.multiplexer = multiplexer
+        self.async_multiplexer = async_multiplexer
+        # If set, TCP queries without an explicit source reuse these pools'
+        # connections.
+        self.connection_pool = connection_pool
+        self.async_connection_pool = async_connection_pool
 
     def kind(self):
         return "Do53"
@@ -91,7 +112,18 @@ class Do53Nameserver(AddressAndPortNameserver):
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
     ) -> dns.message.Message:
-        if max_size:
+        if max_size and (
+            self.connection_pool is not None and not source and not source_port
+        ):
+            response = self.connection_pool.tcp(
+                request,
+                self.address,
+                timeout=timeout,
+                port=self.port,
+                one_rr_per_rrset=one_rr_per_rrset,
+                ignore_trailing=ignore_trailing,
+            )
+        elif max_size:
             response = dns.query.tcp(
                 request,
                 self.address,
@@ -102,6 +134,17 @@ class Do53Nameserver(AddressAndPortNameserver):
                 one_rr_per_rrset=one_rr_per_rrset,
                 ignore_trailing=ignore_trailing,
             )
+        elif self.multiplexer is not None and not source and not source_port:
+            response = self.multiplexer.query(
+                request,
+                self.address,
+                timeout=timeout,
+                port=self.port,
+                raise_on_truncation=True,
+                one_rr_per_rrset=one_rr_per_rrset,
+                ignore_trailing=ignore_trailing,
+                ignore_errors=True,
+            )
         else:
             response = dns.query.udp(
                 request,
@@ -129,7 +172,19 @@ class Do53Nameserver(AddressAndPortNameserver):
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
     ) -> dns.message.Message:
-        if max_size:
+        if max_size and (
+            self.async_connection_pool is not None and not source and not source_port
+        ):
+            response = await self.async_connection_pool.tcp(
+                request,
+                self.address,
+                timeout=timeout,
+                port=self.port,
+                one_rr_per_rrset=one_rr_per_rrset,
+                ignore_trailing=ignore_trailing,
+                backend=backend,
+            )
+        elif max_size:
             response = await dns.asyncquery.tcp(
                 request,
                 self.address,
@@ -141,6 +196,18 @@ class Do53Nameserver(AddressAndPortNameserver):
                 one_rr_per_rrset=one_rr_per_rrset,
                 ignore_trailing=ignore_trailing,
             )
+        elif self.async_multiplexer is not None and not source and not source_port:
+            response = await self.async_multiplexer.query(
+                request,
+                self.address,
+                timeout=timeout,
+                port=self.port,
+                raise_on_truncation=True,
+                backend=backend,
+                one_rr_per_rrset=one_rr_per_rrset,
+                ignore_trailing=ignore_trailing,
+                ignore_errors=True,
+            )
         else:
             response = await dns.asyncquery.udp(
                 request,
@@ -159,6 +226,52 @@ class Do53Nameserver(AddressAndPortNameserver):
         return response
 
 
+def _current_event_loop(backend: dns.asyncbackend.Backend) -> object:
+    # Return an object identifying the running event loop.
+    if backend.name() == "trio":
+        import trio  # pylint: disable=import-outside-toplevel
+
+        return trio.lowlevel.current_trio_token()
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    return asyncio.get_running_loop()
+
+
+def _close_async_client(
+    client: Any, backend: dns.asyncbackend.Backend, loop: Any
+) -> None:
+    # Close an async client from any thread, in a background task of the
+    # event loop that made it.  If that loop has finished, the client is
+    # left to the garbage collector.
+    _close_in_loop(client.aclose, backend, loop)
+
+
+def _close_async_manager(
+    manager: Any, backend: dns.asyncbackend.Backend, loop: Any
+) -> None:
+    # Close an async QUIC manager like _close_async_client() closes a client.
+    async def aclose():
+        await manager.__aexit__(None, None, None)
+
+    _close_in_loop(aclose, backend, loop)
+
+
+def _close_in_loop(close: Any, backend: dns.asyncbackend.Backend, loop: Any) -> None:
+    async def aclose():
+        try:
+            await close()
+        except Exception:
+            pass
+
+    try:
+        if backend.name() == "trio":
+            loop.run_sync_soon(backend.spawn, aclose)
+        else:
+            loop.call_soon_threadsafe(backend.spawn, aclose)
+    except RuntimeError:
+        pass
+
+
 class DoHNameserver(Nameserver):
     def __init__(
         self,
@@ -167,6 +280,7 @@ class DoHNameserver(Nameserver):
         verify: bool | str = True,
         want_get: bool = False,
         http_version: dns.query.HTTPVersion = dns.query.HTTPVersion.DEFAULT,
+        keepalive_expiry: float | None = 30.0,
     ):
         super().__init__()
         self.url = url
@@ -174,6 +288,16 @@ class DoHNameserver(Nameserver):
         self.verify = verify
         self.want_get = want_get
         self.http_version = http_version
+        self.keepalive_expiry = keepalive_expiry
+        # The clients shared by this nameserver's queries, created when
+        # first needed.  An async client can only be used with the event
+        # loop it was created in.
+        self._lock = threading.Lock()
+        self._share_client = True
+        self._client = None
+        self._async_client = None
+        self._async_client_backend = None
+        self._async_client_loop = None
 
     def kind(self):
         return "DoH"
@@ -193,6 +317,106 @@ class DoHNameserver(Nameserver):
             port = 443
         return port
 
+    def _can_share_client(self, source: str | None, source_port: int) -> bool:
+        # HTTP/3 queries, and queries from a particular source, get their own
+        # connection.
+        return (
+            dns.query.have_doh
+            and self._share_client
+            and self.http_version != dns.query.HTTPVersion.H3
+            and source is None
+            and source_port == 0
+        )
+
+    def _make_client(self, backend: dns.asyncbackend.Backend | None = None):
+        return dns.query._make_https_client(
+            self.verify,
+            self.http_version,
+            self.bootstrap_address,
+            self.keepalive_expiry,
+            backend,
+        )
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self._make_client()
+            return self._client
+
+    def _get_async_client(self, backend: dns.asyncbackend.Backend):
+        loop = _current_event_loop(backend)
+        with self._lock:
+            if self._async_client is None or self._async_client_loop is not loop:
+                if self._async_client is not None:
+                    _close_async_client(
+                        self._async_client,
+                        self._async_client_backend,  # type: ignore
+                        self._async_client_loop,
+                    )
+                self._async_client = self._make_client(backend)
+                self._async_client_backend = backend
+                self._async_client_loop = loop
+            return self._async_client
+
+    def warm_up(self, timeout: float | None = None) -> None:
+        """Connect to the server ahead of the first query, by querying for
+        the root nameservers, so that later queries do not wait for the TCP
+        and TLS handshakes.
+
+        :param timeout: Seconds to wait before timing out.  ``None`` means
+            wait forever.
+        :type timeout: float or ``None``
+        """
+        if not self._can_share_client(None, 0):
+            return
+        q = dns.message.make_query(dns.name.root, dns.rdatatype.NS)
+        self.query(q, timeout, None, 0)  # type: ignore
+
+    async def async_warm_up(
+        self,
+        timeout: float | None = None,
+        backend: dns.asyncbackend.Backend | None = None,
+    ) -> None:
+        """Connect to the server ahead of the first query, like
+        :py:meth:`warm_up`, for use with the async resolver."""
+        if not self._can_share_client(None, 0):
+            return
+        if not backend:
+            backend = dns.asyncbackend.get_default_backend()
+        q = dns.message.make_query(dns.name.root, dns.rdatatype.NS)
+        await self.async_query(q, timeout, None, 0, True, backend)  # type: ignore
+
+    def close(self) -> None:
+        """Close the connections of the clients used for queries.  The client
+        used for async queries is closed by a task of its event loop; use
+        :py:meth:`async_close` to wait for it to close."""
+        with self._lock:
+            client = self._client
+            self._client = None
+            async_client = self._async_client
+            async_client_backend = self._async_client_backend
+            async_client_loop = self._async_client_loop
+            self._async_client = None
+            self._async_client_backend = None
+            self._async_client_loop = None
+        if client is not None:
+            client.close()
+        if async_client is not None:
+            _close_async_client(
+                async_client, async_client_backend, async_client_loop  # type: ignore
+            )
+
+    async def async_close(self) -> None:
+        """Close the connections of the client used for async queries.  This
+        must be called from the event loop which made the queries."""
+        with self._lock:
+            client = self._async_client
+            self._async_client = None
+            self._async_client_backend = None
+            self._async_client_loop = None
+        if client is not None:
+            await client.aclose()
+
     def query(
         self,
         request: dns.message.QueryMessage,
@@ -203,12 +427,16 @@ class DoHNameserver(Nameserver):
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
     ) -> dns.message.Message:
+        session = None
+        if self._can_share_client(source, source_port):
+            session = self._get_client()
         return dns.query.https(
             request,
             self.url,
             timeout=timeout,
             source=source,
             source_port=source_port,
+            session=session,
             bootstrap_address=self.bootstrap_address,
             one_rr_per_rrset=one_rr_per_rrset,
             ignore_trailing=ignore_trailing,
@@ -228,12 +456,16 @@ class DoHNameserver(Nameserver):
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
     ) -> dns.message.Message:
+        client = None
+        if self._can_share_client(source, source_port):
+            client = self._get_async_client(backend)
         return await dns.asyncquery.https(
             request,
             self.url,
             timeout=timeout,
             source=source,
             source_port=source_port,
+            client=client,
             bootstrap_address=self.bootstrap_address,
             one_rr_per_rrset=one_rr_per_rrset,
             ignore_trailing=ignore_trailing,
@@ -250,10 +482,18 @@ class DoTNameserver(AddressAndPortNameserver):
         port: int = 853,
         hostname: str | None = None,
         verify: bool | str = True,
+        connection_pool: dns.query.ConnectionPool | None = None,
+        async_connection_pool: dns.asyncquery.ConnectionPool | None = None,
+        session_cache: dns.query.TLSSessionCache | None = None,
     ):
         super().__init__(address, port)
         self.hostname = hostname
         self.verify = verify
+        # If set, queries reuse these pools' connections.
+        self.connection_pool = connection_pool
+        self.async_connection_pool = async_connection_pool
+        # If set, new connections resume TLS sessions from this cache.
+        self.session_cache = session_cache
 
     def kind(self):
         return "DoT"
@@ -268,6 +508,18 @@ class DoTNameserver(AddressAndPortNameserver):
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
     ) -> dns.message.Message:
+        if self.connection_pool is not None:
+            return self.connection_pool.tls(
+                request,
+                self.address,
+                port=self.port,
+                timeout=timeout,
+                one_rr_per_rrset=one_rr_per_rrset,
+                ignore_trailing=ignore_trailing,
+                server_hostname=self.hostname,
+                verify=self.verify,
+                session_cache=self.session_cache,
+            )
         return dns.query.tls(
             request,
             self.address,
@@ -277,6 +529,7 @@ class DoTNameserver(AddressAndPortNameserver):
             ignore_trailing=ignore_trailing,
             server_hostname=self.hostname,
             verify=self.verify,
+            session_cache=self.session_cache,
         )
 
     async def async_query(
@@ -290,6 +543,19 @@ class DoTNameserver(AddressAndPortNameserver):
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
     ) -> dns.message.Message:
+        if self.async_connection_pool is not None:
+            return await self.async_connection_pool.tls(
+                request,
+                self.address,
+                port=self.port,
+                timeout=timeout,
+                one_rr_per_rrset=one_rr_per_rrset,
+                ignore_trailing=ignore_trailing,
+                backend=backend,
+                server_hostname=self.hostname,
+                verify=self.verify,
+                session_cache=self.session_cache,
+            )
         return await dns.asyncquery.tls(
             request,
             self.address,
@@ -299,6 +565,7 @@ class DoTNameserver(AddressAndPortNameserver):
             ignore_trailing=ignore_trailing,
             server_hostname=self.hostname,
             verify=self.verify,
+            session_cache=self.session_cache,
         )
 
 
@@ -313,10 +580,101 @@ class DoQNameserver(AddressAndPortNameserver):
         super().__init__(address, port)
         self.verify = verify
         self.server_hostname = server_hostname
+        # The QUIC managers shared by this nameserver's queries, created when
+        # first needed, so that queries are streams on one connection and
+        # a new connection can resume the session of the last one.  An async
+        # manager can only be used with the event loop it was created in.
+        self._lock = threading.Lock()
+        self._manager: dns.quic.SyncQuicManager | None = None
+        self._async_manager: Any = None
+        self._async_manager_backend: dns.asyncbackend.Backend | None = None
+        self._async_manager_loop: object = None
 
     def kind(self):
         return "DoQ"
 
+    @property
+    def statistics(self) -> "dns.quic.QuicStatistics | None":
+        """The statistics of the connections made for sync queries, or
+        ``None`` if none have been made."""
+        if self._manager is None:
+            return None
+        return self._manager.statistics
+
+    @property
+    def async_statistics(self) -> "dns.quic.QuicStatistics | None":
+        """The statistics of the connections made for async queries, or
+        ``None`` if none have been made."""
+        if self._async_manager is None:
+            return None
+        return self._async_manager.statistics
+
+    def _get_connection(self) -> dns.quic.SyncQuicConnection:
+        with self._lock:
+            if self._manager is None:
+                self._manager = dns.quic.SyncQuicManager(
+                    verify_mode=self.verify,  # type: ignore
+                    server_name=self.server_hostname,
+                )
+            manager = self._manager
+        return manager.connect(self.address, self.port)
+
+    def _get_async_connection(
+        self, backend: dns.asyncbackend.Backend
+    ) -> dns.quic.AsyncQuicConnection | None:
+        # The trio manager needs a nursery which outlives the query, which
+        # we do not have, so only asyncio queries share a connection.
+        if backend.name() != "asyncio":
+            return None
+        loop = _current_event_loop(backend)
+        with self._lock:
+            if self._async_manager is None or self._async_manager_loop is not loop:
+                if self._async_manager is not None:
+                    _close_async_manager(
+                        self._async_manager,
+                        self._async_manager_backend,  # type: ignore
+                        self._async_manager_loop,
+                    )
+                _, mfactory = dns.quic.factories_for_backend(backend)
+                self._async_manager = mfactory(
+                    None, verify_mode=self.verify, server_name=self.server_hostname
+                )
+                self._async_manager_backend = backend
+                self._async_manager_loop = loop
+            manager = self._async_manager
+        return manager.connect(self.address, self.port)
+
+    def close(self) -> None:
+        """Close the connections used for queries.  The connection used for
+        async queries is closed by a task of its event loop; use
+        :py:meth:`async_close` to wait for it to close."""
+        with self._lock:
+            manager = self._manager
+            self._manager = None
+            async_manager = self._async_manager
+            async_manager_backend = self._async_manager_backend
+            async_manager_loop = self._async_manager_loop
+            self._async_manager = None
+            self._async_manager_backend = None
+            self._async_manager_loop = None
+        if manager is not None:
+            manager.__exit__(None, None, None)
+        if async_manager is not None:
+            _close_async_manager(
+                async_manager, async_manager_backend, async_manager_loop  # type: ignore
+            )
+
+    async def async_close(self) -> None:
+        """Close the connection used for async queries.  This must be called
+        from the event loop which made the queries."""
+        with self._lock:
+            manager = self._async_manager
+            self._async_manager = None
+            self._async_manager_backend = None
+            self._async_manager_loop = None
+        if manager is not None:
+            await manager.__aexit__(None, None, None)
+
     def query(
         self,
         request: dns.message.QueryMessage,
@@ -327,11 +685,15 @@ class DoQNameserver(AddressAndPortNameserver):
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
     ) -> dns.message.Message:
+        connection = None
+        if dns.quic.have_quic and source is None and source_port == 0:
+            connection = self._get_connection()
         return dns.query.quic(
             request,
             self.address,
             port=self.port,
             timeout=timeout,
+            connection=connection,
             one_rr_per_rrset=one_rr_per_rrset,
             ignore_trailing=ignore_trailing,
             verify=self.verify,
@@ -349,11 +711,16 @@ class DoQNameserver(AddressAndPortNameserver):
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
     ) -> dns.message.Message:
+        connection = None
+        if dns.quic.have_quic and source is None and source_port == 0:
+            connection = self._get_async_connection(backend)
         return await dns.asyncquery.quic(
             request,
             self.address,
             port=self.port,
             timeout=timeout,
+            connection=connection,
+            backend=backend,
             one_rr_per_rrset=one_rr_per_rrset,
             ignore_trailing=ignore_trailing,
             verify=self.verify,
@@ -18,14 +18,17 @@
 """Talk to a DNS server."""
 
 import base64
+import collections
 import contextlib
 import enum
 import errno
 import os
+import queue
 import random
 import selectors
 import socket
 import struct
+import threading
 import time
 import urllib.parse
 from collections.abc import Callable
@@ -37,7 +40,9 @@ import dns.exception
 import dns.inet
 import dns.message
 import dns.name
+import dns.opcode
 import dns.quic
+import dns.rcode
 import dns.rdata
 import dns.rdataclass
 import dns.rdatatype
@@ -112,6 +117,9 @@ if _have_httpx2:
                     source = None
                 try:
                     sock = make_socket(af, socket.SOCK_STREAM, source)
+                    # HTTP/2 writes each request as several frames, which
+                    # must not wait for the acknowledgement of the last.
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                     attempt_expiration = _expiration_for_this_attempt(2.0, expiration)
                     _connect(
                         sock,
@@ -278,6 +286,98 @@ def _matches_destination(af, from_address, destination, ignore_unexpected):
     )
 
 
+class UDPStatistics:
+    """Counts of the datagrams examined while waiting for the response to a
+    UDP query with *ignore_errors* set, by :py:func:`dns.query.receive_udp`,
+    :py:func:`dns.asyncquery.receive_udp`, and the UDP multiplexers.
+
+    *received* is the number of datagrams examined, and *dropped* the number
+    of those which were dropped without being parsed, because a check of
+    their header and question bytes showed they could not be a response to
+    the query.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.received = 0
+        self.dropped = 0
+
+    def reset(self) -> None:
+        """Reset the counts to zero."""
+        with self.lock:
+            self.received = 0
+            self.dropped = 0
+
+    def _count(self, dropped: bool) -> None:
+        with self.lock:
+            self.received += 1
+            if dropped:
+                self.dropped += 1
+
+
+#: The statistics of all UDP queries.
+udp_statistics = UDPStatistics()
+
+
+class _ResponseFilter:
+    """A check of the wire format of a datagram which rejects most messages
+    that cannot be a response to *query*, without parsing them.
+
+    The ID, QR bit, opcode, and QDCOUNT must match, and the question must
+    be echoed byte for byte, ignoring ASCII case.  Messages which pass must
+    still be checked with ``query.is_response()``.
+    """
+
+    __slots__ = ("id", "opcode", "is_update", "qdcount", "question")
+
+    def __init__(self, query: dns.message.Message) -> None:
+        self.id = query.id
+        self.opcode = (query.flags >> 8) & 0x78
+        self.is_update = dns.opcode.is_update(query.flags)
+        self.qdcount = len(query.question)
+        self.question: bytes | None = None
+        if self.qdcount == 1:
+            # The only name in the question cannot be compressed, so we can
+            # compare the bytes.  With more questions, we leave it to
+            # is_response().
+            rrset = query.question[0]
+            try:
+                name = rrset.name.to_wire()
+            except dns.name.NeedAbsoluteNameOrOrigin:
+                return
+            assert name is not None
+            self.question = (
+                name + struct.pack("!HH", rrset.rdtype, rrset.rdclass)
+            ).lower()
+
+    def accepts(self, wire: bytes) -> bool:
+        dropped = not self._could_be_response(wire)
+        udp_statistics._count(dropped)
+        return not dropped
+
+    def _could_be_response(self, wire: bytes) -> bool:
+        if len(wire) < 12 or (wire[0] << 8 | wire[1]) != self.id:
+            return False
+        if wire[2] & 0x80 == 0 or wire[2] & 0x78 != self.opcode:
+            return False
+        if self.is_update:
+            return True
+        qdcount = wire[4] << 8 | wire[5]
+        if qdcount == 0 and wire[3] & 0x0F in (
+            dns.rcode.FORMERR,
+            dns.rcode.SERVFAIL,
+            dns.rcode.NOTIMP,
+            dns.rcode.REFUSED,
+        ):
+            # is_response() accepts these errors without a question.
+            return True
+        if qdcount != self.qdcount:
+            return False
+        if self.question is None:
+            return True
+        return wire[12 : 12 + len(self.question)].lower() == self.question
+
+
 def _destination_and_source(
     where, port, source, source_port, where_must_be_address=True
 ):
@@ -427,6 +527,41 @@ class HTTPVersion(enum.IntEnum):
     H3 = 3
 
 
+def _make_https_client(
+    verify: bool | str | ssl.SSLContext,
+    http_version: HTTPVersion,
+    bootstrap_address: str | None,
+    keepalive_expiry: float | None,
+    backend: Any | None = None,
+) -> Any:
+    # Make a client for DoH queries which keeps its connections open for up
+    # to keepalive_expiry seconds between queries.  If a dns.asyncbackend
+    # backend is given, the client is an async client using it.
+    h1 = http_version in (HTTPVersion.H1, HTTPVersion.DEFAULT)
+    h2 = http_version in (HTTPVersion.H2, HTTPVersion.DEFAULT)
+    limits = httpx2.Limits(  # pyright: ignore
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=keepalive_expiry,
+    )
+    if backend is None:
+        transport_class = _HTTPTransport
+        client_class = httpx2.Client  # pyright: ignore
+    else:
+        transport_class = backend.get_transport_class()
+        client_class = httpx2.AsyncClient  # pyright: ignore
+    transport = transport_class(
+        http1=h1,
+        http2=h2,
+        verify=verify,
+        bootstrap_address=bootstrap_address,
+        limits=limits,
+    )
+    return client_class(
+        http1=h1, http2=h2, verify=verify, transport=transport  # type: ignore
+    )
+
+
 def https(
     q: dns.message.Message,
     where: str,
@@ -697,7 +832,9 @@ def _http3(
                 where, port, source, source_port
             )
         start, expiration = _compute_times(timeout)
-        with the_connection.make_stream(timeout) as stream:  # type: ignore
+        # Queries are replayable, so may be sent as 0-RTT data.
+        early_data = q.opcode() == dns.opcode.QUERY
+        with the_connection.make_stream(timeout, early_data) as stream:  # type: ignore
             stream.send_h3(url, wire, post)
             wire = stream.receive(_remaining(expiration))
             _check_status(stream.headers(), where, wire)
@@ -823,6 +960,9 @@ def receive_udp(
     :rtype: tuple
     """
 
+    response_filter = None
+    if ignore_errors and query is not None:
+        response_filter = _ResponseFilter(query)
     wire = b""
     while True:
         wire, from_address = _udp_recv(sock, 65535, expiration)
@@ -830,6 +970,8 @@ def receive_udp(
             sock.family, from_address, destination, ignore_unexpected
         ):
             continue
+        if response_filter is not None and not response_filter.accepts(wire):
+            continue
         received_time = time.time()
         try:
             r = dns.message.from_wire(
@@ -1042,6 +1184,232 @@ def udp_with_fallback(
         return (response, True)
 
 
+def _multiplexer_key(af, address, id):
+    # The key matching responses to queries: the binary form of the address,
+    # so different textual forms of the same address compare equal, the port,
+    # and the message ID.
+    host = address[0]
+    if af == socket.AF_INET6:
+        host = host.split("%")[0]
+    return (dns.inet.inet_pton(af, host), address[1], id)
+
+
+def _multiplexer_response_key(af, from_address, wire):
+    # Returns the key of a datagram, or None if it is not worth routing
+    # because it is too short to be a DNS response or is not a response.
+    if len(wire) < 12 or wire[2] & 0x80 == 0:
+        return None
+    try:
+        return _multiplexer_key(af, from_address, (wire[0] << 8) | wire[1])
+    except Exception:
+        return None
+
+
+class UDPMultiplexer:
+    """Send many concurrent UDP queries over a small pool of sockets.
+
+    Each query made with :py:func:`dns.query.udp` creates, binds, and
+    closes a socket.  A multiplexer instead keeps *sockets* sockets per
+    address family, each bound to a random port chosen by the operating
+    system, and demultiplexes the responses to the waiting queries by source
+    address and message ID.  Queries with the same ID to the same nameserver
+    are sent on different sockets, and, as with :py:func:`dns.query.udp`,
+    each query checks that its response has the right question.  A
+    background thread per address family receives the responses.
+
+    A multiplexer may be shared by any number of threads, and should be
+    closed when it is no longer needed, e.g. by using it as a context
+    manager.
+    """
+
+    def __init__(self, sockets: int = 4) -> None:
+        if sockets < 1:
+            raise ValueError("sockets must be at least 1")
+        self.sockets = sockets
+        self._lock = threading.Lock()
+        self._closed = False
+        self._pools: dict[int, list[Any]] = {}
+        self._wakeups: dict[int, tuple[Any, Any]] = {}
+        self._threads: list[threading.Thread] = []
+        self._pending: dict[tuple, queue.SimpleQueue] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """Close the multiplexer's sockets.  Queries which are still waiting
+        for responses raise :py:exc:`EOFError`."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for _, send_wakeup in self._wakeups.values():
+                send_wakeup.send(b"\x00")
+        for thread in self._threads:
+            thread.join()
+        with self._lock:
+            for pool in self._pools.values():
+                for s in pool:
+                    s.close()
+            for wakeups in self._wakeups.values():
+                for s in wakeups:
+                    s.close()
+            for waiter in self._pending.values():
+                waiter.put(EOFError("multiplexer closed"))
+
+    def _pool(self, af: int) -> list[Any]:
+        # Get the sockets for the address family, creating them and their
+        # receiver thread if needed.  Must be called with the lock held.
+        if self._closed:
+            raise EOFError("multiplexer closed")
+        pool = self._pools.get(af)
+        if pool is None:
+            pool = []
+            try:
+                source = dns.inet.low_level_address_tuple(
+                    (dns.inet.any_for_af(af), 0), af
+                )
+                for _ in range(self.sockets):
+                    pool.append(make_socket(af, socket.SOCK_DGRAM, source))
+            except Exception:
+                for s in pool:
+                    s.close()
+                raise
+            self._pools[af] = pool
+            self._wakeups[af] = socket.socketpair()
+            thread = threading.Thread(
+                target=self._receive, args=(af, pool, self._wakeups[af][0]), daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+        return pool
+
+    def _receive(self, af: int, pool: list[Any], wakeup: Any) -> None:
+        with selectors.DefaultSelector() as selector:
+            for index, s in enumerate(pool):
+                selector.register(s, selectors.EVENT_READ, index)
+            selector.register(wakeup, selectors.EVENT_READ, None)
+            while True:
+                for key, _ in selector.select():
+                    if key.data is None:
+                        return
+                    self._read(af, key.data, key.fileobj)
+
+    def _read(self, af: int, index: int, s: Any) -> None:
+        while True:
+            try:
+                wire, from_address = s.recvfrom(65535)
+            except BlockingIOError:
+                return
+            except OSError:
+                # E.g. an ICMP error for an earlier query; the query will
+                # time out.
+                continue
+            received_time = time.time()
+            key = _multiplexer_response_key(af, from_address, wire)
+            if key is None:
+                continue
+            with self._lock:
+                waiter = self._pending.get((index,) + key)
+            if waiter is not None:
+                waiter.put((wire, received_time))
+
+    def query(
+        self,
+        q: dns.message.Message,
+        where: str,
+        timeout: float | None = None,
+        port: int = 53,
+        one_rr_per_rrset: bool = False,
+        ignore_trailing: bool = False,
+        raise_on_truncation: bool = False,
+        ignore_errors: bool = False,
+    ) -> dns.message.Message:
+        """Return the response obtained after sending a query via UDP.
+
+        The parameters are as for :py:func:`dns.query.udp`.  Responses from
+        unexpected sources are always ignored.
+        """
+
+        wire = q.to_wire()
+        af, destination, _ = _destination_and_source(where, port, None, 0, True)
+        assert af is not None
+        key = _multiplexer_key(af, destination, q.id)
+        begin_time, expiration = _compute_times(timeout)
+        waiter: queue.SimpleQueue = queue.SimpleQueue()
+        with self._lock:
+            pool = self._pool(af)
+            # Use a random socket, avoiding any already waiting for a
+            # response with this ID from this nameserver.
+            start = random.randrange(len(pool))
+            for i in range(len(pool)):
+                index = (start + i) % len(pool)
+                if (index,) + key not in self._pending:
+                    self._pending[(index,) + key] = waiter
+                    break
+            else:
+                index = -1
+        if index < 0:
+            return udp(
+                q,
+                where,
+                timeout,
+                port,
+                ignore_unexpected=True,
+                one_rr_per_rrset=one_rr_per_rrset,
+                ignore_trailing=ignore_trailing,
+                raise_on_truncation=raise_on_truncation,
+                ignore_errors=ignore_errors,
+            )
+        response_filter = _ResponseFilter(q) if ignore_errors else None
+        try:
+            _udp_send(pool[index], wire, destination, expiration)
+            while True:
+                try:
+                    item = waiter.get(timeout=_remaining(expiration))
+                except queue.Empty:
+                    raise dns.exception.Timeout
+                if isinstance(item, Exception):
+                    raise item
+                response_wire, received_time = item
+                if response_filter is not None and not response_filter.accepts(
+                    response_wire
+                ):
+                    continue
+                try:
+                    r = dns.message.from_wire(
+                        response_wire,
+                        keyring=q.keyring,
+                        request_mac=q.mac,
+                        one_rr_per_rrset=one_rr_per_rrset,
+                        ignore_trailing=ignore_trailing,
+                        raise_on_truncation=raise_on_truncation,
+                    )
+                except dns.message.Truncated as e:
+                    # As in receive_udp(), only believe the truncation if the
+                    # message seems to be a response.
+                    if ignore_errors and not q.is_response(e.message()):
+                        continue
+                    raise
+                except Exception:
+                    if ignore_errors:
+                        continue
+                    raise
+                if not q.is_response(r):
+                    if ignore_errors:
+                        continue
+                    raise BadResponse
+                r.time = received_time - begin_time
+                return r
+        finally:
+            with self._lock:
+                self._pending.pop((index,) + key, None)
+
+
 def _net_read(sock, count, expiration):
     """Read the specified number of bytes from sock.  Keep trying until we
     either get the desired amount, or we hit EOF.
@@ -1274,6 +1642,95 @@ def make_ssl_context(
     return ssl_context  # pyright: ignore
 
 
+class TLSSessionCache:
+    """A cache of TLS sessions, allowing connections to a server to resume
+    the session of an earlier connection instead of doing a full handshake.
+
+    Sessions are kept for up to *max_size* servers, keyed by the server's
+    address and port, the SNI name, and the SSL context, as a session can
+    only be resumed with the context which created it.  For the same
+    reason, the cache also provides the SSL contexts for queries which do
+    not specify one.
+
+    The number of handshakes which resumed a session is returned by
+    :py:meth:`hits`, and the number which did not by :py:meth:`misses`.
+    """
+
+    def __init__(self, max_size: int = 1000) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.sessions: collections.OrderedDict[tuple, ssl.SSLSession] = (
+            collections.OrderedDict()
+        )
+        self.contexts: dict[tuple, ssl.SSLContext] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def ssl_context(
+        self, verify: bool | str, server_hostname: str | None
+    ) -> ssl.SSLContext:
+        """Return the cached SSL context for DNS-over-TLS with the specified
+        *verify* setting, creating it if needed.  Hostname checking is
+        enabled if *server_hostname* is not ``None``."""
+        key = (verify, server_hostname is not None)
+        with self.lock:
+            context = self.contexts.get(key)
+            if context is None:
+                context = make_ssl_context(verify, server_hostname is not None, ["dot"])
+                self.contexts[key] = context
+            return context
+
+    def get(self, key: tuple) -> ssl.SSLSession | None:
+        """Return the session to offer for *key*, or ``None``."""
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is None:
+                return None
+            if session.time + session.timeout < time.time():
+                del self.sessions[key]
+                return None
+            self.sessions.move_to_end(key)
+            return session
+
+    def put(self, key: tuple, session: ssl.SSLSession | None, reused: bool) -> None:
+        """Record the outcome of a handshake, and the session to offer the
+        next time."""
+        with self.lock:
+            if reused:
+                self._hits += 1
+            else:
+                self._misses += 1
+            if session is None:
+                return
+            self.sessions[key] = session
+            self.sessions.move_to_end(key)
+            while len(self.sessions) > self.max_size:
+                self.sessions.popitem(last=False)
+
+    def hits(self) -> int:
+        """How many handshakes resumed a session?"""
+        with self.lock:
+            return self._hits
+
+    def misses(self) -> int:
+        """How many handshakes did not resume a session?"""
+        with self.lock:
+            return self._misses
+
+    def reset_statistics(self) -> None:
+        """Reset the hit and miss counts."""
+        with self.lock:
+            self._hits = 0
+            self._misses = 0
+
+    def flush(self) -> None:
+        """Forget all sessions."""
+        with self.lock:
+            self.sessions.clear()
+
+
 # for backwards compatibility
 def _make_dot_ssl_context(
     server_hostname: str | None, verify: bool | str
@@ -1281,6 +1738,18 @@ def _make_dot_ssl_context(
     return make_ssl_context(verify, server_hostname is not None, ["dot"])
 
 
+def _resume_tls_session(s, session_cache, key):
+    if session_cache is not None:
+        session = session_cache.get(key)
+        if session is not None:
+            s.session = session
+
+
+def _save_tls_session(s, session_cache, key):
+    if session_cache is not None:
+        session_cache.put(key, s.session, s.session_reused)
+
+
 def tls(
     q: dns.message.Message,
     where: str,
@@ -1294,6 +1763,7 @@ def tls(
     ssl_context: ssl.SSLContext | None = None,
     server_hostname: str | None = None,
     verify: bool | str = True,
+    session_cache: TLSSessionCache | None = None,
 ) -> dns.message.Message:
     """Return the response obtained after sending a query via TLS.
 
@@ -1333,6 +1803,10 @@ def tls(
         roots; if ``False``, disable verification; if a ``str``, path to a
         certificate file or directory.
     :type verify: bool or str
+    :param session_cache: If not ``None``, a cache of TLS sessions used to
+        resume an earlier session with the server, saving a full handshake.
+        If *ssl_context* is ``None``, the cache's SSL context is used.
+    :type session_cache: :py:class:`dns.query.TLSSessionCache` or ``None``
     :rtype: :py:class:`dns.message.Message`
     """
 
@@ -1359,7 +1833,10 @@ def tls(
     )
     assert af is not None  # where must be an address
     if ssl_context is None:
-        ssl_context = make_ssl_context(verify, server_hostname is not None, ["dot"])
+        if session_cache is not None:
+            ssl_context = session_cache.ssl_context(verify, server_hostname)
+        else:
+            ssl_context = make_ssl_context(verify, server_hostname is not None, ["dot"])
 
     with make_ssl_socket(
         af,
@@ -1368,12 +1845,17 @@ def tls(
         server_hostname=server_hostname,
         source=source,
     ) as s:
+        session_key = (destination, server_hostname, ssl_context)
         _connect(s, destination, expiration)
+        _resume_tls_session(s, session_cache, session_key)
         _tls_handshake(s, expiration)
         send_tcp(s, wire, expiration)
         r, received_time = receive_tcp(
             s, expiration, one_rr_per_rrset, q.keyring, q.mac, ignore_trailing
         )
+        # With TLS 1.3, the session is only available once we have read
+        # something after the handshake.
+        _save_tls_session(s, session_cache, session_key)
         r.time = received_time - begin_time
         if not q.is_response(r):
             raise BadResponse
@@ -1383,6 +1865,339 @@ def tls(
     )
 
 
+class _PooledConnection:
+    """A TCP or TLS connection over which queries are pipelined.
+
+    There is no reader thread.  Instead, whichever waiting query gets to be
+    the reader reads responses and hands them to the queries they answer
+    until its own response arrives.  Socket calls are made with *io_lock*
+    held, as an SSL socket must not be used by two threads at once, but
+    waiting for the socket happens without it.
+    """
+
+    def __init__(self) -> None:
+        self.sock: Any = None
+        # Set when the connection attempt has finished, successfully or not.
+        self.connected = threading.Event()
+        self.closed = False
+        self.io_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        # The condition's lock protects the remaining attributes.
+        self.condition = threading.Condition()
+        # The responses received for outstanding queries, by message ID, or
+        # None if the response has not arrived yet.
+        self.pending: dict[int, bytes | None] = {}
+        self.reading = False
+        self.buffer = b""
+        self.error: Exception | None = None
+        self.last_used = time.time()
+
+    def connect(
+        self, connect: Callable[[float | None], Any], expiration: float | None
+    ) -> None:
+        try:
+            sock = connect(expiration)
+            with self.io_lock:
+                if self.closed:
+                    sock.close()
+                    raise EOFError("connection pool closed")
+                self.sock = sock
+        except Exception as e:
+            self.error = e
+        finally:
+            self.connected.set()
+
+    def _send(self, data: bytes, expiration: float | None) -> None:
+        current = 0
+        while current < len(data):
+            with self.io_lock:
+                try:
+                    current += self.sock.send(data[current:])
+                    continue
+                except (BlockingIOError, ssl.SSLWantWriteError):
+                    readable = False
+                except ssl.SSLWantReadError:  # pragma: no cover
+                    readable = True
+            _wait_for(self.sock, readable, not readable, True, expiration)
+
+    def _read_message(self, expiration: float | None) -> bytes:
+        # Read until the buffer holds a whole message, and return it.  The
+        # buffer survives a timeout, so the next reader carries on.
+        while True:
+            if len(self.buffer) >= 2:
+                (l,) = struct.unpack("!H", self.buffer[:2])
+                if len(self.buffer) >= 2 + l:
+                    wire = self.buffer[2 : 2 + l]
+                    self.buffer = self.buffer[2 + l :]
+                    return wire
+            with self.io_lock:
+                try:
+                    data = self.sock.recv(65535)
+                    if data == b"":
+                        raise EOFError("EOF")
+                    self.buffer += data
+                    continue
+                except (BlockingIOError, ssl.SSLWantReadError):
+                    writable = False
+                except ssl.SSLWantWriteError:  # pragma: no cover
+                    writable = True
+            _wait_for(self.sock, not writable, writable, True, expiration)
+
+    def exchange(self, id: int, tcpmsg: bytes, expiration: float | None) -> bytes:
+        """Send *tcpmsg*, the length-prefixed query with ID *id*, and return
+        the wire format of its response.  The caller must have reserved
+        *id* in *pending*."""
+        try:
+            if not self.connected.wait(_remaining(expiration)):
+                raise dns.exception.Timeout
+            if self.error is not None:
+                raise self.error
+            with self.write_lock:
+                try:
+                    self._send(tcpmsg, expiration)
+                except Exception as e:
+                    # We may have sent part of the message, so the connection
+                    # is unusable.
+                    self.error = e
+                    raise
+            with self.condition:
+                while True:
+                    if self.error is not None:
+                        raise self.error
+                    wire = self.pending.get(id)
+                    if wire is not None:
+                        return wire
+                    if self.reading:
+                        self.condition.wait(_remaining(expiration))
+                        continue
+                    self.reading = True
+                    self.condition.release()
+                    try:
+                        wire = self._read_message(expiration)
+                    except dns.exception.Timeout:
+                        raise
+                    except Exception as e:
+                        self.error = e
+                        raise
+                    finally:
+                        self.condition.acquire()
+                        self.reading = False
+                        self.condition.notify_all()
+                    rid = int.from_bytes(wire[:2], "big") if len(wire) >= 2 else -1
+                    if rid in self.pending:
+                        self.pending[rid] = wire
+                    # Otherwise it is a late response to a query which timed
+                    # out, and we drop it.
+        finally:
+            with self.condition:
+                del self.pending[id]
+                self.last_used = time.time()
+
+    def close(self) -> None:
+        with self.io_lock:
+            self.closed = True
+            if self.sock is not None:
+                self.sock.close()
+
+
+class ConnectionPool:
+    """A pool of persistent TCP and TLS connections to nameservers.
+
+    Each query made with :py:func:`dns.query.tcp` or :py:func:`dns.query.tls`
+    makes a new connection, and, for TLS, does a new handshake.  A pool keeps
+    connections open for reuse, keyed by the nameserver address and port and
+    the TLS parameters, and pipelines up to *max_pipelined* outstanding
+    queries over each connection as described in :rfc:`7766`, matching
+    responses to queries by message ID.  Connections which have been idle for
+    more than *idle_timeout* seconds are closed.
+
+    A pool may be shared by any number of threads, and should be closed when
+    it is no longer needed, e.g. by using it as a context manager.
+    """
+
+    def __init__(self, max_pipelined: int = 100, idle_timeout: float = 30.0) -> None:
+        if max_pipelined < 1:
+            raise ValueError("max_pipelined must be at least 1")
+        self.max_pipelined = max_pipelined
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._closed = False
+        self._connections: dict[tuple, list[_PooledConnection]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """Close all of the pool's connections."""
+        with self._lock:
+            self._closed = True
+            connections = self._connections
+            self._connections = {}
+        for pool in connections.values():
+            for connection in pool:
+                connection.close()
+
+    def _reserve(self, key: tuple, id: int) -> _PooledConnection | None:
+        # Find a connection which can take another query with this ID, and
+        # reserve the ID on it.  Must be called with the lock held.
+        if self._closed:
+            raise EOFError("connection pool closed")
+        pool = self._connections.get(key, [])
+        now = time.time()
+        for connection in pool[:]:
+            with connection.condition:
+                if connection.error is not None or (
+                    not connection.pending
+                    and now - connection.last_used > self.idle_timeout
+                ):
+                    pool.remove(connection)
+                    connection.close()
+                    continue
+                if (
+                    len(connection.pending) < self.max_pipelined
+                    and id not in connection.pending
+                ):
+                    connection.pending[id] = None
+                    return connection
+        return None
+
+    def _query(
+        self,
+        q: dns.message.Message,
+        key: tuple,
+        connect: Callable[[float | None], Any],
+        timeout: float | None,
+        one_rr_per_rrset: bool,
+        ignore_trailing: bool,
+        connected: Callable[[Any], None] | None = None,
+    ) -> dns.message.Message:
+        tcpmsg = q.to_wire(prepend_length=True)
+        begin_time, expiration = _compute_times(timeout)
+        while True:
+            with self._lock:
+                connection = self._reserve(key, q.id)
+                reused = connection is not None
+                if connection is None:
+                    # Queries made while we connect will wait for this
+                    # connection rather than making their own.
+                    connection = _PooledConnection()
+                    connection.pending[q.id] = None
+                    self._connections.setdefault(key, []).append(connection)
+            if not reused:
+                connection.connect(connect, expiration)
+            try:
+                wire = connection.exchange(q.id, tcpmsg, expiration)
+                if not reused and connected is not None:
+                    # The first response on a new connection has arrived.
+                    with connection.io_lock:
+                        connected(connection.sock)
+                break
+            except (EOFError, ConnectionError):
+                # The nameserver may have closed an idle connection just as
+                # we reused it, so try once more with a new one.
+                if not reused:
+                    raise
+        received_time = time.time()
+        r = dns.message.from_wire(
+            wire,
+            keyring=q.keyring,
+            request_mac=q.mac,
+            one_rr_per_rrset=one_rr_per_rrset,
+            ignore_trailing=ignore_trailing,
+        )
+        r.time = received_time - begin_time
+        if not q.is_response(r):
+            raise BadResponse
+        return r
+
+    def tcp(
+        self,
+        q: dns.message.Message,
+        where: str,
+        timeout: float | None = None,
+        port: int = 53,
+        one_rr_per_rrset: bool = False,
+        ignore_trailing: bool = False,
+    ) -> dns.message.Message:
+        """Return the response obtained after sending a query via TCP.
+
+        The parameters are as for :py:func:`dns.query.tcp`.
+        """
+
+        af, destination, _ = _destination_and_source(where, port, None, 0, True)
+        assert af is not None
+
+        def connect(expiration):
+            s = make_socket(af, socket.SOCK_STREAM)
+            try:
+                _connect(s, destination, expiration)
+            except Exception:
+                s.close()
+                raise
+            return s
+
+        return self._query(
+            q, (destination,), connect, timeout, one_rr_per_rrset, ignore_trailing
+        )
+
+    def tls(
+        self,
+        q: dns.message.Message,
+        where: str,
+        timeout: float | None = None,
+        port: int = 853,
+        one_rr_per_rrset: bool = False,
+        ignore_trailing: bool = False,
+        ssl_context: ssl.SSLContext | None = None,
+        server_hostname: str | None = None,
+        verify: bool | str = True,
+        session_cache: TLSSessionCache | None = None,
+    ) -> dns.message.Message:
+        """Return the response obtained after sending a query via TLS.
+
+        The parameters are as for :py:func:`dns.query.tls`.
+        """
+
+        af, destination, _ = _destination_and_source(where, port, None, 0, True)
+        assert af is not None
+        if ssl_context is None and session_cache is not None:
+            ssl_context = session_cache.ssl_context(verify, server_hostname)
+        if ssl_context is None:
+            key: tuple = (destination, server_hostname, verify)
+        else:
+            key = (destination, server_hostname, ssl_context)
+
+        def connect(expiration):
+            context = ssl_context
+            if context is None:
+                context = make_ssl_context(verify, server_hostname is not None, ["dot"])
+            s = make_ssl_socket(
+                af,
+                socket.SOCK_STREAM,
+                ssl_context=context,
+                server_hostname=server_hostname,
+            )
+            try:
+                _connect(s, destination, expiration)
+                _resume_tls_session(s, session_cache, key)
+                _tls_handshake(s, expiration)
+            except Exception:
+                s.close()
+                raise
+            return s
+
+        def connected(s):
+            _save_tls_session(s, session_cache, key)
+
+        return self._query(
+            q, key, connect, timeout, one_rr_per_rrset, ignore_trailing, connected
+        )
+
+
 def quic(
     q: dns.message.Message,
     where: str,
@@ -1458,7 +2273,9 @@ def quic(
                 where, port, source, source_port
             )
         start, expiration = _compute_times(timeout)
-        with the_connection.make_stream(timeout) as stream:  # type: ignore
+        # Queries are replayable, so may be sent as 0-RTT data.
+        early_data = q.opcode() == dns.opcode.QUERY
+        with the_connection.make_stream(timeout, early_data) as stream:  # type: ignore
             stream.send(wire, True)
             wire = stream.receive(_remaining(expiration))
         finish = time.time()
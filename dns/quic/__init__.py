@@ -12,6 +12,7 @@ if dns._features.have("doq"):
     from dns.quic._asyncio import AsyncioQuicStream as AsyncioQuicStream
     from dns.quic._common import AsyncQuicConnection  # pyright: ignore
     from dns.quic._common import AsyncQuicManager as AsyncQuicManager
+    from dns.quic._common import QuicStatistics as QuicStatistics
     from dns.quic._sync import SyncQuicConnection  # pyright: ignore
     from dns.quic._sync import SyncQuicStream  # pyright: ignore
     from dns.quic._sync import SyncQuicManager as SyncQuicManager
@@ -64,14 +65,14 @@ else:  # pragma: no cover
         pass
 
     class AsyncQuicConnection:  # pyright: ignore
-        async def make_stream(self) -> Any:
+        async def make_stream(self, timeout=None, early_data=False) -> Any:
             raise NotImplementedError
 
     class SyncQuicStream:  # pyright: ignore
         pass
 
     class SyncQuicConnection:  # pyright: ignore
-        def make_stream(self) -> Any:
+        def make_stream(self, timeout=None, early_data=False) -> Any:
             raise NotImplementedError
 
 
@@ -184,6 +184,7 @@ class AsyncioQuicConnection(AsyncQuicConnection):
                     if stream:
                         await stream._add_input(event.data, event.end_stream)
             elif isinstance(event, aioquic.quic.events.HandshakeCompleted):
+                self._handshake_completed(event)
                 self._handshake_complete.set()
             elif isinstance(event, aioquic.quic.events.ConnectionTerminated):
                 self._done = True
@@ -210,16 +211,18 @@ class AsyncioQuicConnection(AsyncQuicConnection):
         self._receiver_task = asyncio.Task(self._receiver())
         self._sender_task = asyncio.Task(self._sender())
 
-    async def make_stream(self, timeout=None):
-        try:
-            await asyncio.wait_for(self._handshake_complete.wait(), timeout)
-        except TimeoutError:
-            raise dns.exception.Timeout
+    async def make_stream(self, timeout=None, early_data=False):
+        if not self._may_send_early(early_data):
+            try:
+                await asyncio.wait_for(self._handshake_complete.wait(), timeout)
+            except TimeoutError:
+                raise dns.exception.Timeout
         if self._done:
             raise UnexpectedEOF
         stream_id = self._connection.get_next_available_stream_id(False)
         stream = AsyncioQuicStream(self, stream_id)
         self._streams[stream_id] = stream
+        self._stream_made()
         return stream
 
     async def close(self):
@@ -5,6 +5,7 @@ import copy
 import functools
 import socket
 import struct
+import threading
 import time
 import urllib.parse
 from typing import Any
@@ -27,6 +28,45 @@ class UnexpectedEOF(Exception):
     pass
 
 
+class QuicStatistics:
+    """Counts of what a QUIC manager's connections have done.
+
+    *connections* is the number of connections made, *handshakes* the
+    number of completed handshakes, *resumptions* the number of those which
+    resumed an earlier session, *early_data* the number of those where the
+    server accepted 0-RTT data, and *streams* the number of streams made.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.handshakes = 0
+        self.resumptions = 0
+        self.early_data = 0
+        self.streams = 0
+
+    def streams_per_connection(self) -> float:
+        """The mean number of streams made on each connection."""
+        with self.lock:
+            if self.connections == 0:
+                return 0.0
+            return self.streams / self.connections
+
+    def reset(self) -> None:
+        """Reset all counts to zero."""
+        with self.lock:
+            self.connections = 0
+            self.handshakes = 0
+            self.resumptions = 0
+            self.early_data = 0
+            self.streams = 0
+
+    def _count(self, **counts):
+        with self.lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+
 class Buffer:
     def __init__(self):
         self._buffer = b""
@@ -165,6 +205,8 @@ class BaseQuicConnection:
         self._closed = False
         self._manager = manager
         self._streams = {}
+        # Can streams be sent as 0-RTT data before the handshake completes?
+        self._early_data = False
         if manager is not None and manager.is_h3():
             self._h3_conn = aioquic.h3.connection.H3Connection(connection, False)
         else:
@@ -197,6 +239,23 @@ class BaseQuicConnection:
         assert self._h3_conn is not None
         self._h3_conn.send_data(stream_id, data, is_end)
 
+    def _may_send_early(self, early_data):
+        # Only replayable messages may be sent as 0-RTT data, so the caller
+        # must ask for it.
+        return early_data and self._early_data and not self._done
+
+    def _handshake_completed(self, event):
+        if self._manager is not None:
+            self._manager.statistics._count(
+                handshakes=1,
+                resumptions=int(event.session_resumed),
+                early_data=int(event.early_data_accepted),
+            )
+
+    def _stream_made(self):
+        if self._manager is not None:
+            self._manager.statistics._count(streams=1)
+
     def _get_timer_values(self, closed_is_special=True):
         now = time.time()
         expiration = self._connection.get_timer()
@@ -217,7 +276,9 @@ class BaseQuicConnection:
 
 
 class AsyncQuicConnection(BaseQuicConnection):
-    async def make_stream(self, timeout: float | None = None) -> Any:
+    async def make_stream(
+        self, timeout: float | None = None, early_data: bool = False
+    ) -> Any:
         pass
 
 
@@ -230,6 +291,7 @@ class BaseQuicManager:
         self._session_tickets = {}
         self._tokens = {}
         self._h3 = h3
+        self.statistics = QuicStatistics()
         if conf is None:
             verify_path = None
             if isinstance(verify_mode, str):
@@ -262,7 +324,12 @@ class BaseQuicManager:
     ):
         connection = self._connections.get((address, port))
         if connection is not None:
-            return (connection, False)
+            if not connection._done:
+                return (connection, False)
+            # The connection has ended, e.g. by the server closing it when
+            # idle, so replace it.  Its resources are released by its own
+            # tasks ending, and it must not remove its replacement.
+            connection._manager = None
         conf = self._conf
         if want_session_ticket:
             try:
@@ -304,7 +371,13 @@ class BaseQuicManager:
         connection = self._connection_factory(
             qconn, address, port, source, source_port, self
         )
+        # A session ticket which allows early data lets us send 0-RTT data.
+        connection._early_data = (
+            conf.session_ticket is not None
+            and conf.session_ticket.max_early_data_size is not None
+        )
         self._connections[(address, port)] = connection
+        self.statistics._count(connections=1)
         return (connection, True)
 
     def closed(self, address, port):
@@ -194,6 +194,7 @@ class SyncQuicConnection(BaseQuicConnection):
                     if stream:
                         stream._add_input(event.data, event.end_stream)
             elif isinstance(event, aioquic.quic.events.HandshakeCompleted):
+                self._handshake_completed(event)
                 self._handshake_complete.set()
             elif isinstance(event, aioquic.quic.events.ConnectionTerminated):
                 with self._lock:
@@ -227,15 +228,17 @@ class SyncQuicConnection(BaseQuicConnection):
         self._worker_thread = threading.Thread(target=self._worker)
         self._worker_thread.start()
 
-    def make_stream(self, timeout=None):
-        if not self._handshake_complete.wait(timeout):
-            raise dns.exception.Timeout
+    def make_stream(self, timeout=None, early_data=False):
+        if not self._may_send_early(early_data):
+            if not self._handshake_complete.wait(timeout):
+                raise dns.exception.Timeout
         with self._lock:
             if self._done:
                 raise UnexpectedEOF
             stream_id = self._connection.get_next_available_stream_id(False)
             stream = SyncQuicStream(self, stream_id)
             self._streams[stream_id] = stream
+        self._stream_made()
         return stream
 
     def close_stream(self, stream_id):
@@ -159,6 +159,7 @@ class TrioQuicConnection(AsyncQuicConnection):
                     if stream:
                         await stream._add_input(event.data, event.end_stream)
             elif isinstance(event, aioquic.quic.events.HandshakeCompleted):
+                self._handshake_completed(event)
                 self._handshake_complete.set()
             elif isinstance(event, aioquic.quic.events.ConnectionTerminated):
                 self._done = True
@@ -186,18 +187,20 @@ class TrioQuicConnection(AsyncQuicConnection):
             nursery.start_soon(self._worker)
         self._run_done.set()
 
-    async def make_stream(self, timeout=None):
+    async def make_stream(self, timeout=None, early_data=False):
         if timeout is None:
             context = NullContext(None)
         else:
             context = trio.move_on_after(timeout)
         with context:
-            await self._handshake_complete.wait()
+            if not self._may_send_early(early_data):
+                await self._handshake_complete.wait()
             if self._done:
                 raise UnexpectedEOF
             stream_id = self._connection.get_next_available_stream_id(False)
             stream = TrioQuicStream(self, stream_id)
             self._streams[stream_id] = stream
+            self._stream_made()
             return stream
         raise dns.exception.Timeout
 
@@ -118,7 +118,7 @@ class Renderer:
         self.flags = flags
         self.max_size = max_size
         self.origin = origin
-        self.compress = {}
+        self.compress = dns.name.CompressionTable()
         self.section = QUESTION
         self.counts = [0, 0, 0, 0]
         self.output.write(b"\x00" * 12)
@@ -134,12 +134,7 @@ class Renderer:
 
         self.output.seek(where)
         self.output.truncate()
-        keys_to_delete = []
-        for k, v in self.compress.items():
-            if v >= where:
-                keys_to_delete.append(k)
-        for k in keys_to_delete:
-            del self.compress[k]
+        self.compress.rollback(where)
 
     def _set_section(self, section):
         """Set the renderer's current section.
@@ -17,14 +17,18 @@
 
 """DNS stub resolver."""
 
+import concurrent.futures
 import contextlib
+import copy
+import heapq
+import itertools
 import random
 import socket
 import sys
 import threading
 import time
 import warnings
-from collections.abc import Iterator, Sequence
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
 from typing import Any, cast
 from urllib.parse import urlparse
 
@@ -46,6 +50,7 @@ import dns.rdatatype
 import dns.rdtypes.ANY.PTR
 import dns.rdtypes.svcbbase
 import dns.reversename
+import dns.rrset
 import dns.tsig
 
 if sys.platform == "win32":  # pragma: no cover
@@ -376,18 +381,29 @@ class HostAnswers(Answers):
 
 
 class CacheStatistics:
-    """Cache Statistics"""
+    """Cache Statistics
 
-    def __init__(self, hits: int = 0, misses: int = 0) -> None:
+    *evictions* counts entries removed to make room for new ones, and
+    *bytes* is the approximate size of the cached answers for caches which
+    track it.  Unlike the other statistics, *bytes* is a current value,
+    not a counter, and is not reset by ``reset()``.
+    """
+
+    def __init__(
+        self, hits: int = 0, misses: int = 0, evictions: int = 0, bytes: int = 0
+    ) -> None:
         self.hits = hits
         self.misses = misses
+        self.evictions = evictions
+        self.bytes = bytes
 
     def reset(self) -> None:
         self.hits = 0
         self.misses = 0
+        self.evictions = 0
 
     def clone(self) -> "CacheStatistics":
-        return CacheStatistics(self.hits, self.misses)
+        return CacheStatistics(self.hits, self.misses, self.evictions, self.bytes)
 
 
 class CacheBase:
@@ -424,34 +440,81 @@ class CacheBase:
 CacheKey = tuple[dns.name.Name, dns.rdatatype.RdataType, dns.rdataclass.RdataClass]
 
 
+def _make_stale_answer(answer: Answer, ttl: float) -> Answer:
+    """Return a copy of the expired *answer* which is valid for *ttl* seconds.
+
+    The copy's RRset is also copied, so that its TTL can be set to *ttl*
+    without changing the cached answer.
+    """
+    stale = copy.copy(answer)
+    stale.expiration = time.time() + ttl
+    if answer.rrset is not None:
+        rrset = cast(dns.rrset.RRset, answer.rrset.copy())
+        rrset.ttl = int(ttl)
+        stale.rrset = rrset
+    return stale
+
+
 class Cache(CacheBase):
-    """Simple thread-safe DNS answer cache."""
+    """Simple thread-safe DNS answer cache.
+
+    Expired entries are reclaimed incrementally.  The cache keeps a heap
+    of entries ordered by expiration time, and each ``get()`` and ``put()``
+    removes at most *cleaning_batch* expired entries, so no operation has
+    to scan the whole cache.
 
-    def __init__(self, cleaning_interval: float = 300.0) -> None:
+    If *max_stale_ttl* is greater than 0, expired entries are retained for
+    that many seconds so the resolver can serve them if it cannot get a
+    fresh answer (see :rfc:`8767`).
+    """
+
+    def __init__(
+        self,
+        cleaning_interval: float = 300.0,
+        cleaning_batch: int = 100,
+        max_stale_ttl: float = 0.0,
+        stale_answer_ttl: float = 30.0,
+    ) -> None:
         """Initialize the cache.
 
-        :param cleaning_interval: Seconds between periodic cache cleanings.
+        :param cleaning_interval: Retained for backwards compatibility; it is
+            no longer used, as expired entries are reclaimed incrementally.
         :type cleaning_interval: float
+        :param cleaning_batch: The maximum number of expired entries reclaimed
+            by a single ``get()`` or ``put()``; must be greater than 0.
+        :type cleaning_batch: int
+        :param max_stale_ttl: How many seconds to retain expired entries
+            for serving stale.  0, the default, disables serving stale.
+        :type max_stale_ttl: float
+        :param stale_answer_ttl: The TTL of stale answers.
+        :type stale_answer_ttl: float
         """
 
         super().__init__()
         self.data: dict[CacheKey, Answer] = {}
         self.cleaning_interval = cleaning_interval
-        self.next_cleaning: float = time.time() + self.cleaning_interval
+        self.cleaning_batch = max(cleaning_batch, 1)
+        self.max_stale_ttl = max_stale_ttl
+        self.stale_answer_ttl = stale_answer_ttl
+        # A heap of (expiration, sequence, key) tuples.  The sequence number
+        # breaks ties so keys are never compared.  Entries for keys which
+        # have since been replaced or flushed are discarded when popped.
+        self.expirations: list[tuple[float, int, CacheKey]] = []
+        self.sequence = itertools.count()
 
     def _maybe_clean(self) -> None:
-        """Clean the cache if it's time to do so."""
-
-        now = time.time()
-        if self.next_cleaning <= now:
-            keys_to_delete = []
-            for k, v in self.data.items():
-                if v.expiration <= now:
-                    keys_to_delete.append(k)
-            for k in keys_to_delete:
-                del self.data[k]
-            now = time.time()
-            self.next_cleaning = now + self.cleaning_interval
+        """Reclaim up to *cleaning_batch* expired entries."""
+
+        # Entries are retained until they are too stale to serve.
+        now = time.time() - self.max_stale_ttl
+        expirations = self.expirations
+        for _ in range(self.cleaning_batch):
+            if not expirations or expirations[0][0] > now:
+                break
+            _, _, key = heapq.heappop(expirations)
+            v = self.data.get(key)
+            if v is not None and v.expiration <= now:
+                del self.data[key]
 
     def get(self, key: CacheKey) -> Answer | None:
         """Get the answer associated with *key*, or ``None`` if not cached.
@@ -465,12 +528,37 @@ class Cache(CacheBase):
         with self.lock:
             self._maybe_clean()
             v = self.data.get(key)
-            if v is None or v.expiration <= time.time():
+            now = time.time()
+            if v is None or v.expiration <= now:
+                if v is not None and v.expiration + self.max_stale_ttl <= now:
+                    del self.data[key]
                 self.statistics.misses += 1
                 return None
             self.statistics.hits += 1
             return v
 
+    def get_stale(self, key: CacheKey) -> Answer | None:
+        """Get a stale answer for *key*.
+
+        Returns ``None`` unless the cached answer has expired, but by no more
+        than *max_stale_ttl* seconds.  The returned answer is a copy of the
+        cached one whose TTL is *stale_answer_ttl*.
+
+        :param key: A (name, rdtype, rdclass) tuple identifying the query.
+        :rtype: :py:class:`dns.resolver.Answer` or ``None``
+        """
+
+        with self.lock:
+            v = self.data.get(key)
+            now = time.time()
+            if (
+                v is None
+                or v.expiration > now
+                or v.expiration + self.max_stale_ttl <= now
+            ):
+                return None
+            return _make_stale_answer(v, self.stale_answer_ttl)
+
     def put(self, key: CacheKey, value: Answer) -> None:
         """Associate *key* with *value* in the cache.
 
@@ -481,7 +569,24 @@ class Cache(CacheBase):
 
         with self.lock:
             self._maybe_clean()
+            old = self.data.get(key)
             self.data[key] = value
+            if old is not None and old.expiration == value.expiration:
+                # The heap already has an entry for this expiration.
+                return
+            expirations = self.expirations
+            if len(expirations) >= 2 * len(self.data):
+                # Most entries are for keys which have since been replaced or
+                # flushed, so rebuild the heap from the live entries.
+                expirations = [
+                    (v.expiration, next(self.sequence), k) for k, v in self.data.items()
+                ]
+                heapq.heapify(expirations)
+                self.expirations = expirations
+            else:
+                heapq.heappush(
+                    expirations, (value.expiration, next(self.sequence), key)
+                )
 
     def flush(self, key: CacheKey | None = None) -> None:
         """Flush the cache.
@@ -496,16 +601,36 @@ class Cache(CacheBase):
                     del self.data[key]
             else:
                 self.data = {}
-                self.next_cleaning = time.time() + self.cleaning_interval
+                self.expirations = []
+
+
+def _answer_size(answer: Answer) -> int:
+    """Estimate the number of bytes used by *answer*.
+
+    This is the length of the wire format response the answer was made
+    from, which is a reasonable proxy for the relative memory cost of
+    answers.  Answers whose wire format is not known count as
+    ``_DEFAULT_ANSWER_SIZE`` bytes.
+    """
+    wire = getattr(getattr(answer, "response", None), "wire", None)
+    if wire is None:
+        return _DEFAULT_ANSWER_SIZE
+    return len(wire)
+
+
+_DEFAULT_ANSWER_SIZE = 512
 
 
 class LRUCacheNode:
     """LRUCache node."""
 
-    def __init__(self, key, value):
+    def __init__(self, key, value, size=0, ttl=0.0):
         self.key = key
         self.value = value
+        self.size = size
+        self.ttl = ttl
         self.hits = 0
+        self.prefetching = False
         self.prev = self
         self.next = self
 
@@ -528,19 +653,61 @@ class LRUCache(CacheBase):
     resolutions.  The LRUCache has a maximum number of nodes, and when
     it is full, the least-recently used node is removed to make space
     for a new one.
+
+    The cache may also be bounded by the approximate number of bytes of
+    the cached answers, in which case least-recently used nodes are
+    removed until a new answer fits.  The size of an answer is estimated
+    from the length of its wire format response.
+
+    If prefetching is enabled, a resolver using the cache will refresh a
+    popular answer in the background when it is hit close to its
+    expiration, so that clients keep getting cache hits.
+
+    If *max_stale_ttl* is greater than 0, expired entries are retained for
+    that many seconds so the resolver can serve them if it cannot get a
+    fresh answer (see :rfc:`8767`).  Stale entries still count against the
+    size of the cache.
     """
 
-    def __init__(self, max_size: int = 100000) -> None:
+    def __init__(
+        self,
+        max_size: int = 100000,
+        max_bytes: int | None = None,
+        prefetch_fraction: float | None = None,
+        prefetch_hits: int = 1,
+        max_stale_ttl: float = 0.0,
+        stale_answer_ttl: float = 30.0,
+    ) -> None:
         """Initialize an LRU cache.
 
         :param max_size: The maximum number of nodes to cache; must be greater
             than 0.
         :type max_size: int
+        :param max_bytes: If not ``None``, the maximum approximate number of
+            bytes of answers to cache.
+        :type max_bytes: int or ``None``
+        :param prefetch_fraction: If not ``None``, enable prefetching.  An
+            answer is refreshed when it is hit with less than this fraction
+            of its TTL remaining, e.g. ``0.1`` for the last 10% of the TTL.
+        :type prefetch_fraction: float or ``None``
+        :param prefetch_hits: The minimum number of hits an answer must have
+            had, including the current one, to be prefetched.
+        :type prefetch_hits: int
+        :param max_stale_ttl: How many seconds to retain expired entries
+            for serving stale.  0, the default, disables serving stale.
+        :type max_stale_ttl: float
+        :param stale_answer_ttl: The TTL of stale answers.
+        :type stale_answer_ttl: float
         """
 
         super().__init__()
         self.data: dict[CacheKey, LRUCacheNode] = {}
         self.set_max_size(max_size)
+        self.set_max_bytes(max_bytes)
+        self.prefetch_fraction = prefetch_fraction
+        self.prefetch_hits = prefetch_hits
+        self.max_stale_ttl = max_stale_ttl
+        self.stale_answer_ttl = stale_answer_ttl
         self.sentinel: LRUCacheNode = LRUCacheNode(None, None)
         self.sentinel.prev = self.sentinel
         self.sentinel.next = self.sentinel
@@ -550,6 +717,22 @@ class LRUCache(CacheBase):
             max_size = 1
         self.max_size = max_size
 
+    def set_max_bytes(self, max_bytes: int | None) -> None:
+        """Set the maximum approximate number of bytes of answers to cache.
+
+        ``None`` means the cache is bounded only by its number of nodes.
+        The new limit is enforced when the next answer is put in the cache.
+        """
+        if max_bytes is not None and max_bytes < 1:
+            max_bytes = 1
+        self.max_bytes = max_bytes
+
+    def _remove(self, node: LRUCacheNode) -> None:
+        # The caller must hold the lock.
+        node.unlink()
+        del self.data[node.key]
+        self.statistics.bytes -= node.size
+
     def get(self, key: CacheKey) -> Answer | None:
         """Get the answer associated with *key*.
 
@@ -567,13 +750,14 @@ class LRUCache(CacheBase):
             if node is None:
                 self.statistics.misses += 1
                 return None
-            # Unlink because we're either going to move the node to the front
-            # of the LRU list or we're going to free it.
-            node.unlink()
-            if node.value.expiration <= time.time():
-                del self.data[node.key]
+            now = time.time()
+            if node.value.expiration <= now:
+                if node.value.expiration + self.max_stale_ttl <= now:
+                    self._remove(node)
                 self.statistics.misses += 1
                 return None
+            # Move the node to the front of the LRU list.
+            node.unlink()
             node.link_after(self.sentinel)
             self.statistics.hits += 1
             node.hits += 1
@@ -588,9 +772,57 @@ class LRUCache(CacheBase):
             else:
                 return node.hits
 
+    def get_stale(self, key: CacheKey) -> Answer | None:
+        """Get a stale answer for *key*.
+
+        Returns ``None`` unless the cached answer has expired, but by no more
+        than *max_stale_ttl* seconds.  The returned answer is a copy of the
+        cached one whose TTL is *stale_answer_ttl*.
+
+        :param key: A ``(dns.name.Name, dns.rdatatype.RdataType,
+            dns.rdataclass.RdataClass)`` tuple whose values are the query
+            name, rdtype, and rdclass respectively.
+        :type key: tuple
+        :rtype: :py:class:`dns.resolver.Answer` or ``None``
+        """
+
+        with self.lock:
+            node = self.data.get(key)
+            now = time.time()
+            if (
+                node is None
+                or node.value.expiration > now
+                or node.value.expiration + self.max_stale_ttl <= now
+            ):
+                return None
+            return _make_stale_answer(node.value, self.stale_answer_ttl)
+
+    def claim_prefetch(self, key: CacheKey) -> bool:
+        """Should the answer for *key* be prefetched?
+
+        Returns ``True`` if prefetching is enabled and the cached answer is
+        due to be refreshed, in which case the caller is responsible for
+        refreshing it.  Only one caller is told to refresh a given answer;
+        if the refresh fails, the answer is simply left to expire.
+        """
+        if self.prefetch_fraction is None:
+            return False
+        with self.lock:
+            node = self.data.get(key)
+            if node is None or node.prefetching or node.hits < self.prefetch_hits:
+                return False
+            remaining = node.value.expiration - time.time()
+            if remaining <= 0 or remaining > node.ttl * self.prefetch_fraction:
+                return False
+            node.prefetching = True
+            return True
+
     def put(self, key: CacheKey, value: Answer) -> None:
         """Associate key and value in the cache.
 
+        If the cache is bounded by bytes and the answer alone is bigger than
+        the bound, it is not cached.
+
         :param key: A ``(dns.name.Name, dns.rdatatype.RdataType,
             dns.rdataclass.RdataClass)`` tuple whose values are the query
             name, rdtype, and rdclass respectively.
@@ -599,18 +831,25 @@ class LRUCache(CacheBase):
         :type value: :py:class:`dns.resolver.Answer`
         """
 
+        size = _answer_size(value)
         with self.lock:
             node = self.data.get(key)
             if node is not None:
-                node.unlink()
-                del self.data[node.key]
-            while len(self.data) >= self.max_size:
-                gnode = self.sentinel.prev
-                gnode.unlink()
-                del self.data[gnode.key]
-            node = LRUCacheNode(key, value)
+                self._remove(node)
+            if self.max_size < 1 or (
+                self.max_bytes is not None and size > self.max_bytes
+            ):
+                return
+            while len(self.data) >= self.max_size or (
+                self.max_bytes is not None
+                and self.statistics.bytes + size > self.max_bytes
+            ):
+                self._remove(self.sentinel.prev)
+                self.statistics.evictions += 1
+            node = LRUCacheNode(key, value, size, value.expiration - time.time())
             node.link_after(self.sentinel)
             self.data[key] = node
+            self.statistics.bytes += size
 
     def flush(self, key: CacheKey | None = None) -> None:
         """Flush the cache.
@@ -625,8 +864,7 @@ class LRUCache(CacheBase):
             if key is not None:
                 node = self.data.get(key)
                 if node is not None:
-                    node.unlink()
-                    del self.data[node.key]
+                    self._remove(node)
             else:
                 gnode = self.sentinel.next
                 while gnode != self.sentinel:
@@ -634,6 +872,279 @@ class LRUCache(CacheBase):
                     gnode.unlink()
                     gnode = next
                 self.data = {}
+                self.statistics.bytes = 0
+
+
+def _shares(total: int, n: int) -> list[int]:
+    # Divide total into n shares which differ by at most one and sum to total.
+    share, remainder = divmod(total, n)
+    return [share + 1] * remainder + [share] * (n - remainder)
+
+
+class ShardedLRUCache(CacheBase):
+    """Thread-safe, bounded, least-recently-used DNS answer cache which
+    is split into independently locked shards.
+
+    A key is assigned to a shard by its hash, and each shard is an
+    :py:class:`dns.resolver.LRUCache` with its own lock, LRU list, and
+    statistics.  When many threads share one resolver, lookups of
+    different keys usually take different locks and so do not contend
+    with each other as they would with a single ``LRUCache``.
+
+    Since LRU order is maintained per shard, eviction is approximately,
+    rather than exactly, least-recently-used across the whole cache.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 100000,
+        shards: int = 16,
+        max_bytes: int | None = None,
+        prefetch_fraction: float | None = None,
+        prefetch_hits: int = 1,
+        max_stale_ttl: float = 0.0,
+        stale_answer_ttl: float = 30.0,
+    ) -> None:
+        """Initialize a sharded LRU cache.
+
+        :param max_size: The maximum number of nodes to cache; it is divided
+            as evenly as possible among the shards.  If it is less than the
+            number of shards, some shards cache nothing.
+        :type max_size: int
+        :param shards: The number of shards; must be greater than 0.
+        :type shards: int
+        :param max_bytes: If not ``None``, the maximum approximate number of
+            bytes of answers to cache; it is divided as evenly as possible
+            among the shards.
+        :type max_bytes: int or ``None``
+        :param prefetch_fraction: See :py:class:`dns.resolver.LRUCache`.
+        :type prefetch_fraction: float or ``None``
+        :param prefetch_hits: See :py:class:`dns.resolver.LRUCache`.
+        :type prefetch_hits: int
+        :param max_stale_ttl: See :py:class:`dns.resolver.LRUCache`.
+        :type max_stale_ttl: float
+        :param stale_answer_ttl: See :py:class:`dns.resolver.LRUCache`.
+        :type stale_answer_ttl: float
+        """
+
+        super().__init__()
+        if shards < 1:
+            raise ValueError("shards must be greater than 0")
+        self.shards = [
+            LRUCache(
+                prefetch_fraction=prefetch_fraction,
+                prefetch_hits=prefetch_hits,
+                max_stale_ttl=max_stale_ttl,
+                stale_answer_ttl=stale_answer_ttl,
+            )
+            for _ in range(shards)
+        ]
+        self.set_max_size(max_size)
+        self.set_max_bytes(max_bytes)
+
+    def set_max_size(self, max_size: int) -> None:
+        if max_size < 1:
+            max_size = 1
+        self.max_size = max_size
+        # The shard limits are set directly, as a shard's share may be 0.
+        for shard, share in zip(
+            self.shards, _shares(max_size, len(self.shards)), strict=True
+        ):
+            shard.max_size = share
+
+    def set_max_bytes(self, max_bytes: int | None) -> None:
+        """Set the maximum approximate number of bytes of answers to cache.
+
+        ``None`` means the cache is bounded only by its number of nodes.
+        """
+        if max_bytes is not None and max_bytes < 1:
+            max_bytes = 1
+        self.max_bytes = max_bytes
+        if max_bytes is None:
+            for shard in self.shards:
+                shard.set_max_bytes(None)
+        else:
+            for shard, share in zip(
+                self.shards, _shares(max_bytes, len(self.shards)), strict=True
+            ):
+                shard.max_bytes = share
+
+    def _shard(self, key: CacheKey) -> LRUCache:
+        return self.shards[hash(key) % len(self.shards)]
+
+    def get(self, key: CacheKey) -> Answer | None:
+        """Get the answer associated with *key*.
+
+        Returns ``None`` if no answer is cached for the key.
+
+        :param key: A ``(dns.name.Name, dns.rdatatype.RdataType,
+            dns.rdataclass.RdataClass)`` tuple whose values are the query
+            name, rdtype, and rdclass respectively.
+        :type key: tuple
+        :rtype: :py:class:`dns.resolver.Answer` or ``None``
+        """
+
+        return self._shard(key).get(key)
+
+    def get_hits_for_key(self, key: CacheKey) -> int:
+        """Return the number of cache hits associated with the specified key."""
+        return self._shard(key).get_hits_for_key(key)
+
+    def get_stale(self, key: CacheKey) -> Answer | None:
+        """Get a stale answer for *key*.
+
+        See :py:meth:`dns.resolver.LRUCache.get_stale`.
+        """
+        return self._shard(key).get_stale(key)
+
+    def claim_prefetch(self, key: CacheKey) -> bool:
+        """Should the answer for *key* be prefetched?
+
+        See :py:meth:`dns.resolver.LRUCache.claim_prefetch`.
+        """
+        return self._shard(key).claim_prefetch(key)
+
+    def put(self, key: CacheKey, value: Answer) -> None:
+        """Associate key and value in the cache.
+
+        :param key: A ``(dns.name.Name, dns.rdatatype.RdataType,
+            dns.rdataclass.RdataClass)`` tuple whose values are the query
+            name, rdtype, and rdclass respectively.
+        :type key: tuple
+        :param value: The answer to cache.
+        :type value: :py:class:`dns.resolver.Answer`
+        """
+
+        self._shard(key).put(key, value)
+
+    def flush(self, key: CacheKey | None = None) -> None:
+        """Flush the cache.
+
+        :param key: If not ``None``, flush only this entry; otherwise flush
+            the entire cache.  The key is a ``(dns.name.Name,
+            dns.rdatatype.RdataType, dns.rdataclass.RdataClass)`` tuple.
+        :type key: tuple or ``None``
+        """
+
+        if key is not None:
+            self._shard(key).flush(key)
+        else:
+            for shard in self.shards:
+                shard.flush()
+
+    def reset_statistics(self) -> None:
+        """Reset all statistics to zero."""
+        for shard in self.shards:
+            shard.reset_statistics()
+
+    def hits(self) -> int:
+        """How many hits has the cache had?"""
+        return self.get_statistics_snapshot().hits
+
+    def misses(self) -> int:
+        """How many misses has the cache had?"""
+        return self.get_statistics_snapshot().misses
+
+    def get_statistics_snapshot(self) -> CacheStatistics:
+        """Return a snapshot of all the statistics, summed over the shards.
+
+        Each shard's statistics are internally consistent, but as the
+        shards are locked one at a time, the snapshot as a whole is not
+        atomic with respect to concurrent cache operations.
+        """
+        statistics = CacheStatistics()
+        for shard in self.shards:
+            snapshot = shard.get_statistics_snapshot()
+            statistics.hits += snapshot.hits
+            statistics.misses += snapshot.misses
+            statistics.evictions += snapshot.evictions
+            statistics.bytes += snapshot.bytes
+        return statistics
+
+
+class NameserverStatistics:
+    """Nameserver Statistics
+
+    The resolver keeps these statistics for each nameserver it has sent
+    queries to.  *srtt* is the smoothed round trip time in seconds, or
+    ``None`` if no query has completed yet, and *rttvar* is its smoothed
+    mean deviation, both computed as for TCP (see :rfc:`6298`).  A query
+    which fails, e.g. by timing out, is counted as a failure, and its
+    elapsed time is still included in the smoothed round trip time, which
+    penalizes slow or unresponsive nameservers.
+    """
+
+    def __init__(
+        self,
+        srtt: float | None = None,
+        rttvar: float = 0.0,
+        queries: int = 0,
+        failures: int = 0,
+        consecutive_failures: int = 0,
+    ) -> None:
+        self.srtt = srtt
+        self.rttvar = rttvar
+        self.queries = queries
+        self.failures = failures
+        self.consecutive_failures = consecutive_failures
+
+    def update(self, rtt: float, success: bool) -> None:
+        """Update the statistics with the outcome of a query."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.queries += 1
+        if success:
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+    def healthy(self) -> bool:
+        """Did the last query to the nameserver succeed?"""
+        return self.consecutive_failures == 0
+
+    def clone(self) -> "NameserverStatistics":
+        return NameserverStatistics(
+            self.srtt,
+            self.rttvar,
+            self.queries,
+            self.failures,
+            self.consecutive_failures,
+        )
+
+
+class _RateLimiter:
+    """Limit the rate at which queries are sent to each nameserver.
+
+    Up to *burst* queries may be sent to a nameserver at once, after which
+    queries are spaced so that no more than *rate* per second are sent.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.interval = 1.0 / rate
+        self.burst = burst
+        self.lock = threading.Lock()
+        # The theoretical arrival time of the next query to each nameserver,
+        # as in the generic cell rate algorithm.
+        self.next_send: dict[str, float] = {}
+
+    def reserve(self, nameserver: dns.nameserver.Nameserver, when: float) -> float:
+        """Reserve a slot to send a query to *nameserver* at or after
+        *when*, returning the time at which it may be sent."""
+        with self.lock:
+            key = str(nameserver)
+            next_send = max(self.next_send.get(key, when), when)
+            send = max(next_send - (self.burst - 1) * self.interval, when)
+            self.next_send[key] = next_send + self.interval
+            return send
 
 
 class _Resolution:
@@ -684,6 +1195,18 @@ class _Resolution:
         self.retry_with_tcp = False
         self.request: dns.message.QueryMessage | None = None
         self.backoff = 0.0
+        # When the query to the current nameserver was started, for RTT
+        # statistics.
+        self.query_start = 0.0
+        # If refresh is True, the cache is not consulted for answers,
+        # though answers are still put in it.  This is used when
+        # prefetching.
+        self.refresh = False
+        # Set by next_request() if a cached answer should be prefetched.
+        self.prefetch = False
+        # If not None, a _RateLimiter which next_nameserver() uses to space
+        # out the queries sent to each nameserver.
+        self.rate_limiter: _RateLimiter | None = None
 
     def next_request(
         self,
@@ -701,14 +1224,18 @@ class _Resolution:
             self.qname = self.qnames.pop(0)
 
             # Do we know the answer?
-            if self.resolver.cache:
-                answer = self.resolver.cache.get(
-                    (self.qname, self.rdtype, self.rdclass)
-                )
+            if self.resolver.cache and not self.refresh:
+                key = (self.qname, self.rdtype, self.rdclass)
+                answer = self.resolver.cache.get(key)
                 if answer is not None:
                     if answer.rrset is None and self.raise_on_no_answer:
                         raise NoAnswer(response=answer.response)
                     else:
+                        claim_prefetch = getattr(
+                            self.resolver.cache, "claim_prefetch", None
+                        )
+                        if claim_prefetch is not None:
+                            self.prefetch = claim_prefetch(key)
                         return (None, answer)
                 answer = self.resolver.cache.get(
                     (self.qname, dns.rdatatype.ANY, self.rdclass)
@@ -740,9 +1267,12 @@ class _Resolution:
                 self.resolver._nameservers,
                 self.resolver.nameserver_ports,
                 self.resolver.port,
+                self.resolver._doh_nameservers,
             )
             if self.resolver.rotate:
                 random.shuffle(self.nameservers)
+            if self.resolver.rtt_selection:
+                self.nameservers = self.resolver._order_nameservers(self.nameservers)
             self.current_nameservers = self.nameservers[:]
             self.errors = []
             self.nameserver = None
@@ -760,13 +1290,25 @@ class _Resolution:
         #
         raise NXDOMAIN(qnames=self.qnames_to_try, responses=self.nxdomain_responses)
 
+    def stale_answer(self) -> Answer | None:
+        """Get a stale answer for the current query name from the cache.
+
+        :returns: The stale answer, or ``None`` if the cache does not serve
+            stale or has no stale answer.
+        :rtype: :py:class:`dns.resolver.Answer` or ``None``
+        """
+        get_stale = getattr(self.resolver.cache, "get_stale", None)
+        if get_stale is None:
+            return None
+        return get_stale((self.qname, self.rdtype, self.rdclass))
+
     def next_nameserver(self) -> tuple[dns.nameserver.Nameserver, bool, float]:
         if self.retry_with_tcp:
             assert self.nameserver is not None
             assert not self.nameserver.is_always_max_size()
             self.tcp_attempt = True
             self.retry_with_tcp = False
-            return (self.nameserver, True, 0)
+            return (self.nameserver, True, self._start_query(0.0))
 
         backoff = 0.0
         if not self.current_nameservers:
@@ -779,7 +1321,20 @@ class _Resolution:
 
         self.nameserver = self.current_nameservers.pop(0)
         self.tcp_attempt = self.tcp or self.nameserver.is_always_max_size()
-        return (self.nameserver, self.tcp_attempt, backoff)
+        return (self.nameserver, self.tcp_attempt, self._start_query(backoff))
+
+    def _start_query(self, backoff: float) -> float:
+        # The caller sleeps for the returned backoff before sending the
+        # query, which includes any wait imposed by the rate limiter.
+        assert self.nameserver is not None
+        now = time.time()
+        self.query_start = now + backoff
+        if self.rate_limiter is not None:
+            self.query_start = self.rate_limiter.reserve(
+                self.nameserver, self.query_start
+            )
+            backoff = self.query_start - now
+        return backoff
 
     def query_result(
         self, response: dns.message.Message | None, ex: Exception | None
@@ -788,6 +1343,15 @@ class _Resolution:
         # returns an (answer: Answer, end_loop: bool) tuple.
         #
         assert self.nameserver is not None
+        if ex:
+            # A truncated response is still a response.
+            success = isinstance(ex, dns.message.Truncated)
+        else:
+            assert response is not None
+            success = response.rcode() in (dns.rcode.NOERROR, dns.rcode.NXDOMAIN)
+        self.resolver._record_nameserver_result(
+            self.nameserver, max(time.time() - self.query_start, 0.0), success
+        )
         if ex:
             # Exception during I/O or from_wire()
             assert response is None
@@ -906,6 +1470,40 @@ class _Resolution:
             return (None, False)
 
 
+class _Flight:
+    """An in-flight resolution, which concurrent identical resolutions wait
+    for instead of sending their own queries.
+
+    *event* is a ``threading.Event`` for the sync resolver, or an event
+    made by the async backend for the async resolver.
+    """
+
+    def __init__(self, event: Any) -> None:
+        self.event = event
+        self.answer: Answer | None = None
+        self.exception: BaseException | None = None
+
+    def result(self, raise_on_no_answer: bool) -> Answer:
+        if self.exception is not None:
+            # Each waiter raises its own copy, so that the waiters' frames are
+            # not all added to the traceback of one exception.
+            try:
+                exception = copy.copy(self.exception)
+            except Exception:
+                exception = self.exception
+            if exception is self.exception:
+                raise exception
+            raise exception from self.exception
+        assert self.answer is not None
+        if self.answer.rrset is None and raise_on_no_answer:
+            raise NoAnswer(response=self.answer.response)
+        return self.answer
+
+    def abandoned(self) -> bool:
+        """Did the resolution end without a result, e.g. by being cancelled?"""
+        return self.exception is not None and not isinstance(self.exception, Exception)
+
+
 class BaseResolver:
     """DNS stub resolver."""
 
@@ -932,6 +1530,10 @@ class BaseResolver:
     retry_servfail: bool
     rotate: bool
     ndots: int | None
+    stale_answer_client_timeout: float | None
+    coalesce_queries: bool
+    rtt_selection: bool
+    rtt_probe_probability: float
     _nameservers: Sequence[str | dns.nameserver.Nameserver]
 
     def __init__(
@@ -949,6 +1551,13 @@ class BaseResolver:
         :type configure: bool
         """
 
+        self._flights: dict[Hashable, _Flight] = {}
+        self._flights_lock = threading.Lock()
+        self._nameserver_statistics: dict[str, NameserverStatistics] = {}
+        self._nameserver_statistics_lock = threading.Lock()
+        # The DoH nameservers made for the nameservers given as URLs, kept so
+        # that their HTTP clients' connections are reused by all resolutions.
+        self._doh_nameservers: dict[str, dns.nameserver.DoHNameserver] = {}
         self.reset()
         if configure:
             if sys.platform == "win32":  # pragma: no cover
@@ -962,9 +1571,9 @@ class BaseResolver:
         self.domain = dns.name.Name(dns.name.from_text(socket.gethostname())[1:])
         if len(self.domain) == 0:  # pragma: no cover
             self.domain = dns.name.root
-        self._nameservers = []
         self.nameserver_ports = {}
         self.port = 53
+        self.nameservers = []
         self.search = []
         self.use_search_by_default = False
         self.timeout = 2.0
@@ -981,6 +1590,11 @@ class BaseResolver:
         self.retry_servfail = False
         self.rotate = False
         self.ndots = None
+        self.stale_answer_client_timeout = None
+        self.coalesce_queries = False
+        self.rtt_selection = False
+        self.rtt_probe_probability = 0.05
+        self.reset_nameserver_statistics()
 
     def read_resolv_conf(self, f: Any) -> None:
         """Process *f* as a file in the /etc/resolv.conf format.  If f is
@@ -1089,6 +1703,168 @@ class BaseResolver:
             raise LifetimeTimeout(timeout=duration, errors=errors)
         return min(lifetime - duration, self.timeout)
 
+    def _request_lifetime(
+        self, resolution: _Resolution, lifetime: float | None
+    ) -> tuple[float | None, bool]:
+        """Return the lifetime to use for the current request of *resolution*,
+        and whether it was shortened by the stale answer client timeout.
+
+        The lifetime is only shortened if there is a stale answer to fall
+        back on, and never for a background refresh, as no client is waiting.
+        """
+        if (
+            self.stale_answer_client_timeout is not None
+            and not resolution.refresh
+            and resolution.stale_answer() is not None
+        ):
+            full_lifetime = self.lifetime if lifetime is None else lifetime
+            if self.stale_answer_client_timeout < full_lifetime:
+                return (self.stale_answer_client_timeout, True)
+        return (lifetime, False)
+
+    def nameserver_statistics(self) -> dict[str, NameserverStatistics]:
+        """Return a snapshot of the statistics for each nameserver queried.
+
+        Statistics are only recorded while something uses them, i.e. while
+        *rtt_selection* is ``True`` or, for
+        :py:class:`dns.asyncresolver.Resolver`, while adaptive hedging is
+        enabled.
+
+        :returns: A dictionary mapping the text form of each nameserver,
+            e.g. ``"Do53:10.0.0.1@53"``, to its statistics.
+        :rtype: dict[str, :py:class:`dns.resolver.NameserverStatistics`]
+        """
+        with self._nameserver_statistics_lock:
+            return {
+                name: statistics.clone()
+                for name, statistics in self._nameserver_statistics.items()
+            }
+
+    def _get_nameserver_statistics(
+        self, nameserver: dns.nameserver.Nameserver
+    ) -> NameserverStatistics | None:
+        with self._nameserver_statistics_lock:
+            statistics = self._nameserver_statistics.get(str(nameserver))
+            return None if statistics is None else statistics.clone()
+
+    def reset_nameserver_statistics(self) -> None:
+        """Forget all nameserver statistics."""
+        with self._nameserver_statistics_lock:
+            self._nameserver_statistics = {}
+
+    def _uses_nameserver_statistics(self) -> bool:
+        """Does this resolver use nameserver statistics?"""
+        return self.rtt_selection
+
+    def _record_nameserver_result(
+        self, nameserver: dns.nameserver.Nameserver, rtt: float, success: bool
+    ) -> None:
+        if not self._uses_nameserver_statistics():
+            return
+        name = str(nameserver)
+        with self._nameserver_statistics_lock:
+            statistics = self._nameserver_statistics.get(name)
+            if statistics is None:
+                statistics = NameserverStatistics()
+                self._nameserver_statistics[name] = statistics
+            statistics.update(rtt, success)
+
+    def _order_nameservers(
+        self, nameservers: list[dns.nameserver.Nameserver]
+    ) -> list[dns.nameserver.Nameserver]:
+        """Order *nameservers* for RTT-based selection.
+
+        Healthy nameservers come first, fastest first.  Nameservers which
+        have not been queried yet have no RTT and are tried before the
+        others so that we learn their RTT.  With probability
+        *rtt_probe_probability*, a random nameserver other than the best one
+        is moved to the front, so that the RTT of slower nameservers is
+        refreshed from time to time.
+        """
+
+        with self._nameserver_statistics_lock:
+
+            def key(nameserver):
+                statistics = self._nameserver_statistics.get(str(nameserver))
+                if statistics is None or statistics.srtt is None:
+                    return (False, 0.0)
+                return (not statistics.healthy(), statistics.srtt)
+
+            # sorted() is stable, so ties keep the configured or rotated order.
+            ordered = sorted(nameservers, key=key)
+        if len(ordered) > 1 and random.random() < self.rtt_probe_probability:
+            probe = ordered.pop(random.randrange(1, len(ordered)))
+            ordered.insert(0, probe)
+        return ordered
+
+    def _flight_key(self, resolution: _Resolution) -> CacheKey | None:
+        """Return the key identifying *resolution* for coalescing, or ``None``
+        if it cannot be coalesced.
+
+        Only resolutions of a single query name are coalesced, as the
+        outcome of search list processing depends on the whole list.
+        """
+        if not self.coalesce_queries or len(resolution.qnames_to_try) != 1:
+            return None
+        return (resolution.qnames_to_try[0], resolution.rdtype, resolution.rdclass)
+
+    def _join_flight(
+        self, key: Hashable, make_event: Callable[[], Any]
+    ) -> tuple[_Flight, bool]:
+        """Return the in-flight resolution for *key*, and whether the caller
+        is its leader and must perform it, in which case the caller must call
+        ``_end_flight()`` when done."""
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return (flight, False)
+            flight = _Flight(make_event())
+            self._flights[key] = flight
+            return (flight, True)
+
+    def _end_flight(self, key: Hashable, flight: _Flight) -> None:
+        with self._flights_lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.event.set()
+
+    def _remaining_lifetime(self, start: float, lifetime: float | None) -> float:
+        lifetime = self.lifetime if lifetime is None else lifetime
+        return max(lifetime - (time.time() - start), 0)
+
+    @staticmethod
+    def _check_v4_result(
+        v4: Answer | Exception | None, v6: Answer
+    ) -> tuple[Answer | None, bool]:
+        """Check the result of an A query made concurrently with the AAAA
+        query answered by *v6*.  *v4* is ``None`` if the A query ended
+        without a result.
+
+        Returns ``(answer, redo)``, where *answer* is the A answer to use, or
+        ``None`` if there are no A records, and *redo* is ``True`` if the
+        caller must query for A again at ``v6.qname``.  Other exceptions from
+        the A query are raised.  We want the A and AAAA answers to be for the
+        same name, in case search lists are active and we are talking to a
+        server that says NXDOMAIN when it wants to say NOERROR no data.
+        """
+        if v4 is None:
+            return (None, True)
+        if isinstance(v4, NXDOMAIN):
+            if v6.qname in v4.kwargs.get("qnames", ()):
+                return (None, False)
+            return (None, True)
+        if isinstance(v4, NoAnswer):
+            response = v4.kwargs.get("response")
+            if response is not None and response.question:
+                if response.question[0].name == v6.qname:
+                    return (None, False)
+            return (None, True)
+        if isinstance(v4, Exception):
+            raise v4
+        if v4.qname != v6.qname:
+            return (None, True)
+        return (v4, False)
+
     def _get_qnames_to_try(
         self, qname: dns.name.Name, search: bool | None
     ) -> list[dns.name.Name]:
@@ -1192,6 +1968,8 @@ class BaseResolver:
         nameservers: Sequence[str | dns.nameserver.Nameserver],
         nameserver_ports: dict[str, int],
         default_port: int,
+        doh_nameservers: dict[str, dns.nameserver.DoHNameserver] | None = None,
+        share_doh_clients: bool = False,
     ) -> list[dns.nameserver.Nameserver]:
         enriched_nameservers = []
         if isinstance(nameservers, list | tuple):
@@ -1214,7 +1992,16 @@ class BaseResolver:
                             "dns.nameserver.Nameserver instance or text form, "
                             "IP address, nor a valid https URL"
                         )
-                    enriched_nameserver = dns.nameserver.DoHNameserver(nameserver)
+                    doh_nameserver = None
+                    if doh_nameservers is not None:
+                        doh_nameserver = doh_nameservers.get(nameserver)
+                    if doh_nameserver is None:
+                        doh_nameserver = dns.nameserver.DoHNameserver(nameserver)
+                        if not share_doh_clients:
+                            # Nothing will close a shared client of a
+                            # nameserver made for just one resolution.
+                            doh_nameserver._share_client = False
+                    enriched_nameserver = doh_nameserver
                 enriched_nameservers.append(enriched_nameserver)
         else:
             raise ValueError(
@@ -1240,8 +2027,28 @@ class BaseResolver:
         :type nameservers: list or tuple
         :raises ValueError: If *nameservers* is not a valid list of nameservers.
         """
-        # We just call _enrich_nameservers() for checking
-        self._enrich_nameservers(nameservers, self.nameserver_ports, self.port)
+        # We call _enrich_nameservers() for checking, and to make the DoH
+        # nameservers for any new URLs.
+        enriched_nameservers = self._enrich_nameservers(
+            nameservers,
+            self.nameserver_ports,
+            self.port,
+            self._doh_nameservers,
+            share_doh_clients=True,
+        )
+        doh_nameservers = {
+            nameserver: enriched_nameserver
+            for nameserver, enriched_nameserver in zip(
+                nameservers, enriched_nameservers, strict=True
+            )
+            if isinstance(nameserver, str)
+            and isinstance(enriched_nameserver, dns.nameserver.DoHNameserver)
+        }
+        # Close the clients of the DoH nameservers no longer used.
+        for url, doh_nameserver in self._doh_nameservers.items():
+            if doh_nameservers.get(url) is not doh_nameserver:
+                doh_nameserver.close()
+        self._doh_nameservers = doh_nameservers
         self._nameservers = nameservers
 
 
@@ -1301,41 +2108,132 @@ class Resolver(BaseResolver):
         resolution = _Resolution(
             self, qname, rdtype, rdclass, tcp, raise_on_no_answer, search
         )
+        return self._coalesced_resolve(resolution, source, source_port, lifetime)
+
+    def _coalesced_resolve(
+        self,
+        resolution: _Resolution,
+        source: str | None,
+        source_port: int,
+        lifetime: float | None,
+    ) -> Answer:
+        """Run *resolution*, sharing it with concurrent identical resolutions
+        if query coalescing is enabled."""
+        raise_on_no_answer = resolution.raise_on_no_answer
+        key = self._flight_key(resolution)
+        if key is None:
+            return self._resolve(resolution, source, source_port, lifetime)
         start = time.time()
         while True:
-            request, answer = resolution.next_request()
-            # Note we need to say "if answer is not None" and not just
-            # "if answer" because answer implements __len__, and python
-            # will call that.  We want to return if we have an answer
-            # object, including in cases where its length is 0.
-            if answer is not None:
-                # cache hit!
-                return answer
-            assert request is not None  # needed for type checking
-            done = False
-            while not done:
-                nameserver, tcp, backoff = resolution.next_nameserver()
-                if backoff:
-                    time.sleep(backoff)
-                timeout = self._compute_timeout(start, lifetime, resolution.errors)
-                try:
-                    response = nameserver.query(
-                        request,
-                        timeout=timeout,
-                        source=source,
-                        source_port=source_port,
-                        max_size=tcp,
-                    )
-                except Exception as ex:
-                    _, done = resolution.query_result(None, ex)
-                    continue
-                answer, done = resolution.query_result(response, None)
+            flight, leader = self._join_flight(key, threading.Event)
+            if leader:
+                break
+            if not flight.event.wait(self._remaining_lifetime(start, lifetime)):
+                raise LifetimeTimeout(timeout=time.time() - start, errors=[])
+            if not flight.abandoned():
+                return flight.result(raise_on_no_answer)
+        # We are the leader.  The NoAnswer check is done by each waiter.
+        resolution.raise_on_no_answer = False
+        try:
+            flight.answer = self._resolve(resolution, source, source_port, lifetime)
+        except BaseException as e:
+            flight.exception = e
+            raise
+        finally:
+            self._end_flight(key, flight)
+        return flight.result(raise_on_no_answer)
+
+    def _resolve(
+        self,
+        resolution: _Resolution,
+        source: str | None,
+        source_port: int,
+        lifetime: float | None,
+    ) -> Answer:
+        start = time.time()
+        shortened = False
+        try:
+            while True:
+                request, answer = resolution.next_request()
                 # Note we need to say "if answer is not None" and not just
                 # "if answer" because answer implements __len__, and python
                 # will call that.  We want to return if we have an answer
                 # object, including in cases where its length is 0.
                 if answer is not None:
+                    # cache hit!
+                    if resolution.prefetch:
+                        self._prefetch(resolution, source, source_port, lifetime)
                     return answer
+                assert request is not None  # needed for type checking
+                request_lifetime, shortened = self._request_lifetime(
+                    resolution, lifetime
+                )
+                done = False
+                while not done:
+                    nameserver, tcp, backoff = resolution.next_nameserver()
+                    if backoff:
+                        time.sleep(backoff)
+                    timeout = self._compute_timeout(
+                        start, request_lifetime, resolution.errors
+                    )
+                    try:
+                        response = nameserver.query(
+                            request,
+                            timeout=timeout,
+                            source=source,
+                            source_port=source_port,
+                            max_size=tcp,
+                        )
+                    except Exception as ex:
+                        _, done = resolution.query_result(None, ex)
+                        continue
+                    answer, done = resolution.query_result(response, None)
+                    # Note we need to say "if answer is not None" and not just
+                    # "if answer" because answer implements __len__, and python
+                    # will call that.  We want to return if we have an answer
+                    # object, including in cases where its length is 0.
+                    if answer is not None:
+                        return answer
+        except (LifetimeTimeout, NoNameservers):
+            answer = resolution.stale_answer()
+            if answer is None:
+                raise
+            if shortened:
+                # We gave up waiting to serve stale, but keep trying to
+                # refresh the answer.
+                self._prefetch(resolution, source, source_port, lifetime)
+            if answer.rrset is None and resolution.raise_on_no_answer:
+                raise NoAnswer(response=answer.response)
+            return answer
+
+    def _prefetch(
+        self,
+        resolution: _Resolution,
+        source: str | None,
+        source_port: int,
+        lifetime: float | None,
+    ) -> None:
+        """Refresh the cached answer *resolution* just returned in a
+        background thread."""
+        refresh = _Resolution(
+            self,
+            resolution.qname,
+            resolution.rdtype,
+            resolution.rdclass,
+            resolution.tcp,
+            False,
+            False,
+        )
+        refresh.refresh = True
+
+        def run() -> None:
+            try:
+                self._resolve(refresh, source, source_port, lifetime)
+            except Exception:
+                # The cached answer will just expire.
+                pass
+
+        threading.Thread(target=run, daemon=True).start()
 
     def query(
         self,
@@ -1431,31 +2329,134 @@ class Resolver(BaseResolver):
         raise_on_no_answer = modified_kwargs.pop("raise_on_no_answer", True)
         lifetime = modified_kwargs.pop("lifetime", None)
         start = time.time()
-        v6 = self.resolve(
-            name,
-            dns.rdatatype.AAAA,
-            raise_on_no_answer=False,
-            lifetime=self._compute_timeout(start, lifetime),
-            **modified_kwargs,
-        )
-        # Note that setting name ensures we query the same name
-        # for A as we did for AAAA.  (This is just in case search lists
-        # are active by default in the resolver configuration and
-        # we might be talking to a server that says NXDOMAIN when it
-        # wants to say NOERROR no data.
-        name = v6.qname
-        v4 = self.resolve(
-            name,
-            dns.rdatatype.A,
-            raise_on_no_answer=False,
-            lifetime=self._compute_timeout(start, lifetime),
-            **modified_kwargs,
-        )
+        # Resolve A in another thread while we resolve AAAA in this one.
+        v4_result: list[Answer | Exception] = []
+
+        def resolve_v4() -> None:
+            try:
+                v4_result.append(
+                    self.resolve(
+                        name,
+                        dns.rdatatype.A,
+                        raise_on_no_answer=False,
+                        lifetime=self._compute_timeout(start, lifetime),
+                        **modified_kwargs,
+                    )
+                )
+            except Exception as e:
+                v4_result.append(e)
+
+        v4_thread = threading.Thread(target=resolve_v4, daemon=True)
+        v4_thread.start()
+        try:
+            v6 = self.resolve(
+                name,
+                dns.rdatatype.AAAA,
+                raise_on_no_answer=False,
+                lifetime=self._compute_timeout(start, lifetime),
+                **modified_kwargs,
+            )
+        finally:
+            # The A lookup is bounded by the same lifetime, so this does not
+            # wait for long even if the AAAA lookup failed.
+            v4_thread.join()
+        # If the A lookup ended without a result, e.g. by a BaseException,
+        # we redo it here.
+        v4, redo = self._check_v4_result(v4_result[0] if v4_result else None, v6)
+        if redo:
+            v4 = self.resolve(
+                v6.qname,
+                dns.rdatatype.A,
+                raise_on_no_answer=False,
+                lifetime=self._compute_timeout(start, lifetime),
+                **modified_kwargs,
+            )
         answers = HostAnswers.make(v6=v6, v4=v4, add_empty=not raise_on_no_answer)
         if not answers:
             raise NoAnswer(response=v6.response)
         return answers
 
+    def resolve_many(
+        self,
+        queries: Iterable[tuple[dns.name.Name | str, dns.rdatatype.RdataType | str]],
+        concurrency: int = 100,
+        rate: float | None = None,
+        rdclass: dns.rdataclass.RdataClass | str = dns.rdataclass.IN,
+        tcp: bool = False,
+        source: str | None = None,
+        raise_on_no_answer: bool = True,
+        source_port: int = 0,
+        lifetime: float | None = None,
+        search: bool | None = None,
+    ) -> Iterator[
+        tuple[
+            dns.name.Name | str,
+            dns.rdatatype.RdataType | str,
+            Answer | Exception,
+        ]
+    ]:
+        """Resolve many questions concurrently, using a pool of threads.
+
+        *queries* is consumed lazily, so it may be a generator producing
+        more questions than could be held in memory.  Results are yielded in
+        the order the resolutions complete, as ``(qname, rdtype, result)``
+        tuples, where *qname* and *rdtype* are as given in *queries* and
+        *result* is the :py:class:`dns.resolver.Answer`, or the exception
+        :py:meth:`~dns.resolver.Resolver.resolve` raised.
+
+        :param queries: The ``(qname, rdtype)`` questions to resolve.
+        :type queries: iterable of tuples
+        :param concurrency: The maximum number of resolutions to run at once.
+        :type concurrency: int
+        :param rate: If not ``None``, the maximum number of queries per
+            second to send to each nameserver.
+        :type rate: float or ``None``
+
+        The other parameters are as for
+        :py:meth:`~dns.resolver.Resolver.resolve` and apply to every
+        question.  The resolver's cache is used as usual.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        rate_limiter = _RateLimiter(rate) if rate is not None else None
+
+        def resolve_one(
+            qname: dns.name.Name | str, rdtype: dns.rdatatype.RdataType | str
+        ) -> Answer | Exception:
+            try:
+                resolution = _Resolution(
+                    self, qname, rdtype, rdclass, tcp, raise_on_no_answer, search
+                )
+                resolution.rate_limiter = rate_limiter
+                return self._coalesced_resolve(
+                    resolution, source, source_port, lifetime
+                )
+            except Exception as e:
+                return e
+
+        iterator = iter(queries)
+        pending: dict[concurrent.futures.Future, tuple[Any, Any]] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+            try:
+                while True:
+                    for qname, rdtype in itertools.islice(
+                        iterator, concurrency - len(pending)
+                    ):
+                        future = pool.submit(resolve_one, qname, rdtype)
+                        pending[future] = (qname, rdtype)
+                    if not pending:
+                        break
+                    done, _ = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        qname, rdtype = pending.pop(future)
+                        yield (qname, rdtype, future.result())
+            finally:
+                # If the caller stopped early, don't start anything else.
+                for future in pending:
+                    future.cancel()
+
     # pylint: disable=redefined-outer-name
 
     def canonical_name(self, name: dns.name.Name | str) -> dns.name.Name:
@@ -1624,6 +2625,23 @@ def resolve_name(
     return get_default_resolver().resolve_name(name, family, **kwargs)
 
 
+def resolve_many(
+    queries: Iterable[tuple[dns.name.Name | str, dns.rdatatype.RdataType | str]],
+    concurrency: int = 100,
+    rate: float | None = None,
+    **kwargs: Any,
+) -> Iterator[
+    tuple[dns.name.Name | str, dns.rdatatype.RdataType | str, Answer | Exception]
+]:
+    """Resolve many questions concurrently using the default resolver.
+
+    See ``dns.resolver.Resolver.resolve_many`` for more information on the
+    parameters.
+    """
+
+    return get_default_resolver().resolve_many(queries, concurrency, rate, **kwargs)
+
+
 def canonical_name(name: dns.name.Name | str) -> dns.name.Name:
     """Determine the canonical name of *name*.
 
@@ -226,6 +226,9 @@ class Tokenizer:
     idna_codec: A dns.name.IDNACodec, specifies the IDNA
     encoder/decoder.  If None, the default IDNA
     encoder/decoder is used.
+
+    pool: A dns.name.NamePool, which the names returned by get_name() are
+    interned with, or None.
     """
 
     def __init__(
@@ -233,6 +236,7 @@ class Tokenizer:
         f: Any = sys.stdin,
         filename: str | None = None,
         idna_codec: dns.name.IDNACodec | None = None,
+        pool: dns.name.NamePool | None = None,
     ):
         """Initialize a tokenizer instance.
 
@@ -246,6 +250,9 @@ class Tokenizer:
         idna_codec: A dns.name.IDNACodec, specifies the IDNA
         encoder/decoder.  If None, the default IDNA
         encoder/decoder is used.
+
+        pool: A dns.name.NamePool.  If not None, the names returned by
+        get_name() are interned with it.
         """
 
         if isinstance(f, str):
@@ -276,6 +283,7 @@ class Tokenizer:
             self.idna_codec: dns.name.IDNACodec = dns.name.IDNA_DEFAULT
         else:
             self.idna_codec = idna_codec
+        self.pool = pool
 
     def _get_char(self) -> str:
         """Read a character from input."""
@@ -744,7 +752,10 @@ class Tokenizer:
         """
 
         token = self.get()
-        return self.as_name(token, origin, relativize, relativize_to)
+        name = self.as_name(token, origin, relativize, relativize_to)
+        if self.pool is not None:
+            name = self.pool.intern(name)
+        return name
 
     def get_eol_as_token(self) -> Token:
         """Read the next token and raise an exception if it isn't EOL or
@@ -95,7 +95,9 @@ class UpdateMessage(dns.message.Message):  # lgtm[py/missing-equals]
     @property
     def zone(self) -> list[dns.rrset.RRset]:
         """The zone section."""
-        return self.sections[0]
+        if self._lazy is None:
+            return self.sections[0]
+        return self._lazy.read_section(self, 0)
 
     @zone.setter
     def zone(self, v):
@@ -104,7 +106,9 @@ class UpdateMessage(dns.message.Message):  # lgtm[py/missing-equals]
     @property
     def prerequisite(self) -> list[dns.rrset.RRset]:
         """The prerequisite section."""
-        return self.sections[1]
+        if self._lazy is None:
+            return self.sections[1]
+        return self._lazy.read_section(self, 1)
 
     @prerequisite.setter
     def prerequisite(self, v):
@@ -113,7 +117,9 @@ class UpdateMessage(dns.message.Message):  # lgtm[py/missing-equals]
     @property
     def update(self) -> list[dns.rrset.RRset]:
         """The update section."""
-        return self.sections[2]
+        if self._lazy is None:
+            return self.sections[2]
+        return self._lazy.read_section(self, 2)
 
     @update.setter
     def update(self, v):
@@ -10,4 +10,6 @@ class Parser(dns.wirebase.Parser):
         name = dns.name.from_wire_parser(self)
         if origin:
             name = name.relativize(origin)
+        if self.pool is not None:
+            name = self.pool.intern(name)
         return name
@@ -2,27 +2,96 @@
 
 # We have wirebase and wire to avoid circularity between name.py and wire.py
 
-import contextlib
 import struct
-from collections.abc import Iterator
+from typing import Any
 
 import dns.exception
 
+_uint16 = struct.Struct("!H")
+_uint32 = struct.Struct("!I")
+
+# Compiled structs for get_struct(), by format.
+_structs: dict[str, struct.Struct] = {}
+
+
+def _get_struct(format: str) -> struct.Struct:
+    s = _structs.get(format)
+    if s is None:
+        s = struct.Struct(format)
+        _structs[format] = s
+    return s
+
+
+class _Restriction:
+    """The context manager returned by :py:meth:`Parser.restrict_to`."""
+
+    __slots__ = ["parser", "saved_end"]
+
+    def __init__(self, parser: "Parser", saved_end: int):
+        self.parser = parser
+        self.saved_end = saved_end
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        parser = self.parser
+        try:
+            # We make this check here and not in the finally as we
+            # don't want to raise if we're already raising for some
+            # other reason.
+            if exc_type is None and parser.current != parser.end:
+                raise dns.exception.FormError
+        finally:
+            parser.end = self.saved_end
+
+
+class _RestoreFurthest:
+    """The context manager returned by :py:meth:`Parser.restore_furthest`."""
+
+    __slots__ = ["parser"]
+
+    def __init__(self, parser: "Parser"):
+        self.parser = parser
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.parser.current = self.parser.furthest
+
 
 class Parser:
-    """Helper class for parsing DNS wire format."""
+    """Helper class for parsing DNS wire format.
 
-    def __init__(self, wire: bytes, current: int = 0):
+    The wire format may be ``bytes``, or any other bytes-like object, e.g. a
+    ``bytearray`` or a ``memoryview``, which is not copied.  Fixed-size
+    fields are read in place, and only the values returned by the
+    ``get_bytes()`` methods, which callers keep, are copied to ``bytes``.
+    """
+
+    def __init__(self, wire: bytes | bytearray | memoryview, current: int = 0):
         """Initialize a Parser.
 
         :param wire: The data to be parsed (typically a whole message or a slice of it).
-        :type wire: bytes
+        :type wire: bytes, bytearray, or memoryview
         :param current: The offset within *wire* where parsing should begin.
         :type current: int
         """
-        self.wire = wire
+        if isinstance(wire, (bytearray, memoryview)):
+            self.wire: bytes | memoryview = memoryview(wire)
+            self._copy = True
+        else:
+            self.wire = wire
+            self._copy = False
         self.current = 0
         self.end = len(self.wire)
+        # The names read so far, by offset, with their wire lengths.  See
+        # dns.name.from_wire_parser().
+        self.names: dict[int, tuple[Any, int]] = {}
+        # The dns.name.NamePool names are interned with, if any.  See
+        # dns.wire.Parser.get_name().
+        self.pool: Any = None
         if current:
             self.seek(current)
         self.furthest = current
@@ -30,36 +99,52 @@ class Parser:
     def remaining(self) -> int:
         return self.end - self.current
 
+    def _consume(self, size: int) -> int:
+        # Advance past the next *size* octets, returning where they start.
+        start = self.current
+        current = start + size
+        if current > self.end:
+            raise dns.exception.FormError
+        self.current = current
+        if current > self.furthest:
+            self.furthest = current
+        return start
+
     def get_bytes(self, size: int) -> bytes:
         assert size >= 0
-        if size > self.remaining():
-            raise dns.exception.FormError
-        output = self.wire[self.current : self.current + size]
-        self.current += size
-        self.furthest = max(self.furthest, self.current)
-        return output
+        start = self._consume(size)
+        output = self.wire[start : start + size]
+        if self._copy:
+            return bytes(output)
+        return output  # pyright: ignore
 
     def get_counted_bytes(self, length_size: int = 1) -> bytes:
-        length = int.from_bytes(self.get_bytes(length_size), "big")
+        if length_size == 1:
+            length = self.get_uint8()
+        else:
+            start = self._consume(length_size)
+            length = int.from_bytes(self.wire[start : start + length_size], "big")
         return self.get_bytes(length)
 
     def get_remaining(self) -> bytes:
         return self.get_bytes(self.remaining())
 
     def get_uint8(self) -> int:
-        return struct.unpack("!B", self.get_bytes(1))[0]
+        return self.wire[self._consume(1)]
 
     def get_uint16(self) -> int:
-        return struct.unpack("!H", self.get_bytes(2))[0]
+        return _uint16.unpack_from(self.wire, self._consume(2))[0]
 
     def get_uint32(self) -> int:
-        return struct.unpack("!I", self.get_bytes(4))[0]
+        return _uint32.unpack_from(self.wire, self._consume(4))[0]
 
     def get_uint48(self) -> int:
-        return int.from_bytes(self.get_bytes(6), "big")
+        start = self._consume(6)
+        return int.from_bytes(self.wire[start : start + 6], "big")
 
     def get_struct(self, format: str) -> tuple:
-        return struct.unpack(format, self.get_bytes(struct.calcsize(format)))
+        s = _get_struct(format)
+        return s.unpack_from(self.wire, self._consume(s.size))
 
     def seek(self, where: int) -> None:
         # Note that seeking to the end is OK!  (If you try to read
@@ -68,26 +153,20 @@ class Parser:
             raise dns.exception.FormError
         self.current = where
 
-    @contextlib.contextmanager
-    def restrict_to(self, size: int) -> Iterator:
+    def restrict_to(self, size: int) -> _Restriction:
+        """Return a context manager which restricts parsing to the next *size*
+        octets, raising :py:exc:`dns.exception.FormError` on exit if they
+        were not all read.
+        """
         assert size >= 0
         if size > self.remaining():
             raise dns.exception.FormError
         saved_end = self.end
-        try:
-            self.end = self.current + size
-            yield
-            # We make this check here and not in the finally as we
-            # don't want to raise if we're already raising for some
-            # other reason.
-            if self.current != self.end:
-                raise dns.exception.FormError
-        finally:
-            self.end = saved_end
+        self.end = self.current + size
+        return _Restriction(self, saved_end)
 
-    @contextlib.contextmanager
-    def restore_furthest(self) -> Iterator:
-        try:
-            yield None
-        finally:
-            self.current = self.furthest
+    def restore_furthest(self) -> _RestoreFurthest:
+        """Return a context manager which moves to the furthest point read on
+        exit.
+        """
+        return _RestoreFurthest(self)
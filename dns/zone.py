@@ -729,7 +729,7 @@ class Zone(dns.transaction.TransactionManager):
 
             if style.sorted:
                 names = list(self.keys())
-                names.sort()
+                names.sort(key=dns.name.Name.sort_key)
             else:
                 names = self.keys()
             for n in names:
@@ -850,7 +850,7 @@ class Zone(dns.transaction.TransactionManager):
             assert self.origin is not None
             origin_name = self.origin
         hasher = hashinfo()
-        for name, node in sorted(self.items()):
+        for name, node in sorted(self.items(), key=lambda item: item[0].sort_key()):
             rrnamebuf = name.to_digestable(self.origin)
             for rdataset in sorted(node, key=lambda rds: (rds.rdtype, rds.covers)):
                 if name == origin_name and dns.rdatatype.ZONEMD in (
@@ -1265,6 +1265,7 @@ def _from_text(
     check_origin: bool = True,
     idna_codec: dns.name.IDNACodec | None = None,
     allow_directives: bool | Iterable[str] = True,
+    pool: dns.name.NamePool | None = None,
 ) -> Zone:
     # See the comments for the public APIs from_text() and from_file() for
     # details.
@@ -1277,7 +1278,7 @@ def _from_text(
         filename = "<string>"
     zone = zone_factory(origin, rdclass, relativize=relativize)
     with zone.writer(True) as txn:
-        tok = dns.tokenizer.Tokenizer(text, filename, idna_codec=idna_codec)
+        tok = dns.tokenizer.Tokenizer(text, filename, idna_codec=idna_codec, pool=pool)
         reader = dns.zonefile.Reader(
             tok,
             rdclass,
@@ -1308,6 +1309,7 @@ def from_text(
     check_origin: bool = True,
     idna_codec: dns.name.IDNACodec | None = None,
     allow_directives: bool | Iterable[str] = True,
+    pool: dns.name.NamePool | None = None,
 ) -> Zone:
     """Build a zone object from a zone file format string.
 
@@ -1340,6 +1342,10 @@ def from_text(
         non-empty iterable, only the listed directives (including the ``$``)
         are allowed.
     :type allow_directives: bool or Iterable[str]
+    :param pool: If not ``None``, the owner names and the names in rdata are
+        interned with this pool, so that equal names and labels share one
+        object.  A pool made for one zone may be dropped after reading it.
+    :type pool: :py:class:`dns.name.NamePool` or ``None``
     :raises dns.zone.NoSOA: if there is no SOA RRset.
     :raises dns.zone.NoNS: if there is no NS RRset.
     :raises KeyError: if there is no origin node.
@@ -1356,6 +1362,7 @@ def from_text(
         check_origin,
         idna_codec,
         allow_directives,
+        pool,
     )
 
 
@@ -1370,6 +1377,7 @@ def from_file(
     check_origin: bool = True,
     idna_codec: dns.name.IDNACodec | None = None,
     allow_directives: bool | Iterable[str] = True,
+    pool: dns.name.NamePool | None = None,
 ) -> Zone:
     """Read a zone file and build a zone object.
 
@@ -1403,6 +1411,10 @@ def from_file(
         non-empty iterable, only the listed directives (including the ``$``)
         are allowed.
     :type allow_directives: bool or Iterable[str]
+    :param pool: If not ``None``, the owner names and the names in rdata are
+        interned with this pool, so that equal names and labels share one
+        object.  A pool made for one zone may be dropped after reading it.
+    :type pool: :py:class:`dns.name.NamePool` or ``None``
     :raises dns.zone.NoSOA: if there is no SOA RRset.
     :raises dns.zone.NoNS: if there is no NS RRset.
     :raises KeyError: if there is no origin node.
@@ -1427,6 +1439,7 @@ def from_file(
             check_origin,
             idna_codec,
             allow_directives,
+            pool,
         )
     assert False  # make mypy happy  lgtm[py/unreachable-statement]
 
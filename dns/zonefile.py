@@ -179,6 +179,8 @@ class Reader:
                 return
             if self.relativize:
                 name = name.relativize(self.zone_origin)
+            if self.tok.pool is not None:
+                name = self.tok.pool.intern(name)
 
         # TTL
         if self.force_ttl is not None:
@@ -432,6 +434,8 @@ class Reader:
                 return
             if self.relativize:
                 name = name.relativize(self.zone_origin)
+            if self.tok.pool is not None:
+                name = self.tok.pool.intern(name)
 
             try:
                 rd = dns.rdata.from_text(
@@ -537,7 +541,9 @@ class Reader:
                             )
                         )
                         self.current_file = open(filename, encoding="utf-8")
-                        self.tok = dns.tokenizer.Tokenizer(self.current_file, filename)
+                        self.tok = dns.tokenizer.Tokenizer(
+                            self.current_file, filename, pool=self.tok.pool
+                        )
                         self.current_origin = new_origin
                     elif c == "$GENERATE":
                         self._generate_line()
@@ -16,6 +16,7 @@
 # OF OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
 import asyncio
+import concurrent.futures
 import random
 import socket
 import time
@@ -24,8 +25,10 @@ import unittest
 import dns.asyncbackend
 import dns.asyncquery
 import dns.asyncresolver
+import dns.exception
 import dns.message
 import dns.name
+import dns.nameserver
 import dns.query
 import dns.quic
 import dns.rcode
@@ -723,6 +726,481 @@ class AsyncioOnlyTests(unittest.TestCase):
         self.async_run(run)
 
 
+class AsyncResolverTests(unittest.TestCase):
+    # These tests use tests.util.FakeNameserver and do not need the Internet.
+
+    def setUp(self):
+        self.backend = dns.asyncbackend.set_default_backend("asyncio")
+
+    def async_run(self, afunc):
+        return asyncio.run(afunc())
+
+    def test_prefetch(self):
+        async def run():
+            nameserver = tests.util.FakeNameserver(ttl=100)
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [nameserver]
+            res.cache = dns.resolver.LRUCache(prefetch_fraction=0.5, prefetch_hits=1)
+            answer = await res.resolve("www.example.")
+            self.assertEqual(nameserver.count, 1)
+            key = (answer.qname, dns.rdatatype.A, dns.rdataclass.IN)
+            res.cache.data[key].value.expiration = time.time() + 10
+            cached = await res.resolve("www.example.")
+            self.assertIs(cached, answer)
+            for _ in range(100):
+                await asyncio.sleep(0)
+                if nameserver.count == 2 and res.cache.get(key) is not answer:
+                    break
+            self.assertEqual(nameserver.count, 2)
+            self.assertIsNot(await res.resolve("www.example."), answer)
+            self.assertEqual(nameserver.count, 2)
+
+        self.async_run(run)
+
+    def test_coalesce_queries(self):
+        async def run():
+            nameserver = tests.util.FakeNameserver(delay=0.2)
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [nameserver]
+            res.coalesce_queries = True
+            answers = await asyncio.gather(
+                *[res.resolve("www.example.") for _ in range(10)]
+            )
+            self.assertEqual(nameserver.count, 1)
+            for answer in answers:
+                self.assertIs(answer, answers[0])
+            nameserver.exception = OSError("unreachable")
+            results = await asyncio.gather(
+                *[res.resolve("www.example.") for _ in range(10)],
+                return_exceptions=True,
+            )
+            self.assertEqual(nameserver.count, 2)
+            for e in results:
+                self.assertIsInstance(e, dns.resolver.NoNameservers)
+            self.assertEqual(len(res._flights), 0)
+
+        self.async_run(run)
+
+    def test_coalesce_queries_event_loops(self):
+        # Resolutions in different event loops are not coalesced.
+        nameserver = tests.util.FakeNameserver(delay=0.2)
+        res = dns.asyncresolver.Resolver(configure=False)
+        res.nameservers = [nameserver]
+        res.coalesce_queries = True
+
+        async def run():
+            return await asyncio.gather(
+                *[res.resolve("www.example.") for _ in range(5)]
+            )
+
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            futures = [executor.submit(self.async_run, run) for _ in range(2)]
+            for future in futures:
+                for answer in future.result():
+                    self.assertEqual(answer[0].address, "10.0.0.1")
+        self.assertEqual(nameserver.count, 2)
+        self.assertEqual(len(res._flights), 0)
+
+    def test_coalesce_queries_cancelled_leader(self):
+        async def run():
+            nameserver = tests.util.FakeNameserver(delay=0.2)
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [nameserver]
+            res.coalesce_queries = True
+            leader = asyncio.create_task(res.resolve("www.example."))
+            await asyncio.sleep(0.05)
+            waiter = asyncio.create_task(res.resolve("www.example."))
+            await asyncio.sleep(0.05)
+            leader.cancel()
+            # The waiter takes over and resolves the name itself.
+            answer = await waiter
+            self.assertEqual(answer[0].address, "10.0.0.1")
+            self.assertEqual(nameserver.count, 1)
+
+        self.async_run(run)
+
+    def test_hedging(self):
+        async def run():
+            lossy = tests.util.FakeNameserver("lossy", delay=10)
+            good = tests.util.FakeNameserver("good", delay=0.01)
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [lossy, good]
+            res.hedge_delay = 0.05
+            start = time.time()
+            answer = await res.resolve("www.example.")
+            self.assertLess(time.time() - start, 1.0)
+            self.assertEqual(answer.nameserver, "good")
+            self.assertEqual((lossy.count, good.count), (0, 1))
+            # A nameserver which answers within the hedge delay is the only
+            # one queried.
+            lossy.delay = 0.01
+            answer = await res.resolve("www.example.")
+            self.assertEqual(answer.nameserver, "lossy")
+            self.assertEqual((lossy.count, good.count), (1, 1))
+
+        self.async_run(run)
+
+    def test_hedging_adaptive(self):
+        async def run():
+            first = tests.util.FakeNameserver("first", delay=0.2)
+            second = tests.util.FakeNameserver("second")
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [first, second]
+            res.hedge_delay = 0.05
+            res.hedge_adaptive = True
+            self.assertEqual(res._hedge_delay(first), 0.05)
+            # With an observed RTT, the hedge delay adapts to it.
+            res._record_nameserver_result(first, 0.3, True)
+            self.assertAlmostEqual(res._hedge_delay(first), 0.6)
+            answer = await res.resolve("www.example.")
+            self.assertEqual(answer.nameserver, "first")
+            self.assertEqual(second.count, 0)
+
+        self.async_run(run)
+
+    def test_hedging_errors(self):
+        async def run():
+            bad = tests.util.FakeNameserver("bad", exception=OSError("unreachable"))
+            good = tests.util.FakeNameserver("good", delay=0.01)
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [bad, good]
+            res.hedge_delay = 1.0
+            answer = await res.resolve("www.example.")
+            self.assertEqual(answer.nameserver, "good")
+            good.exception = OSError("unreachable")
+            with self.assertRaises(dns.resolver.NoNameservers):
+                await res.resolve("www.example.")
+
+        self.async_run(run)
+
+    def test_serve_stale(self):
+        async def run():
+            nameserver = tests.util.FakeNameserver(ttl=100)
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [nameserver]
+            res.cache = dns.resolver.Cache(max_stale_ttl=100)
+            answer = await res.resolve("www.example.")
+            answer.expiration = time.time() - 1
+            nameserver.exception = OSError("unreachable")
+            stale = await res.resolve("www.example.")
+            self.assertEqual(stale.rrset, answer.rrset)
+            self.assertEqual(stale.rrset.ttl, 30)
+            with self.assertRaises(dns.resolver.NoNameservers):
+                await res.resolve("www.example.", "AAAA")
+
+        self.async_run(run)
+
+    def test_resolve_name_concurrent(self):
+        async def run():
+            nameserver = tests.util.FakeNameserver(delay=0.2)
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [nameserver]
+            start = time.time()
+            answers = await res.resolve_name("www.example.")
+            elapsed = time.time() - start
+            self.assertEqual(set(answers.addresses()), {"10.0.0.1", "::1"})
+            self.assertEqual(nameserver.count, 2)
+            self.assertLess(elapsed, 0.35)
+
+        self.async_run(run)
+
+    def test_resolve_name_failure(self):
+        async def run():
+            nameserver = tests.util.FakeNameserver(exception=OSError("unreachable"))
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [nameserver]
+            with self.assertRaises(dns.resolver.NoNameservers):
+                await res.resolve_name("www.example.")
+
+        self.async_run(run)
+
+    def test_resolve_many(self):
+        async def run():
+            nameserver = tests.util.FakeNameserver(delay=0.1)
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [nameserver]
+            queries = [(f"www{i}.example.", "A") for i in range(10)]
+            queries.append(("www.example.", "ANY"))
+            start = time.time()
+            results = [r async for r in res.resolve_many(queries, concurrency=5)]
+            elapsed = time.time() - start
+            self.assertEqual(len(results), 11)
+            errors = [r for _, _, r in results if isinstance(r, Exception)]
+            self.assertEqual(len(errors), 1)
+            self.assertIsInstance(errors[0], dns.resolver.NoMetaqueries)
+            self.assertEqual(nameserver.count, 10)
+            self.assertGreaterEqual(elapsed, 0.2)
+            self.assertLess(elapsed, 0.5)
+
+        self.async_run(run)
+
+    def test_resolve_many_rate(self):
+        async def run():
+            nameserver = tests.util.FakeNameserver()
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [nameserver]
+            queries = [(f"www{i}.example.", "A") for i in range(5)]
+            start = time.time()
+            results = [
+                r async for r in res.resolve_many(queries, concurrency=5, rate=20)
+            ]
+            elapsed = time.time() - start
+            self.assertEqual(len(results), 5)
+            self.assertGreaterEqual(elapsed, 0.19)
+
+        self.async_run(run)
+
+    def test_resolve_many_stop_early(self):
+        async def run():
+            nameserver = tests.util.FakeNameserver(delay=0.1)
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = [nameserver]
+            queries = [(f"www{i}.example.", "A") for i in range(10)]
+            results = res.resolve_many(queries, concurrency=5)
+            async for _ in results:
+                break
+            await results.aclose()
+            await self.backend.sleep(0.2)
+            # The other resolutions were cancelled and nothing more was sent.
+            self.assertLess(nameserver.count, 10)
+
+        self.async_run(run)
+
+
+class AsyncUDPMultiplexerTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = dns.asyncbackend.set_default_backend("asyncio")
+
+    def async_run(self, afunc):
+        return asyncio.run(afunc())
+
+    def test_query(self):
+        async def run():
+            with tests.util.UDPResponder(max_delay=0.1, bogus=True) as responder:
+                async with dns.asyncquery.UDPMultiplexer(sockets=2) as multiplexer:
+
+                    async def query(i):
+                        q = dns.message.make_query(f"www{i}.example.", "A")
+                        r = await multiplexer.query(
+                            q, responder.address, timeout=2, port=responder.port
+                        )
+                        return (q, r)
+
+                    results = await asyncio.gather(*[query(i) for i in range(20)])
+            for q, r in results:
+                self.assertTrue(q.is_response(r))
+                self.assertEqual(r.answer[0][0].address, "10.0.0.1")
+            self.assertEqual(len(responder.sources), 2)
+
+        self.async_run(run)
+
+    def test_timeout_and_close(self):
+        async def run():
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(("127.0.0.1", 0))
+            address, port = sock.getsockname()
+            try:
+                multiplexer = dns.asyncquery.UDPMultiplexer()
+                q = dns.message.make_query("www.example.", "A")
+                with self.assertRaises(dns.exception.Timeout):
+                    await multiplexer.query(q, address, timeout=0.1, port=port)
+                task = asyncio.ensure_future(
+                    multiplexer.query(q, address, timeout=5, port=port)
+                )
+                await asyncio.sleep(0.1)
+                await multiplexer.close()
+                with self.assertRaises(EOFError):
+                    await task
+            finally:
+                sock.close()
+
+        self.async_run(run)
+
+    def test_nameserver(self):
+        async def run():
+            with tests.util.UDPResponder() as responder:
+                async with dns.asyncquery.UDPMultiplexer() as multiplexer:
+                    res = dns.asyncresolver.Resolver(configure=False)
+                    res.nameservers = [
+                        dns.nameserver.Do53Nameserver(
+                            responder.address,
+                            responder.port,
+                            async_multiplexer=multiplexer,
+                        )
+                    ]
+                    for i in range(5):
+                        answer = await res.resolve(f"www{i}.example.")
+                        self.assertEqual(answer[0].address, "10.0.0.1")
+            self.assertLessEqual(len(responder.sources), multiplexer.sockets)
+
+        self.async_run(run)
+
+
+class AsyncConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = dns.asyncbackend.set_default_backend("asyncio")
+
+    def async_run(self, afunc):
+        return asyncio.run(afunc())
+
+    async def pipeline(self, query):
+        async def run(i):
+            q = dns.message.make_query(f"www{i}.example.", "A")
+            return (q, await query(q))
+
+        results = await asyncio.gather(*[run(i) for i in range(20)])
+        for q, r in results:
+            self.assertTrue(q.is_response(r))
+            self.assertEqual(r.answer[0][0].address, "10.0.0.1")
+
+    def test_tcp(self):
+        async def run():
+            with tests.util.TCPResponder(max_delay=0.1) as responder:
+                async with dns.asyncquery.ConnectionPool() as pool:
+
+                    async def query(q):
+                        return await pool.tcp(
+                            q, responder.address, timeout=2, port=responder.port
+                        )
+
+                    await self.pipeline(query)
+                    await self.pipeline(query)
+            self.assertEqual(responder.connections, 1)
+
+        self.async_run(run)
+
+    @unittest.skipIf(not _ssl_available, "SSL not available")
+    def test_tls(self):
+        async def run():
+            with tests.util.TCPResponder(max_delay=0.1, tls=True) as responder:
+                async with dns.asyncquery.ConnectionPool() as pool:
+
+                    async def query(q):
+                        return await pool.tls(
+                            q,
+                            responder.address,
+                            timeout=2,
+                            port=responder.port,
+                            server_hostname="localhost",
+                            verify=tests.util.here("tls/ca.crt"),
+                        )
+
+                    await self.pipeline(query)
+            self.assertEqual(responder.connections, 1)
+
+        self.async_run(run)
+
+    @unittest.skipIf(not _ssl_available, "SSL not available")
+    def test_tls_session_cache(self):
+        async def run():
+            cache = dns.query.TLSSessionCache()
+            with tests.util.TCPResponder(tls=True) as responder:
+                for i in range(3):
+                    q = dns.message.make_query(f"www{i}.example.", "A")
+                    r = await dns.asyncquery.tls(
+                        q,
+                        responder.address,
+                        timeout=2,
+                        port=responder.port,
+                        server_hostname="localhost",
+                        verify=tests.util.here("tls/ca.crt"),
+                        session_cache=cache,
+                    )
+                    self.assertTrue(q.is_response(r))
+            self.assertEqual(cache.misses(), 1)
+            self.assertEqual(cache.hits(), 2)
+
+        self.async_run(run)
+
+    @unittest.skipIf(not _ssl_available, "SSL not available")
+    def test_tls_session_resumption(self):
+        async def run():
+            cache = dns.query.TLSSessionCache()
+            with tests.util.TCPResponder(tls=True) as responder:
+                for _ in range(2):
+                    async with dns.asyncquery.ConnectionPool() as pool:
+                        q = dns.message.make_query("www.example.", "A")
+                        await pool.tls(
+                            q,
+                            responder.address,
+                            timeout=2,
+                            port=responder.port,
+                            server_hostname="localhost",
+                            verify=tests.util.here("tls/ca.crt"),
+                            session_cache=cache,
+                        )
+            self.assertEqual(responder.connections, 2)
+            self.assertEqual(cache.misses(), 1)
+            self.assertEqual(cache.hits(), 1)
+
+        self.async_run(run)
+
+    def test_closed_connection(self):
+        async def run():
+            with tests.util.TCPResponder() as responder:
+                async with dns.asyncquery.ConnectionPool() as pool:
+                    q = dns.message.make_query("www.example.", "A")
+                    await pool.tcp(q, responder.address, timeout=2, port=responder.port)
+                    for connections in pool._connections.values():
+                        for connection in connections:
+                            await connection.sock.close()
+                    await pool.tcp(q, responder.address, timeout=2, port=responder.port)
+                    self.assertEqual(responder.connections, 2)
+            with self.assertRaises(EOFError):
+                await pool.tcp(q, responder.address, timeout=2, port=responder.port)
+
+        self.async_run(run)
+
+    def test_cancelled_send(self):
+        async def run():
+            with tests.util.TCPResponder() as responder:
+                async with dns.asyncquery.ConnectionPool() as pool:
+                    q = dns.message.make_query("www.example.", "A")
+                    await pool.tcp(q, responder.address, timeout=2, port=responder.port)
+                    (connection,) = list(pool._connections.values())[0]
+                    sendall = connection.sock.sendall
+
+                    async def partial_sendall(what, timeout):
+                        await sendall(what[:3], timeout)
+                        await asyncio.sleep(10)
+
+                    connection.sock.sendall = partial_sendall
+                    task = asyncio.create_task(
+                        pool.tcp(q, responder.address, timeout=2, port=responder.port)
+                    )
+                    await asyncio.sleep(0.1)
+                    task.cancel()
+                    with self.assertRaises(asyncio.CancelledError):
+                        await task
+                    self.assertIsInstance(connection.error, EOFError)
+                    r = await pool.tcp(
+                        q, responder.address, timeout=2, port=responder.port
+                    )
+                    self.assertTrue(q.is_response(r))
+                    self.assertEqual(responder.connections, 2)
+
+        self.async_run(run)
+
+    def test_nameserver(self):
+        async def run():
+            with tests.util.TCPResponder() as responder:
+                async with dns.asyncquery.ConnectionPool() as pool:
+                    res = dns.asyncresolver.Resolver(configure=False)
+                    res.nameservers = [
+                        dns.nameserver.Do53Nameserver(
+                            responder.address,
+                            responder.port,
+                            async_connection_pool=pool,
+                        )
+                    ]
+                    for i in range(5):
+                        answer = await res.resolve(f"www{i}.example.", tcp=True)
+                        self.assertEqual(answer[0].address, "10.0.0.1")
+            self.assertEqual(responder.connections, 1)
+
+        self.async_run(run)
+
+
 try:
     import sniffio
     import trio
@@ -746,6 +1224,19 @@ try:
         def async_run(self, afunc):
             return trio.run(afunc)
 
+    class TrioAsyncResolverTests(unittest.TestCase):
+        # The other AsyncResolverTests use asyncio primitives directly.
+
+        def setUp(self):
+            self.backend = dns.asyncbackend.set_default_backend("trio")
+
+        def async_run(self, afunc):
+            return trio.run(afunc)
+
+        test_resolve_many = AsyncResolverTests.test_resolve_many
+        test_resolve_many_rate = AsyncResolverTests.test_resolve_many_rate
+        test_resolve_many_stop_early = AsyncResolverTests.test_resolve_many_stop_early
+
 except ImportError:
     pass
 
@@ -988,3 +1479,17 @@ class IgnoreErrors(unittest.TestCase):
             self.async_run(abad)
 
         self.assertRaises(dns.message.TrailingJunk, bad)
+
+    def test_dropped_before_parsing(self):
+        async def run():
+            other_q = dns.message.make_query("other.example.", "A")
+            other_q.id = self.q.id
+            bad_r_wire = dns.message.make_response(other_q).to_wire()
+            dns.query.udp_statistics.reset()
+            await self.mock_receive(
+                bad_r_wire, ("127.0.0.1", 53), self.good_r_wire, ("127.0.0.1", 53)
+            )
+            self.assertEqual(dns.query.udp_statistics.received, 2)
+            self.assertEqual(dns.query.udp_statistics.dropped, 1)
+
+        self.async_run(run)
@@ -14,6 +14,7 @@
 # WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
 # ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT
 # OF OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import asyncio
 import random
 import socket
 import unittest
@@ -27,8 +28,10 @@ try:
 except Exception:
     _have_ssl = False
 
+import dns.asyncbackend
 import dns.edns
 import dns.message
+import dns.nameserver
 import dns.query
 import dns.quic
 import dns.rdatatype
@@ -39,6 +42,12 @@ if dns.query._have_httpx2:
 
 import tests.util
 
+try:
+    from tests.nanonameserver import ConnectionType, Server
+    from tests.nanonameserver import have_doh as _nanonameserver_available
+except ImportError:
+    _nanonameserver_available = False
+
 resolver_v4_addresses = []
 resolver_v6_addresses = []
 family = socket.AF_UNSPEC
@@ -260,5 +269,69 @@ class DNSOverHTTP3TestCase(unittest.TestCase):
             self.assertTrue(q.is_response(r))
 
 
+@unittest.skipUnless(
+    dns.query._have_httpx2 and _nanonameserver_available and _have_ssl,
+    "httpx2 or the nanonameserver's DoH support not available",
+)
+class DoHNameserverTestCase(unittest.TestCase):
+    def nameserver(self, server):
+        address, port = server.get_address(ConnectionType.DOH)[:2]
+        return dns.nameserver.DoHNameserver(
+            f"https://{address}:{port}/dns-query",
+            verify=tests.util.here("tls/ca.crt"),
+        )
+
+    def test_shared_client(self):
+        with Server(protocols=(ConnectionType.DOH,)) as server:
+            ns = self.nameserver(server)
+            try:
+                ns.warm_up(timeout=4)
+                client = ns._client
+                for i in range(5):
+                    q = dns.message.make_query(f"www{i}.example.", "A")
+                    r = ns.query(q, 4, None, 0)
+                    self.assertTrue(q.is_response(r))
+                self.assertIs(ns._client, client)
+                self.assertEqual(len(client._transport._pool.connections), 1)
+            finally:
+                ns.close()
+
+    def test_shared_async_client(self):
+        async def run(ns):
+            await ns.async_warm_up(timeout=4)
+            backend = dns.asyncbackend.get_default_backend()
+
+            async def query(i):
+                q = dns.message.make_query(f"www{i}.example.", "A")
+                r = await ns.async_query(q, 4, None, 0, True, backend)
+                self.assertTrue(q.is_response(r))
+
+            # The concurrent queries are streams on one HTTP/2 connection.
+            await asyncio.gather(*[query(i) for i in range(20)])
+            client = ns._async_client
+            self.assertEqual(len(client._transport._pool.connections), 1)
+            await ns.async_close()
+
+        with Server(protocols=(ConnectionType.DOH,)) as server:
+            ns = self.nameserver(server)
+            asyncio.run(run(ns))
+            # A new event loop gets a new client.
+            asyncio.run(run(ns))
+
+    def test_close_async_client(self):
+        async def run(ns):
+            await ns.async_warm_up(timeout=4)
+            client = ns._async_client
+            # close() has the client's event loop close it.
+            ns.close()
+            self.assertIsNone(ns._async_client)
+            await asyncio.sleep(0.1)
+            self.assertTrue(client.is_closed)
+
+        with Server(protocols=(ConnectionType.DOH,)) as server:
+            ns = self.nameserver(server)
+            asyncio.run(run(ns))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -9,7 +9,9 @@ import dns._features
 import dns.asyncbackend
 import dns.asyncquery
 import dns.message
+import dns.nameserver
 import dns.query
+import dns.quic
 import dns.rcode
 
 from .util import have_ipv4, have_ipv6, here
@@ -61,6 +63,76 @@ def test_basic_asyncio():
             asyncio.run(amain(address, port))
 
 
+@pytest.fixture
+def early_streams(monkeypatch):
+    # Record whether each stream was made before its connection's handshake
+    # completed, i.e. whether its query was sent as 0-RTT data.
+    early = []
+    stream_made = dns.quic._common.BaseQuicConnection._stream_made
+
+    def _stream_made(self):
+        early.append(not self._handshake_complete.is_set())
+        stream_made(self)
+
+    monkeypatch.setattr(
+        dns.quic._common.BaseQuicConnection, "_stream_made", _stream_made
+    )
+    return early
+
+
+def check_statistics(statistics, early_streams, connections, streams):
+    # Each connection after the first resumes the session of the last one,
+    # and sends its first query as 0-RTT data.
+    assert statistics.connections == connections
+    assert statistics.handshakes == connections
+    assert statistics.resumptions == connections - 1
+    assert statistics.streams == streams
+    assert statistics.streams_per_connection() == streams / connections
+    assert early_streams.count(True) == connections - 1
+
+
+@pytest.mark.skipif(not have_quic, reason="requires aioquic")
+def test_nameserver_connection_reuse_sync(early_streams):
+    with Server(address="127.0.0.1") as server:
+        port = server.doq_address[1]
+        ns = dns.nameserver.DoQNameserver("127.0.0.1", port, verify=here("tls/ca.crt"))
+        for i in range(10):
+            q = dns.message.make_query(f"www{i}.example.", "A")
+            r = ns.query(q, 2, None, 0)
+            assert r.rcode() == dns.rcode.REFUSED
+        check_statistics(ns.statistics, early_streams, 1, 10)
+        ns.close()
+        assert ns.statistics is None
+        r = ns.query(q, 2, None, 0)
+        assert r.rcode() == dns.rcode.REFUSED
+        check_statistics(ns.statistics, early_streams, 1, 1)
+        ns.close()
+
+
+@pytest.mark.skipif(not have_quic, reason="requires aioquic")
+def test_nameserver_connection_reuse_asyncio(early_streams):
+    async def run(ns):
+        backend = dns.asyncbackend.get_backend("asyncio")
+
+        async def query(i):
+            q = dns.message.make_query(f"www{i}.example.", "A")
+            r = await ns.async_query(q, 2, None, 0, True, backend)
+            assert r.rcode() == dns.rcode.REFUSED
+
+        await asyncio.gather(*[query(i) for i in range(10)])
+        check_statistics(ns.async_statistics, early_streams, 1, 10)
+        await ns.async_close()
+        assert ns.async_statistics is None
+        await query(10)
+        check_statistics(ns.async_statistics, early_streams, 1, 1)
+        await ns.async_close()
+
+    with Server(address="127.0.0.1") as server:
+        port = server.doq_address[1]
+        ns = dns.nameserver.DoQNameserver("127.0.0.1", port, verify=here("tls/ca.crt"))
+        asyncio.run(run(ns))
+
+
 try:
     import trio
 
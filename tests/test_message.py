@@ -17,6 +17,9 @@
 # OF OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
 import binascii
+import copy
+import pickle
+import threading
 import unittest
 
 import dns.edns
@@ -24,6 +27,8 @@ import dns.exception
 import dns.flags
 import dns.message
 import dns.name
+import dns.opcode
+import dns.rcode
 import dns.rdataclass
 import dns.rdatatype
 import dns.rdtypes.ANY.OPT
@@ -849,6 +854,243 @@ www.dnspython.org. 300 IN A 1.2.3.4
 """)
         self.assertEqual(m, expected_message)
 
+    def test_from_wire_bytes_like(self):
+        keyring = dns.tsigkeyring.from_text({"keyname.": "NjHwPsMKjdN++dOfE5iAiQ=="})
+        r = dns.message.make_query("www.dnspython.org.", "A", use_edns=0)
+        r.use_tsig(keyring)
+        wire = r.to_wire()
+        for w in (bytearray(wire), memoryview(wire)):
+            m = dns.message.from_wire(w, keyring=keyring)
+            self.assertEqual(m, r)
+            self.assertTrue(m.had_tsig)
+            self.assertEqual(m.wire, wire)
+            self.assertIsInstance(m.wire, bytes)
+
+    def test_from_wire_pool(self):
+        pool = dns.name.NamePool()
+        r = dns.message.from_text("""id 1234
+flags QR AA
+;QUESTION
+example. IN NS
+;ANSWER
+example. 300 IN NS ns1.example.
+example. 300 IN NS ns2.example.
+;ADDITIONAL
+ns1.example. 300 IN A 10.0.0.1
+""")
+        wire = r.to_wire()
+        m1 = dns.message.from_wire(wire, pool=pool)
+        m2 = dns.message.from_wire(wire, pool=pool)
+        self.assertEqual(m1, r)
+        self.assertIs(m1.question[0].name, m2.answer[0].name)
+        targets = {rd.target for rd in m1.answer[0]}
+        for rd in m2.answer[0]:
+            self.assertIn(rd.target, targets)
+        self.assertIs(m1.additional[0].name, pool.intern(m2.additional[0].name))
+        self.assertEqual(len(pool), 3)
+        m = dns.message.from_wire(
+            wire, xfr=True, origin=dns.name.from_text("example."), pool=pool
+        )
+        self.assertIs(m.answer[0].name, pool.intern(dns.name.empty))
+
+    def make_lazy_test_response(self):
+        q = dns.message.make_query(
+            "www.dnspython.org.", "A", use_edns=0, options=[dns.edns.NSIDOption(b"")]
+        )
+        r = dns.message.make_response(q)
+        r.use_edns(0, payload=1232, options=[dns.edns.NSIDOption(b"ns1")])
+        r.set_rcode(dns.rcode.BADVERS)
+        r.answer.append(
+            dns.rrset.from_text("www.dnspython.org.", 300, "IN", "A", "10.0.0.1")
+        )
+        r.authority.append(
+            dns.rrset.from_text("dnspython.org.", 300, "IN", "NS", "ns1.dnspython.org.")
+        )
+        r.additional.append(
+            dns.rrset.from_text("ns1.dnspython.org.", 300, "IN", "A", "10.0.0.2")
+        )
+        return r
+
+    def test_lazy_from_wire(self):
+        r = self.make_lazy_test_response()
+        wire = r.to_wire()
+        m = dns.message.from_wire(wire, lazy=True)
+        self.assertEqual(m.id, r.id)
+        self.assertEqual(m.question, r.question)
+        self.assertEqual(m.rcode(), dns.rcode.BADVERS)
+        self.assertEqual(m.edns, 0)
+        self.assertEqual(m.payload, 1232)
+        lazy = m._lazy
+        self.assertIsNotNone(lazy.opt_offset)
+        self.assertEqual(
+            set(lazy.pending),
+            {
+                dns.message.MessageSection.ANSWER,
+                dns.message.MessageSection.AUTHORITY,
+                dns.message.MessageSection.ADDITIONAL,
+            },
+        )
+        self.assertEqual(m.answer, r.answer)
+        self.assertEqual(
+            set(lazy.pending),
+            {
+                dns.message.MessageSection.AUTHORITY,
+                dns.message.MessageSection.ADDITIONAL,
+            },
+        )
+        self.assertEqual(m.get_options(dns.edns.OptionType.NSID), list(r.options))
+        self.assertIsNone(lazy.opt_offset)
+        self.assertEqual(m.section_count(dns.message.AUTHORITY), 1)
+        self.assertEqual(m, r)
+        self.assertIsNone(m._lazy)
+        self.assertEqual(m.to_text(), dns.message.from_wire(wire).to_text())
+        self.assertEqual(m.to_wire(), wire)
+        # Nothing to read lazily
+        q = dns.message.make_query("www.dnspython.org.", "A")
+        m = dns.message.from_wire(q.to_wire(), lazy=True)
+        self.assertIsNone(m._lazy)
+        self.assertEqual(m, q)
+
+    def test_lazy_from_wire_update(self):
+        u = dns.update.UpdateMessage("example.")
+        u.present("foo")
+        u.add("bar", 300, "A", "10.0.0.1")
+        u.delete("baz", "AAAA")
+        wire = u.to_wire()
+        m = dns.message.from_wire(wire, lazy=True)
+        self.assertIsInstance(m, dns.update.UpdateMessage)
+        expected = dns.message.from_wire(wire)
+        self.assertEqual(m.update, expected.update)
+        self.assertEqual(m.prerequisite, expected.prerequisite)
+        self.assertEqual(m, expected)
+
+    def test_lazy_from_wire_tsig(self):
+        keyring = dns.tsigkeyring.from_text({"keyname.": "NjHwPsMKjdN++dOfE5iAiQ=="})
+        r = self.make_lazy_test_response()
+        r.use_tsig(keyring)
+        wire = r.to_wire()
+        m = dns.message.from_wire(wire, keyring=keyring, lazy=True)
+        self.assertTrue(m.had_tsig)
+        self.assertIsNotNone(m._lazy)
+        self.assertEqual(m.additional, r.additional)
+        self.assertEqual(m, r)
+        with self.assertRaises(dns.message.UnknownTSIGKey):
+            dns.message.from_wire(wire, lazy=True)
+        bad_keyring = dns.tsigkeyring.from_text(
+            {"keyname.": "AAAAAAAAAAAAAAAAAAAAAA=="}
+        )
+        with self.assertRaises(dns.tsig.BadSignature):
+            dns.message.from_wire(wire, keyring=bad_keyring, lazy=True)
+
+        # A keyring callable can look at the sections
+        def keyring_callable(message, keyname):
+            self.assertEqual(message.answer, r.answer)
+            return dns.tsig.Key(keyname, keyring[keyname])
+
+        m = dns.message.from_wire(wire, keyring=keyring_callable, lazy=True)
+        self.assertEqual(m, r)
+
+    def test_lazy_from_wire_errors(self):
+        wire = self.make_lazy_test_response().to_wire()
+        # Break the rdata of the A record in the answer
+        offset = wire.index(b"\x0a\x00\x00\x01")
+        bad_wire = wire[: offset - 2] + b"\x00\x03" + wire[offset:]
+        bad_wire = bad_wire[: offset + 3] + bad_wire[offset + 4 :]
+        m = dns.message.from_wire(bad_wire, lazy=True)
+        self.assertEqual(m.rcode(), dns.rcode.BADVERS)
+        with self.assertRaises(dns.exception.FormError):
+            m.answer
+        self.assertEqual(len(m.authority), 1)
+        m = dns.message.from_wire(bad_wire, lazy=True, continue_on_error=True)
+        self.assertEqual(len(m.errors), 0)
+        self.assertEqual(len(m.answer), 0)
+        self.assertEqual(len(m.errors), 1)
+        # Records which cannot be indexed are errors at once
+        opt = dns.rdtypes.ANY.OPT.OPT(1200, dns.rdatatype.OPT, ())
+        q = dns.message.Message(id=1)
+        q.answer.append(dns.rrset.from_rdata(dns.name.root, 0, opt))
+        with self.assertRaises(dns.message.BadEDNS):
+            dns.message.from_wire(q.to_wire(), lazy=True)
+        with self.assertRaises(dns.exception.FormError):
+            dns.message.from_wire(wire[:-1], lazy=True)
+        with self.assertRaises(dns.message.TrailingJunk):
+            dns.message.from_wire(wire + b"\x00", lazy=True)
+
+    def test_lazy_from_wire_threads(self):
+        r = self.make_lazy_test_response()
+        for i in range(500):
+            r.answer.append(
+                dns.rrset.from_text(
+                    f"www{i}.dnspython.org.", 300, "IN", "A", "10.0.0.1"
+                )
+            )
+        wire = r.to_wire(max_size=65535)
+        for _ in range(10):
+            m = dns.message.from_wire(wire, lazy=True)
+            barrier = threading.Barrier(2)
+            results = []
+
+            def read():
+                barrier.wait()
+                results.append((len(m.answer), m.options))
+
+            threads = [threading.Thread(target=read) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(results, [(501, r.options)] * 2)
+
+    def test_lazy_from_wire_use_edns(self):
+        wire = self.make_lazy_test_response().to_wire()
+        m = dns.message.from_wire(wire, lazy=True)
+        m.use_edns(False)
+        self.assertEqual(m.edns, -1)
+        self.assertEqual(m.payload, 0)
+        self.assertIsNone(m.opt)
+        self.assertEqual(m.options, ())
+        self.assertEqual(len(m.additional), 1)
+        self.assertNotIn("OPT", m.to_text())
+        self.assertIsNone(m._lazy)
+        m = dns.message.from_wire(wire, lazy=True)
+        m.use_edns(payload=4096)
+        self.assertEqual(m.edns, 0)
+        self.assertEqual(m.payload, 4096)
+        self.assertEqual(m.options, ())
+        # Assigning the OPT record replaces the one on the wire too
+        m = dns.message.from_wire(wire, lazy=True)
+        m.opt = None
+        self.assertEqual(m.edns, -1)
+        self.assertEqual(m.payload, 0)
+        m.to_text()
+        self.assertIsNone(m.opt)
+        self.assertIsNone(m._lazy)
+
+    def test_lazy_from_wire_copy(self):
+        r = self.make_lazy_test_response()
+        wire = r.to_wire()
+        m = dns.message.from_wire(wire, lazy=True)
+        c = copy.copy(m)
+        self.assertIsNone(m._lazy)
+        self.assertIsNone(c._lazy)
+        self.assertEqual(m.to_text(), r.to_text())
+        self.assertEqual(c.to_text(), r.to_text())
+        self.assertEqual(c.options, r.options)
+        m = dns.message.from_wire(wire, lazy=True)
+        c = copy.deepcopy(m)
+        self.assertEqual(c, r)
+        self.assertEqual(c.options, r.options)
+
+    def test_lazy_from_wire_pickle(self):
+        r = self.make_lazy_test_response()
+        m = dns.message.from_wire(r.to_wire(), lazy=True)
+        p = pickle.loads(pickle.dumps(m))
+        self.assertIsNone(p._lazy)
+        self.assertEqual(p, r)
+        self.assertEqual(p.edns, 0)
+        self.assertEqual(p.payload, 1232)
+        self.assertEqual(p.options, r.options)
+
     def test_padding_basic(self):
         q = dns.message.make_query("www.example", "a", use_edns=0, pad=0)
         w = q.to_wire()
@@ -1020,5 +1262,183 @@ www.dnspython.org. 300 IN A 1.2.3.4
         self.assertEqual(r.extended_errors(), options)
 
 
+class MessageViewTestCase(unittest.TestCase):
+    def make_response(self):
+        q = dns.message.make_query("www.dnspython.org.", "A", use_edns=0)
+        r = dns.message.make_response(q)
+        r.use_edns(0, payload=1232, options=[dns.edns.NSIDOption(b"ns1")])
+        r.set_rcode(dns.rcode.BADVERS)
+        r.answer.append(
+            dns.rrset.from_text(
+                "www.dnspython.org.", 300, "IN", "A", "10.0.0.1", "10.0.0.2"
+            )
+        )
+        r.authority.append(
+            dns.rrset.from_text("dnspython.org.", 600, "IN", "NS", "ns1.dnspython.org.")
+        )
+        r.additional.append(
+            dns.rrset.from_text("ns1.dnspython.org.", 900, "IN", "A", "10.0.0.3")
+        )
+        return r
+
+    def test_view(self):
+        r = self.make_response()
+        wire = r.to_wire()
+        for w in (wire, bytearray(wire), memoryview(wire)):
+            v = dns.message.MessageView(w)
+            self.assertEqual(v.id, r.id)
+            self.assertEqual(v.flags, r.flags)
+            self.assertEqual(v.opcode(), dns.opcode.QUERY)
+            self.assertEqual(v.rcode(), dns.rcode.BADVERS)
+            self.assertEqual(v.qname, dns.name.from_text("www.dnspython.org."))
+            self.assertEqual(v.qtype, dns.rdatatype.A)
+            self.assertEqual(v.qclass, dns.rdataclass.IN)
+            self.assertEqual(len(v.question), 1)
+            self.assertEqual(v.section_count("ANSWER"), 2)
+            self.assertEqual(v.section_count(dns.message.ADDITIONAL), 2)
+            self.assertEqual(v.min_ttl, 300)
+            self.assertEqual(v.edns, 0)
+            self.assertEqual(v.ednsflags, r.ednsflags)
+            self.assertEqual(v.payload, 1232)
+            self.assertEqual(v.options, r.options)
+            self.assertEqual(v.get_options(dns.edns.OptionType.NSID), list(r.options))
+            self.assertEqual(v.to_message(), r)
+
+    def test_rrs(self):
+        r = self.make_response()
+        v = dns.message.MessageView(r.to_wire())
+        headers = list(v.rrs())
+        self.assertEqual(len(headers), 5)
+        self.assertEqual(
+            [h.section for h in headers],
+            [
+                dns.message.ANSWER,
+                dns.message.ANSWER,
+                dns.message.AUTHORITY,
+                dns.message.ADDITIONAL,
+                dns.message.ADDITIONAL,
+            ],
+        )
+        answer = list(v.rrs(dns.message.ANSWER))
+        self.assertEqual(
+            [bytes(h.rdata) for h in answer], [bytes(h.rdata) for h in headers[:2]]
+        )
+        self.assertEqual(answer[1].name, dns.name.from_text("www.dnspython.org."))
+        self.assertEqual(answer[1].rdtype, dns.rdatatype.A)
+        self.assertEqual(answer[1].rdclass, dns.rdataclass.IN)
+        self.assertEqual(answer[1].ttl, 300)
+        self.assertEqual(
+            {bytes(h.rdata) for h in answer},
+            {b"\x0a\x00\x00\x01", b"\x0a\x00\x00\x02"},
+        )
+        (ns,) = v.rrs("AUTHORITY")
+        self.assertEqual(ns.name, dns.name.from_text("dnspython.org."))
+        self.assertEqual(ns.ttl, 600)
+        self.assertEqual(headers[4].rdtype, dns.rdatatype.OPT)
+        with self.assertRaises(ValueError):
+            list(v.rrs(dns.message.QUESTION))
+
+    def test_no_edns(self):
+        q = dns.message.make_query("www.dnspython.org.", "A")
+        v = dns.message.MessageView(q.to_wire())
+        self.assertEqual(v.edns, -1)
+        self.assertEqual(v.ednsflags, 0)
+        self.assertEqual(v.payload, 0)
+        self.assertEqual(v.options, ())
+        self.assertIsNone(v.min_ttl)
+        self.assertEqual(list(v.rrs()), [])
+        v = dns.message.MessageView(dns.message.Message(id=1).to_wire())
+        self.assertIsNone(v.qname)
+        self.assertIsNone(v.qtype)
+        self.assertIsNone(v.qclass)
+
+    def test_min_ttl_negative(self):
+        q = dns.message.make_query("www.dnspython.org.", "A")
+        r = dns.message.make_response(q)
+        r.set_rcode(dns.rcode.NXDOMAIN)
+        r.authority.append(
+            dns.rrset.from_text("dnspython.org.", 3600, "IN", "SOA", ". . 1 2 3 4 60")
+        )
+        v = dns.message.MessageView(r.to_wire())
+        self.assertEqual(v.min_ttl, 60)
+
+    def test_malformed(self):
+        with self.assertRaises(dns.message.ShortHeader):
+            dns.message.MessageView(b"\x00" * 11)
+        wire = self.make_response().to_wire()
+        v = dns.message.MessageView(wire[:-1])
+        self.assertEqual(v.qname, dns.name.from_text("www.dnspython.org."))
+        with self.assertRaises(dns.exception.FormError):
+            v.min_ttl
+
+
+class WireTemplateTestCase(unittest.TestCase):
+    def make_response(self):
+        q = dns.message.make_query("www.dnspython.org.", "A", want_dnssec=True)
+        r = dns.message.make_response(q)
+        r.use_edns(0, dns.flags.DO)
+        r.answer.append(
+            dns.rrset.from_text("www.dnspython.org.", 300, "IN", "A", "10.0.0.1")
+        )
+        r.authority.append(
+            dns.rrset.from_text("dnspython.org.", 30, "IN", "NS", "ns1.dnspython.org.")
+        )
+        r.additional.append(
+            dns.rrset.from_text("ns1.dnspython.org.", 900, "IN", "A", "10.0.0.3")
+        )
+        return r
+
+    def test_template(self):
+        r = self.make_response()
+        wire = r.to_wire()
+        t = dns.message.WireTemplate(wire)
+        self.assertEqual(t.wire, wire)
+        self.assertEqual(t.ttls, (300, 30, 900))
+        self.assertEqual(len(t.ttl_offsets), 3)
+        self.assertEqual(t.min_ttl, 30)
+        w = t.to_wire(r.id)
+        self.assertIsInstance(w, bytearray)
+        self.assertEqual(w, wire)
+
+    def test_to_wire(self):
+        r = self.make_response()
+        t = dns.message.WireTemplate(r.to_wire())
+        buffer = bytearray(b"previous contents")
+        w = t.to_wire(4321, 100, buffer)
+        self.assertIs(w, buffer)
+        m = dns.message.from_wire(bytes(w))
+        self.assertEqual(m.id, 4321)
+        self.assertEqual(m.answer[0].ttl, 200)
+        self.assertEqual(m.authority[0].ttl, 0)
+        self.assertEqual(m.additional[0].ttl, 800)
+        # The OPT record's TTL is the EDNS flags, so it is not changed.
+        self.assertEqual(m.ednsflags, dns.flags.DO)
+        self.assertEqual(m.question, r.question)
+        # The template is not changed.
+        m = dns.message.from_wire(bytes(t.to_wire(1, 0, buffer)))
+        self.assertEqual(m.answer[0].ttl, 300)
+        self.assertEqual(m.id, 1)
+
+    def test_out_of_range_ttl(self):
+        r = self.make_response()
+        wire = bytearray(r.to_wire())
+        offset = dns.message.WireTemplate(wire).ttl_offsets[0]
+        wire[offset : offset + 4] = (2**31).to_bytes(4, "big")
+        t = dns.message.WireTemplate(wire)
+        self.assertEqual(t.ttls, (0, 30, 900))
+        # A TTL of 2**31 or more is sent as 0, whether or not time has elapsed.
+        for elapsed in (0, 10):
+            w = t.to_wire(r.id, elapsed)
+            self.assertEqual(w[offset : offset + 4], b"\x00\x00\x00\x00")
+            m = dns.message.from_wire(bytes(w))
+            self.assertEqual(m.additional[0].ttl, 900 - elapsed)
+
+    def test_malformed(self):
+        with self.assertRaises(dns.message.ShortHeader):
+            dns.message.WireTemplate(b"")
+        with self.assertRaises(dns.exception.FormError):
+            dns.message.WireTemplate(self.make_response().to_wire()[:-1])
+
+
 if __name__ == "__main__":
     unittest.main()
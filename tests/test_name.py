@@ -24,8 +24,10 @@ from io import BytesIO
 from typing import Dict  # pylint: disable=unused-import
 
 import dns.e164
+import dns.exception
 import dns.name
 import dns.reversename
+import dns.wire
 
 # pylint: disable=line-too-long,unsupported-assignment-operation
 
@@ -193,6 +195,17 @@ class NameTestCase(unittest.TestCase):
         n2 = dns.name.from_text("foo.com")
         self.assertEqual(hash(n1), hash(n2))
 
+    def testHash2(self):
+        # Relative and absolute names with the same labels are not equal, and
+        # the hash is cached without changing the immutability of the name.
+        n1 = dns.name.from_text("foo.com.")
+        n2 = dns.name.from_text("foo.com", None)
+        self.assertNotEqual(n1, n2)
+        self.assertEqual(hash(n1), hash(n1))
+        self.assertEqual(len({n1, n2, n1.canonicalize()}), 2)
+        with self.assertRaises(TypeError):
+            n1._hash = 0  # type: ignore
+
     def testCompare1(self):
         n1 = dns.name.from_text("a")
         n2 = dns.name.from_text("b")
@@ -216,6 +229,36 @@ class NameTestCase(unittest.TestCase):
     def testCompare4(self):
         self.assertNotEqual(dns.name.root, 1)
 
+    def testSortKey(self):
+        texts = [
+            ".",
+            "example.",
+            "a.example.",
+            "yljkjljk.a.example.",
+            "Z.a.example.",
+            "zABC.a.EXAMPLE.",
+            "z.example.",
+            "\\001.z.example.",
+            "*.z.example.",
+            "\\200.z.example.",
+            "example",
+            "Example2",
+            "a.example",
+            "@",
+        ]
+        names = [dns.name.from_text(t, None) for t in texts]
+        self.assertEqual(sorted(names, key=dns.name.Name.sort_key), sorted(names))
+        for n1 in names:
+            for n2 in names:
+                order = n1.fullcompare(n2)[1]
+                k1 = n1.sort_key()
+                k2 = n2.sort_key()
+                self.assertEqual(k1 < k2, order < 0)
+                self.assertEqual(k1 == k2, order == 0)
+        self.assertEqual(names[0].sort_key(), (True,))
+        self.assertEqual(names[-1].sort_key(), (False,))
+        self.assertEqual(names[4].sort_key(), (True, b"example", b"a", b"z"))
+
     def testSubdomain1(self):
         self.assertFalse(dns.name.empty.is_subdomain(dns.name.root))
 
@@ -257,6 +300,15 @@ class NameTestCase(unittest.TestCase):
         c = n.canonicalize()
         self.assertEqual(c.labels, (b"foo", b"bar", b"example", b""))
 
+    def testCanonicalize2(self):
+        n = dns.name.from_text("FOO.bar", origin=self.origin)
+        hash(n)
+        c = n.canonicalize()
+        self.assertEqual(c, n)
+        self.assertEqual(hash(c), hash(n))
+        self.assertEqual(c.to_wire(), c.to_digestable())
+        self.assertEqual(c.to_wire(), n.to_digestable())
+
     def testToText1(self):
         n = dns.name.from_text("FOO.bar", origin=self.origin)
         t = n.to_text()
@@ -547,6 +599,49 @@ class NameTestCase(unittest.TestCase):
         n.to_wire(f, compress)
         self.assertEqual(len(compress), 1025)
 
+    def testToWireCompressionTable(self):
+        n1 = dns.name.from_text("FOO.bar")
+        n2 = dns.name.from_text("a.foo.BAR")
+        n3 = dns.name.from_text("b", None)
+        f = BytesIO()
+        compress = dns.name.CompressionTable()
+        n1.to_wire(f, compress)
+        n2.to_wire(f, compress)
+        n3.to_wire(f, compress, n2)
+        n1.to_wire(f, compress, canonicalize=True)
+        self.assertEqual(
+            f.getvalue(), b"\x03FOO\x03bar\x00\x01a\xc0\x00\x01b\xc0\x09\xc0\x00"
+        )
+        self.assertEqual(
+            compress,
+            {
+                b"\x03foo\x03bar\x00": 0,
+                b"\x03bar\x00": 4,
+                b"\x01a\x03foo\x03bar\x00": 9,
+                b"\x01b\x01a\x03foo\x03bar\x00": 13,
+            },
+        )
+        compress.rollback(9)
+        self.assertEqual(compress, {b"\x03foo\x03bar\x00": 0, b"\x03bar\x00": 4})
+        compress.rollback(0)
+        self.assertEqual(compress, {})
+
+    def testNamePool(self):
+        pool = dns.name.NamePool()
+        n1 = pool.intern(dns.name.from_text("www.example."))
+        n2 = pool.intern(dns.name.from_text("www.example."))
+        n3 = pool.intern(dns.name.from_text("WWW.example."))
+        n4 = pool.intern(dns.name.from_text("ftp.example."))
+        self.assertIs(n1, n2)
+        self.assertEqual(n1, n3)
+        self.assertIsNot(n1, n3)
+        self.assertEqual(n3.labels, (b"WWW", b"example", b""))
+        self.assertIs(n4.labels[1], n1.labels[1])
+        self.assertEqual(len(pool), 3)
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+        self.assertIsNot(pool.intern(dns.name.from_text("www.example.")), n1)
+
     def testSplit1(self):
         n = dns.name.from_text("foo.bar.")
         prefix, suffix = n.split(2)
@@ -690,6 +785,14 @@ class NameTestCase(unittest.TestCase):
         self.assertEqual(n2, en2)
         self.assertEqual(cused2, ecused2)
 
+    def testFromWireParserMemoryview(self):
+        w = memoryview(b"\x03foo\x00\x01a\xc0\x00")
+        parser = dns.wire.Parser(w, 5)
+        n = dns.name.from_wire_parser(parser)
+        self.assertEqual(n, dns.name.from_text("a.foo."))
+        self.assertIsInstance(n.labels[0], bytes)
+        self.assertEqual(parser.current, 9)
+
     def testFromWire2(self):
         w = b"\x03foo\x00\x01a\xc0\x00\x01b\xc0\x05"
         current = 0
@@ -739,6 +842,46 @@ class NameTestCase(unittest.TestCase):
 
         self.assertRaises(dns.name.BadLabelType, bad)
 
+    def testBadFromWireTruncated(self):
+        for w in (b"", b"\x03fo", b"\x03foo", b"\x03foo\xc0"):
+            with self.assertRaises(dns.exception.FormError):
+                dns.name.from_wire(w, 0)
+
+    def testFromWireParserCache(self):
+        # dnspython.org., www.dnspython.org. with a pointer to it, and then
+        # a pointer to www.dnspython.org. and one to org.
+        w = b"\x09dnspython\x03org\x00\x03www\xc0\x00\xc0\x0f\xc0\x0a"
+        p = dns.wire.Parser(w)
+        n1 = p.get_name()
+        n2 = p.get_name()
+        n3 = p.get_name()
+        n4 = p.get_name()
+        self.assertEqual(n1, dns.name.from_text("dnspython.org."))
+        self.assertEqual(n2, dns.name.from_text("www.dnspython.org."))
+        self.assertEqual(n4, dns.name.from_text("org."))
+        self.assertEqual(p.remaining(), 0)
+        # The names pointed to are reused.
+        self.assertIs(n2.labels[1], n1.labels[0])
+        self.assertIs(n3, n2)
+        self.assertIs(p.names[10][0], n4)
+        # A new parser decodes the same names without a cache.
+        p = dns.wire.Parser(w, 21)
+        self.assertEqual(p.get_name(), n3)
+        self.assertEqual(p.get_name(), n4)
+
+    def testFromWireParserCacheTooLong(self):
+        # A 250 octet name, and then a name which would be too long with it
+        # as its suffix.
+        long_name = b"".join([b"\x31" + b"a" * 49] * 5) + b"\x00"
+        w = long_name + b"\x05abcde\xc0\x00"
+        p = dns.wire.Parser(w)
+        p.get_name()
+        with self.assertRaises(dns.name.NameTooLong):
+            p.get_name()
+        p = dns.wire.Parser(w, len(long_name))
+        with self.assertRaises(dns.name.NameTooLong):
+            p.get_name()
+
     def testParent1(self):
         n = dns.name.from_text("foo.bar.")
         self.assertEqual(n.parent(), dns.name.from_text("bar."))
@@ -1158,6 +1301,8 @@ class NameTestCase(unittest.TestCase):
         p = pickle.dumps(n1)
         n2 = pickle.loads(p)
         self.assertEqual(n1, n2)
+        self.assertEqual(hash(n1), hash(n2))
+        self.assertEqual(n1.__getstate__(), {"labels": n1.labels})
 
     def test_pad_to_max_name(self):
         # Test edge cases in our padding helper.
@@ -18,6 +18,7 @@
 import contextlib
 import socket
 import sys
+import threading
 import time
 import unittest
 
@@ -33,11 +34,15 @@ import dns.flags
 import dns.inet
 import dns.message
 import dns.name
+import dns.nameserver
+import dns.opcode
 import dns.query
 import dns.rcode
 import dns.rdataclass
 import dns.rdatatype
+import dns.resolver
 import dns.tsigkeyring
+import dns.update
 import dns.zone
 import tests.util
 
@@ -676,6 +681,270 @@ class MiscTests(unittest.TestCase):
             )
 
 
+class UDPMultiplexerTests(unittest.TestCase):
+    def test_query(self):
+        with tests.util.UDPResponder(max_delay=0.1, bogus=True) as responder:
+            with dns.query.UDPMultiplexer(sockets=2) as multiplexer:
+                results = {}
+
+                def query(i):
+                    q = dns.message.make_query(f"www{i}.example.", "A")
+                    results[i] = (
+                        q,
+                        multiplexer.query(
+                            q, responder.address, timeout=2, port=responder.port
+                        ),
+                    )
+
+                threads = [threading.Thread(target=query, args=(i,)) for i in range(20)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        self.assertEqual(len(results), 20)
+        for q, r in results.values():
+            self.assertTrue(q.is_response(r))
+            self.assertEqual(r.answer[0][0].address, "10.0.0.1")
+        # All the queries shared the multiplexer's two sockets.
+        self.assertEqual(len(responder.sources), 2)
+
+    def test_same_question(self):
+        # Queries with the same ID and question are sent on different
+        # sockets, or with a socket of their own if there are none free.
+        with tests.util.UDPResponder(max_delay=0.1) as responder:
+            with dns.query.UDPMultiplexer(sockets=1) as multiplexer:
+                q = dns.message.make_query("www.example.", "A")
+                responses = []
+
+                def query():
+                    responses.append(
+                        multiplexer.query(
+                            q, responder.address, timeout=2, port=responder.port
+                        )
+                    )
+
+                threads = [threading.Thread(target=query) for _ in range(3)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        self.assertEqual(len(responses), 3)
+        self.assertTrue(all(q.is_response(r) for r in responses))
+
+    def test_timeout_and_close(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        address, port = sock.getsockname()
+        try:
+            multiplexer = dns.query.UDPMultiplexer()
+            q = dns.message.make_query("www.example.", "A")
+            with self.assertRaises(dns.exception.Timeout):
+                multiplexer.query(q, address, timeout=0.1, port=port)
+            errors = []
+
+            def query():
+                try:
+                    multiplexer.query(q, address, timeout=5, port=port)
+                except Exception as e:
+                    errors.append(e)
+
+            thread = threading.Thread(target=query)
+            thread.start()
+            time.sleep(0.1)
+            multiplexer.close()
+            thread.join()
+            self.assertIsInstance(errors[0], EOFError)
+            with self.assertRaises(EOFError):
+                multiplexer.query(q, address, timeout=0.1, port=port)
+        finally:
+            sock.close()
+
+    def test_nameserver(self):
+        with tests.util.UDPResponder() as responder:
+            with dns.query.UDPMultiplexer() as multiplexer:
+                res = dns.resolver.Resolver(configure=False)
+                res.nameservers = [
+                    dns.nameserver.Do53Nameserver(
+                        responder.address, responder.port, multiplexer=multiplexer
+                    )
+                ]
+                for i in range(5):
+                    answer = res.resolve(f"www{i}.example.")
+                    self.assertEqual(answer[0].address, "10.0.0.1")
+        self.assertLessEqual(len(responder.sources), multiplexer.sockets)
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def pipeline(self, responder, query):
+        results = {}
+
+        def run(i):
+            q = dns.message.make_query(f"www{i}.example.", "A")
+            results[i] = (q, query(q))
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 20)
+        for q, r in results.values():
+            self.assertTrue(q.is_response(r))
+            self.assertEqual(r.answer[0][0].address, "10.0.0.1")
+
+    def test_tcp(self):
+        with tests.util.TCPResponder(max_delay=0.1) as responder:
+            with dns.query.ConnectionPool() as pool:
+                self.pipeline(
+                    responder,
+                    lambda q: pool.tcp(
+                        q, responder.address, timeout=2, port=responder.port
+                    ),
+                )
+                self.pipeline(
+                    responder,
+                    lambda q: pool.tcp(
+                        q, responder.address, timeout=2, port=responder.port
+                    ),
+                )
+        # The queries were pipelined over one connection, which was reused.
+        self.assertEqual(responder.connections, 1)
+
+    @unittest.skipUnless(have_ssl, "SSL not available")
+    def test_tls(self):
+        with tests.util.TCPResponder(max_delay=0.1, tls=True) as responder:
+            with dns.query.ConnectionPool() as pool:
+                self.pipeline(
+                    responder,
+                    lambda q: pool.tls(
+                        q,
+                        responder.address,
+                        timeout=2,
+                        port=responder.port,
+                        server_hostname="localhost",
+                        verify=tests.util.here("tls/ca.crt"),
+                    ),
+                )
+        self.assertEqual(responder.connections, 1)
+
+    @unittest.skipUnless(have_ssl, "SSL not available")
+    def test_tls_session_cache(self):
+        cache = dns.query.TLSSessionCache()
+        with tests.util.TCPResponder(tls=True) as responder:
+            for i in range(3):
+                q = dns.message.make_query(f"www{i}.example.", "A")
+                r = dns.query.tls(
+                    q,
+                    responder.address,
+                    timeout=2,
+                    port=responder.port,
+                    server_hostname="localhost",
+                    verify=tests.util.here("tls/ca.crt"),
+                    session_cache=cache,
+                )
+                self.assertTrue(q.is_response(r))
+        self.assertEqual(cache.misses(), 1)
+        self.assertEqual(cache.hits(), 2)
+        cache.reset_statistics()
+        self.assertEqual(cache.hits(), 0)
+        self.assertEqual(cache.misses(), 0)
+
+    @unittest.skipUnless(have_ssl, "SSL not available")
+    def test_tls_session_cache_max_size(self):
+        cache = dns.query.TLSSessionCache(max_size=1)
+
+        class FakeSession:
+            time = time.time()
+            timeout = 300
+
+        cache.put(("a",), FakeSession(), False)
+        cache.put(("b",), FakeSession(), False)
+        self.assertIsNone(cache.get(("a",)))
+        self.assertIsNotNone(cache.get(("b",)))
+        expired = FakeSession()
+        expired.time -= 600
+        cache.put(("b",), expired, True)
+        self.assertIsNone(cache.get(("b",)))
+        self.assertEqual(cache.hits(), 1)
+        self.assertEqual(cache.misses(), 2)
+        with self.assertRaises(ValueError):
+            dns.query.TLSSessionCache(max_size=0)
+
+    @unittest.skipUnless(have_ssl, "SSL not available")
+    def test_tls_session_resumption(self):
+        cache = dns.query.TLSSessionCache()
+        with tests.util.TCPResponder(tls=True) as responder:
+            for _ in range(2):
+                with dns.query.ConnectionPool() as pool:
+                    q = dns.message.make_query("www.example.", "A")
+                    pool.tls(
+                        q,
+                        responder.address,
+                        timeout=2,
+                        port=responder.port,
+                        server_hostname="localhost",
+                        verify=tests.util.here("tls/ca.crt"),
+                        session_cache=cache,
+                    )
+        self.assertEqual(responder.connections, 2)
+        self.assertEqual(cache.misses(), 1)
+        self.assertEqual(cache.hits(), 1)
+
+    def test_max_pipelined(self):
+        with tests.util.TCPResponder(max_delay=0.1) as responder:
+            with dns.query.ConnectionPool(max_pipelined=5) as pool:
+                self.pipeline(
+                    responder,
+                    lambda q: pool.tcp(
+                        q, responder.address, timeout=2, port=responder.port
+                    ),
+                )
+        self.assertGreaterEqual(responder.connections, 4)
+
+    def test_idle_and_closed_connections(self):
+        with tests.util.TCPResponder() as responder:
+            with dns.query.ConnectionPool(idle_timeout=0.1) as pool:
+                q = dns.message.make_query("www.example.", "A")
+                pool.tcp(q, responder.address, timeout=2, port=responder.port)
+                time.sleep(0.2)
+                # The idle connection is replaced.
+                pool.tcp(q, responder.address, timeout=2, port=responder.port)
+                self.assertEqual(responder.connections, 2)
+                # A connection the server closed is replaced too.
+                for connections in pool._connections.values():
+                    for connection in connections:
+                        connection.sock.shutdown(socket.SHUT_RDWR)
+                pool.tcp(q, responder.address, timeout=2, port=responder.port)
+                self.assertEqual(responder.connections, 3)
+        with self.assertRaises(EOFError):
+            pool.tcp(q, responder.address, timeout=2, port=responder.port)
+
+    def test_timeout(self):
+        sock = socket.create_server(("127.0.0.1", 0))
+        address, port = sock.getsockname()
+        try:
+            with dns.query.ConnectionPool() as pool:
+                q = dns.message.make_query("www.example.", "A")
+                with self.assertRaises(dns.exception.Timeout):
+                    pool.tcp(q, address, timeout=0.1, port=port)
+        finally:
+            sock.close()
+
+    def test_nameserver(self):
+        with tests.util.TCPResponder() as responder:
+            with dns.query.ConnectionPool() as pool:
+                res = dns.resolver.Resolver(configure=False)
+                res.nameservers = [
+                    dns.nameserver.Do53Nameserver(
+                        responder.address, responder.port, connection_pool=pool
+                    )
+                ]
+                for i in range(5):
+                    answer = res.resolve(f"www{i}.example.", tcp=True)
+                    self.assertEqual(answer[0].address, "10.0.0.1")
+        self.assertEqual(responder.connections, 1)
+
+
 @contextlib.contextmanager
 def mock_udp_recv(wire1, from1, wire2, from2):
     saved = dns.query._udp_recv
@@ -877,3 +1146,39 @@ class IgnoreErrors(unittest.TestCase):
             )
 
         self.assertRaises(dns.message.TrailingJunk, bad)
+
+    def test_dropped_before_parsing(self):
+        other_q = dns.message.make_query("other.example.", "A")
+        other_q.id = self.q.id
+        bad_r_wire = dns.message.make_response(other_q).to_wire()
+        dns.query.udp_statistics.reset()
+        self.mock_receive(
+            bad_r_wire, ("127.0.0.1", 53), self.good_r_wire, ("127.0.0.1", 53)
+        )
+        self.assertEqual(dns.query.udp_statistics.received, 2)
+        self.assertEqual(dns.query.udp_statistics.dropped, 1)
+
+    def test_response_filter(self):
+        response_filter = dns.query._ResponseFilter(self.q)
+        r = dns.message.make_response(self.q)
+        self.assertTrue(response_filter.accepts(r.to_wire()))
+        # The question may be echoed in a different case.
+        r.question[0].name = dns.name.from_text("EXAMPLE.")
+        self.assertTrue(response_filter.accepts(r.to_wire()))
+        r.question[0].rdtype = dns.rdatatype.AAAA
+        self.assertFalse(response_filter.accepts(r.to_wire()))
+        # Some errors need not echo the question.
+        r.question = []
+        self.assertFalse(response_filter.accepts(r.to_wire()))
+        r.set_rcode(dns.rcode.REFUSED)
+        self.assertTrue(response_filter.accepts(r.to_wire()))
+        self.assertFalse(response_filter.accepts(self.q.to_wire()))
+        self.assertFalse(response_filter.accepts(r.to_wire()[:11]))
+        r = dns.message.make_response(self.q)
+        r.set_opcode(dns.opcode.NOTIFY)
+        self.assertFalse(response_filter.accepts(r.to_wire()))
+        # Updates need not echo the zone section.
+        u = dns.update.UpdateMessage("example.")
+        ur = dns.message.make_response(u)
+        ur.zone = []
+        self.assertTrue(dns.query._ResponseFilter(u).accepts(ur.to_wire()))
@@ -6,6 +6,7 @@ import dns.exception
 import dns.flags
 import dns.message
 import dns.renderer
+import dns.rrset
 import dns.tsig
 import dns.tsigkeyring
 
@@ -104,6 +105,21 @@ class RendererTestCase(unittest.TestCase):
 
         self.assertRaises(dns.exception.FormError, bad)
 
+    def test_too_big_rolls_back_compression(self):
+        r = dns.renderer.Renderer(flags=dns.flags.QR, max_size=60)
+        qname = dns.name.from_text("foo.example")
+        r.add_question(qname, dns.rdatatype.A)
+        rrs = dns.rrset.from_text("bar.example.", 30, "in", "a", "10.0.0.1", "10.0.0.2")
+        with self.assertRaises(dns.exception.TooBig):
+            r.add_rrset(dns.renderer.ANSWER, rrs)
+        self.assertEqual(len(r.get_wire()), 29)
+        self.assertEqual(len(r.compress), 2)
+        rrs = dns.rrset.from_text("bar.example.", 30, "in", "a", "10.0.0.1")
+        r.add_rrset(dns.renderer.ANSWER, rrs)
+        r.write_header()
+        message = dns.message.from_wire(r.get_wire())
+        self.assertEqual(message.answer, [rrs])
+
     def test_reservation(self):
         r = dns.renderer.Renderer(flags=dns.flags.QR, max_size=512)
         r.reserve(100)
@@ -18,6 +18,7 @@
 import selectors
 import socket
 import sys
+import threading
 import time
 import unittest
 from io import StringIO
@@ -332,6 +333,65 @@ class BaseResolverTests(unittest.TestCase):
                 cache.get((name, dns.rdatatype.A, dns.rdataclass.IN)), answer
             )
 
+    def testCacheIncrementalCleaning(self):
+        with FakeTime() as fake_time:
+            cache = dns.resolver.Cache(cleaning_batch=3)
+            now = fake_time.time()
+            for i in range(10):
+                name = dns.name.from_text(f"example{i}.")
+                # Odd entries live much longer than even ones.
+                answer = FakeAnswer(now + 1 + (i % 2) * 100)
+                cache.put((name, dns.rdatatype.A, dns.rdataclass.IN), answer)
+            self.assertEqual(len(cache.data), 10)
+            fake_time.sleep(2)
+            cache._maybe_clean()
+            self.assertEqual(len(cache.data), 7)
+            cache._maybe_clean()
+            self.assertEqual(len(cache.data), 5)
+            # Nothing else is expired, so further cleaning does nothing.
+            cache._maybe_clean()
+            self.assertEqual(len(cache.data), 5)
+            self.assertEqual(len(cache.expirations), 5)
+
+    def testCacheCleaningReplaced(self):
+        with FakeTime() as fake_time:
+            cache = dns.resolver.Cache()
+            key = (dns.name.from_text("example."), dns.rdatatype.A, dns.rdataclass.IN)
+            cache.put(key, FakeAnswer(fake_time.time() + 1))
+            answer = FakeAnswer(fake_time.time() + 100)
+            cache.put(key, answer)
+            fake_time.sleep(2)
+            # The expiration of the replaced answer must not remove the
+            # current one.
+            cache._maybe_clean()
+            self.assertIs(cache.get(key), answer)
+            self.assertEqual(len(cache.expirations), 1)
+            cache.flush()
+            self.assertEqual(len(cache.expirations), 0)
+
+    def testCacheHeapBounded(self):
+        with FakeTime() as fake_time:
+            cache = dns.resolver.Cache()
+            keys = [
+                (dns.name.from_text(f"example{i}."), dns.rdatatype.A, 1)
+                for i in range(10)
+            ]
+            expiration = fake_time.time() + 100
+            for _ in range(100):
+                for key in keys:
+                    cache.put(key, FakeAnswer(expiration))
+            # Re-putting with the same expiration adds no heap entries.
+            self.assertEqual(len(cache.expirations), 10)
+            for i in range(100):
+                for key in keys:
+                    cache.put(key, FakeAnswer(expiration + i))
+            # Stale entries are compacted away.
+            self.assertLessEqual(len(cache.expirations), 2 * len(keys))
+            fake_time.sleep(300)
+            for _ in range(len(keys)):
+                cache._maybe_clean()
+            self.assertEqual(len(cache.data), 0)
+
     def testIndexErrorOnEmptyRRsetAccess(self):
         def bad():
             message = dns.message.from_text(message_text_mx)
@@ -421,7 +481,8 @@ class BaseResolverTests(unittest.TestCase):
         name3 = dns.name.from_text("name3")
         basic_cache = dns.resolver.Cache()
         lru_cache = dns.resolver.LRUCache(100)
-        for cache in [basic_cache, lru_cache]:
+        sharded_cache = dns.resolver.ShardedLRUCache(100, 4)
+        for cache in [basic_cache, lru_cache, sharded_cache]:
             answer1 = FakeAnswer(time.time() + 10)
             answer2 = FakeAnswer(time.time() + 10)
             cache.put((name1, dns.rdatatype.A, dns.rdataclass.IN), answer1)
@@ -479,7 +540,11 @@ class BaseResolverTests(unittest.TestCase):
         self.assertTrue(on_lru_list(cache, key, answer2))
 
     def test_cache_stats(self):
-        caches = [dns.resolver.Cache(), dns.resolver.LRUCache(4)]
+        caches = [
+            dns.resolver.Cache(),
+            dns.resolver.LRUCache(4),
+            dns.resolver.ShardedLRUCache(4, 2),
+        ]
         key1 = (dns.name.from_text("key1."), dns.rdatatype.A, dns.rdataclass.IN)
         key2 = (dns.name.from_text("key2."), dns.rdatatype.A, dns.rdataclass.IN)
         for cache in caches:
@@ -489,21 +554,21 @@ class BaseResolverTests(unittest.TestCase):
             self.assertIsNone(a)
             self.assertEqual(cache.hits(), 0)
             self.assertEqual(cache.misses(), 1)
-            if isinstance(cache, dns.resolver.LRUCache):
+            if isinstance(cache, dns.resolver.LRUCache | dns.resolver.ShardedLRUCache):
                 self.assertEqual(cache.get_hits_for_key(key1), 0)
             cache.put(key1, answer1)
             a = cache.get(key1)
             self.assertIs(a, answer1)
             self.assertEqual(cache.hits(), 1)
             self.assertEqual(cache.misses(), 1)
-            if isinstance(cache, dns.resolver.LRUCache):
+            if isinstance(cache, dns.resolver.LRUCache | dns.resolver.ShardedLRUCache):
                 self.assertEqual(cache.get_hits_for_key(key1), 1)
             cache.put(key2, answer2)
             a = cache.get(key2)
             self.assertIsNone(a)
             self.assertEqual(cache.hits(), 1)
             self.assertEqual(cache.misses(), 2)
-            if isinstance(cache, dns.resolver.LRUCache):
+            if isinstance(cache, dns.resolver.LRUCache | dns.resolver.ShardedLRUCache):
                 self.assertEqual(cache.get_hits_for_key(key2), 0)
             stats = cache.get_statistics_snapshot()
             self.assertEqual(stats.hits, 1)
@@ -513,6 +578,612 @@ class BaseResolverTests(unittest.TestCase):
             self.assertEqual(stats.hits, 0)
             self.assertEqual(stats.misses, 0)
 
+    def test_LRUCache_max_bytes(self):
+        def make_answer(name, count):
+            text = "id 1234\nopcode QUERY\nrcode NOERROR\nflags QR RD RA\n"
+            text += f";QUESTION\n{name} IN A\n;ANSWER\n"
+            for i in range(count):
+                text += f"{name} 300 IN A 10.0.0.{i + 1}\n"
+            message = dns.message.from_wire(dns.message.from_text(text).to_wire())
+            return dns.resolver.Answer(
+                dns.name.from_text(name), dns.rdatatype.A, dns.rdataclass.IN, message
+            )
+
+        small = make_answer("small.", 1)
+        big = make_answer("big.", 40)
+        small_size = len(small.response.wire)
+        big_size = len(big.response.wire)
+        self.assertGreater(big_size, 10 * small_size)
+        cache = dns.resolver.LRUCache(100, max_bytes=4 * small_size)
+        for i in range(4):
+            key = (dns.name.from_text(f"small{i}."), dns.rdatatype.A, dns.rdataclass.IN)
+            cache.put(key, small)
+        stats = cache.get_statistics_snapshot()
+        self.assertEqual(stats.bytes, 4 * small_size)
+        self.assertEqual(stats.evictions, 0)
+        key = (dns.name.from_text("small4."), dns.rdatatype.A, dns.rdataclass.IN)
+        cache.put(key, small)
+        stats = cache.get_statistics_snapshot()
+        self.assertEqual(len(cache.data), 4)
+        self.assertEqual(stats.bytes, 4 * small_size)
+        self.assertEqual(stats.evictions, 1)
+        # The big answer doesn't fit at all, so it is not cached.
+        key = (dns.name.from_text("big."), dns.rdatatype.A, dns.rdataclass.IN)
+        cache.put(key, big)
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(len(cache.data), 4)
+        # Once there is room, the big answer evicts the small ones.
+        cache.set_max_bytes(big_size + small_size)
+        cache.put(key, big)
+        stats = cache.get_statistics_snapshot()
+        self.assertEqual(len(cache.data), 2)
+        self.assertEqual(stats.bytes, big_size + small_size)
+        self.assertEqual(stats.evictions, 4)
+        cache.reset_statistics()
+        stats = cache.get_statistics_snapshot()
+        self.assertEqual(stats.evictions, 0)
+        self.assertEqual(stats.bytes, big_size + small_size)
+        cache.flush(key)
+        self.assertEqual(cache.get_statistics_snapshot().bytes, small_size)
+        cache.flush()
+        self.assertEqual(cache.get_statistics_snapshot().bytes, 0)
+
+    def test_LRUCache_evictions(self):
+        with FakeTime() as fake_time:
+            cache = dns.resolver.LRUCache(2)
+            for i in range(4):
+                key = (
+                    dns.name.from_text(f"example{i}."),
+                    dns.rdatatype.A,
+                    dns.rdataclass.IN,
+                )
+                cache.put(key, FakeAnswer(fake_time.time() + 1))
+            stats = cache.get_statistics_snapshot()
+            self.assertEqual(stats.evictions, 2)
+            # Answers without a wire format get a default size.
+            self.assertEqual(stats.bytes, 2 * dns.resolver._DEFAULT_ANSWER_SIZE)
+            # Expiration is not eviction.
+            fake_time.sleep(2)
+            self.assertIsNone(cache.get(key))
+            stats = cache.get_statistics_snapshot()
+            self.assertEqual(stats.evictions, 2)
+            self.assertEqual(stats.bytes, dns.resolver._DEFAULT_ANSWER_SIZE)
+
+    def test_ShardedLRUCache_max_bytes(self):
+        cache = dns.resolver.ShardedLRUCache(100, 4, max_bytes=10000)
+        self.assertEqual([shard.max_bytes for shard in cache.shards], [2500] * 4)
+        for i in range(40):
+            key = (
+                dns.name.from_text(f"example{i}."),
+                dns.rdatatype.A,
+                dns.rdataclass.IN,
+            )
+            cache.put(key, FakeAnswer(time.time() + 10))
+        stats = cache.get_statistics_snapshot()
+        self.assertLessEqual(stats.bytes, 10000)
+        self.assertEqual(
+            stats.bytes,
+            sum(len(shard.data) for shard in cache.shards)
+            * dns.resolver._DEFAULT_ANSWER_SIZE,
+        )
+        self.assertEqual(
+            stats.evictions, 40 - sum(len(shard.data) for shard in cache.shards)
+        )
+        cache.set_max_bytes(None)
+        self.assertEqual([shard.max_bytes for shard in cache.shards], [None] * 4)
+
+    def test_LRUCache_claim_prefetch(self):
+        with FakeTime() as fake_time:
+            key = (dns.name.from_text("example."), dns.rdatatype.A, dns.rdataclass.IN)
+            cache = dns.resolver.LRUCache(4)
+            cache.put(key, FakeAnswer(fake_time.time() + 100))
+            cache.get(key)
+            fake_time.sleep(95)
+            # Prefetching is off by default.
+            self.assertFalse(cache.claim_prefetch(key))
+            cache = dns.resolver.LRUCache(4, prefetch_fraction=0.1, prefetch_hits=2)
+            cache.put(key, FakeAnswer(fake_time.time() + 100))
+            cache.get(key)
+            cache.get(key)
+            # Not close enough to expiration.
+            self.assertFalse(cache.claim_prefetch(key))
+            fake_time.sleep(95)
+            self.assertTrue(cache.claim_prefetch(key))
+            # Only one claim is granted.
+            self.assertFalse(cache.claim_prefetch(key))
+            cache.put(key, FakeAnswer(fake_time.time() + 100))
+            cache.get(key)
+            fake_time.sleep(95)
+            # Not enough hits.
+            self.assertFalse(cache.claim_prefetch(key))
+            fake_time.sleep(10)
+            # Expired.
+            self.assertFalse(cache.claim_prefetch(key))
+            missing = (dns.name.from_text("missing."), key[1], key[2])
+            self.assertFalse(cache.claim_prefetch(missing))
+
+    def test_prefetch(self):
+        caches = [
+            dns.resolver.LRUCache(4, prefetch_fraction=0.5, prefetch_hits=2),
+            dns.resolver.ShardedLRUCache(4, 2, prefetch_fraction=0.5, prefetch_hits=2),
+        ]
+        for cache in caches:
+            with FakeTime() as fake_time:
+                nameserver = tests.util.FakeNameserver(ttl=100)
+                res = dns.resolver.Resolver(configure=False)
+                res.nameservers = [nameserver]
+                res.cache = cache
+                res.resolve("www.example.")
+                self.assertEqual(nameserver.count, 1)
+                fake_time.sleep(60)
+                res.resolve("www.example.")
+                self.assertEqual(nameserver.count, 1)
+                # The second hit triggers the prefetch.
+                answer = res.resolve("www.example.")
+                self.assertEqual(answer[0].address, "10.0.0.1")
+                for _ in range(100):
+                    if res.resolve("www.example.") is not answer:
+                        break
+                    time.sleep(0.01)
+                self.assertEqual(nameserver.count, 2)
+                # The refreshed answer is cached with its full TTL.
+                fake_time.sleep(60)
+                answer = res.resolve("www.example.")
+                self.assertEqual(nameserver.count, 2)
+                self.assertEqual(answer.expiration, fake_time.time() + 40)
+
+    def test_cache_get_stale(self):
+        caches = [
+            dns.resolver.Cache(max_stale_ttl=100, stale_answer_ttl=10),
+            dns.resolver.LRUCache(4, max_stale_ttl=100, stale_answer_ttl=10),
+            dns.resolver.ShardedLRUCache(4, 2, max_stale_ttl=100, stale_answer_ttl=10),
+        ]
+        for cache in caches:
+            with FakeTime() as fake_time:
+                message = dns.message.from_text(message_text)
+                name = dns.name.from_text("example.")
+                key = (name, dns.rdatatype.A, dns.rdataclass.IN)
+                answer = dns.resolver.Answer(
+                    name, dns.rdatatype.A, dns.rdataclass.IN, message
+                )
+                cache.put(key, answer)
+                # Fresh answers are not stale.
+                self.assertIsNone(cache.get_stale(key))
+                fake_time.sleep(50)
+                self.assertIsNone(cache.get(key))
+                stale = cache.get_stale(key)
+                self.assertIsNotNone(stale)
+                self.assertIsNot(stale, answer)
+                self.assertEqual(stale.expiration, fake_time.time() + 10)
+                self.assertEqual(stale.rrset.ttl, 10)
+                self.assertEqual(stale.rrset, answer.rrset)
+                # The cached answer is unchanged.
+                self.assertEqual(answer.rrset.ttl, 1)
+                fake_time.sleep(60)
+                self.assertIsNone(cache.get(key))
+                self.assertIsNone(cache.get_stale(key))
+
+    def test_cache_stale_retention(self):
+        with FakeTime() as fake_time:
+            cache = dns.resolver.Cache(max_stale_ttl=100)
+            key = (dns.name.from_text("example."), dns.rdatatype.A, dns.rdataclass.IN)
+            cache.put(key, FakeAnswer(fake_time.time() + 1))
+            fake_time.sleep(50)
+            cache._maybe_clean()
+            self.assertIn(key, cache.data)
+            fake_time.sleep(60)
+            cache._maybe_clean()
+            self.assertNotIn(key, cache.data)
+            # Without serve stale, expired entries are not retained.
+            for cache in [dns.resolver.Cache(), dns.resolver.LRUCache(4)]:
+                cache.put(key, FakeAnswer(fake_time.time() + 1))
+                fake_time.sleep(2)
+                self.assertIsNone(cache.get(key))
+                self.assertNotIn(key, cache.data)
+                self.assertIsNone(cache.get_stale(key))
+
+    def test_serve_stale(self):
+        nameserver = tests.util.FakeNameserver(ttl=100)
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [nameserver]
+        res.cache = dns.resolver.LRUCache(4, max_stale_ttl=100)
+        answer = res.resolve("www.example.")
+        answer.expiration = time.time() - 1
+        nameserver.exception = OSError("unreachable")
+        stale = res.resolve("www.example.")
+        self.assertEqual(stale.rrset, answer.rrset)
+        self.assertEqual(stale.rrset.ttl, 30)
+        self.assertEqual(nameserver.count, 2)
+        # Without a stale answer, the error is raised.
+        with self.assertRaises(dns.resolver.NoNameservers):
+            res.resolve("www.example.", "AAAA")
+
+    def test_serve_stale_client_timeout(self):
+        nameserver = tests.util.FakeNameserver(ttl=100)
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [nameserver]
+        res.cache = dns.resolver.LRUCache(4, max_stale_ttl=100)
+        res.stale_answer_client_timeout = 0.1
+        answer = res.resolve("www.example.")
+        answer.expiration = time.time() - 1
+        nameserver.delay = 0.5
+        start = time.time()
+        stale = res.resolve("www.example.")
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(stale.rrset.ttl, 30)
+        # The answer is refreshed in the background.
+        for _ in range(100):
+            refreshed = res.cache.get((answer.qname, answer.rdtype, answer.rdclass))
+            if refreshed is not None:
+                break
+            time.sleep(0.05)
+        self.assertIsNotNone(refreshed)
+        # The query which timed out is not counted.
+        self.assertEqual(nameserver.count, 2)
+
+    def _coalesce(self, res, count, qname="www.example.", **kwargs):
+        results = [None] * count
+
+        def worker(i):
+            try:
+                results[i] = res.resolve(qname, **kwargs)
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_coalesce_queries(self):
+        nameserver = tests.util.FakeNameserver(delay=0.2)
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [nameserver]
+        res.coalesce_queries = True
+        results = self._coalesce(res, 10)
+        self.assertEqual(nameserver.count, 1)
+        for answer in results:
+            self.assertIs(answer, results[0])
+        self.assertEqual(len(res._flights), 0)
+        # No-data answers are shared, but each caller decides whether to
+        # raise NoAnswer.
+        results = self._coalesce(res, 4, rdtype="MX", raise_on_no_answer=False)
+        self.assertEqual(nameserver.count, 2)
+        for answer in results:
+            self.assertIsNone(answer.rrset)
+        results = self._coalesce(res, 4, rdtype="MX")
+        self.assertEqual(nameserver.count, 3)
+        for e in results:
+            self.assertIsInstance(e, dns.resolver.NoAnswer)
+        # Errors are shared too.
+        nameserver.exception = OSError("unreachable")
+        results = self._coalesce(res, 10)
+        self.assertEqual(nameserver.count, 4)
+        # The leader raises the error, and each waiter raises its own copy of
+        # it, with its own traceback.
+        (leader,) = [e for e in results if e.__cause__ is None]
+        for e in results:
+            self.assertIsInstance(e, dns.resolver.NoNameservers)
+            self.assertEqual(str(e), str(leader))
+            if e is not leader:
+                self.assertIs(e.__cause__, leader)
+        self.assertEqual(len({id(e) for e in results}), 10)
+        self.assertEqual(len({id(e.__traceback__) for e in results}), 10)
+        self.assertEqual(len(res._flights), 0)
+
+    def test_coalesce_queries_off(self):
+        nameserver = tests.util.FakeNameserver(delay=0.1)
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [nameserver]
+        self._coalesce(res, 4)
+        self.assertEqual(nameserver.count, 4)
+        # Resolutions with a search list are not coalesced.
+        res.coalesce_queries = True
+        res.search = [dns.name.from_text("example.")]
+        self._coalesce(res, 4, qname="www", search=True)
+        self.assertEqual(nameserver.count, 8)
+
+    def test_coalesce_queries_waiter_timeout(self):
+        nameserver = tests.util.FakeNameserver(delay=0.5)
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [nameserver]
+        res.coalesce_queries = True
+        leader = threading.Thread(target=res.resolve, args=("www.example.",))
+        leader.start()
+        time.sleep(0.1)
+        with self.assertRaises(dns.resolver.LifetimeTimeout):
+            res.resolve("www.example.", lifetime=0.1)
+        leader.join()
+        self.assertEqual(nameserver.count, 1)
+
+    def test_nameserver_statistics_update(self):
+        statistics = dns.resolver.NameserverStatistics()
+        self.assertIsNone(statistics.srtt)
+        statistics.update(0.1, True)
+        self.assertAlmostEqual(statistics.srtt, 0.1)
+        self.assertAlmostEqual(statistics.rttvar, 0.05)
+        statistics.update(0.9, False)
+        self.assertAlmostEqual(statistics.srtt, 0.2)
+        self.assertAlmostEqual(statistics.rttvar, 0.2375)
+        self.assertEqual(statistics.queries, 2)
+        self.assertEqual(statistics.failures, 1)
+        self.assertFalse(statistics.healthy())
+        statistics.update(0.2, True)
+        self.assertTrue(statistics.healthy())
+        clone = statistics.clone()
+        self.assertIsNot(clone, statistics)
+        self.assertEqual(clone.srtt, statistics.srtt)
+        self.assertEqual(clone.queries, 3)
+        self.assertEqual(clone.failures, 1)
+
+    def test_nameserver_statistics(self):
+        fast = tests.util.FakeNameserver("fast", delay=0.01)
+        slow = tests.util.FakeNameserver("slow", delay=0.1)
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [slow, fast]
+        # Nothing is recorded unless statistics are used.
+        res.resolve("www.example.")
+        self.assertEqual(res.nameserver_statistics(), {})
+        res.rtt_selection = True
+        res.rtt_probe_probability = 0.0
+        res.nameservers = [slow]
+        res.resolve("www.example.")
+        statistics = res.nameserver_statistics()
+        self.assertEqual(list(statistics.keys()), ["slow"])
+        self.assertGreaterEqual(statistics["slow"].srtt, 0.1)
+        self.assertEqual(statistics["slow"].queries, 1)
+        res.nameservers = [slow, fast]
+        slow.exception = OSError("unreachable")
+        fast.exception = OSError("unreachable")
+        with self.assertRaises(dns.resolver.NoNameservers):
+            res.resolve("www.example.", lifetime=1)
+        statistics = res.nameserver_statistics()
+        self.assertEqual(statistics["slow"].failures, 1)
+        self.assertEqual(statistics["fast"].failures, 1)
+        self.assertEqual(statistics["fast"].queries, 1)
+        # reset() forgets the statistics but keeps the lock.
+        lock = res._nameserver_statistics_lock
+        res.reset()
+        self.assertIs(res._nameserver_statistics_lock, lock)
+        self.assertEqual(res.nameserver_statistics(), {})
+        res.rtt_selection = True
+        res._record_nameserver_result(slow, 0.1, True)
+        res.reset_nameserver_statistics()
+        self.assertEqual(res.nameserver_statistics(), {})
+
+    def test_rtt_selection(self):
+        fast = tests.util.FakeNameserver("fast", delay=0.01)
+        slow = tests.util.FakeNameserver("slow", delay=0.1)
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [slow, fast]
+        res.rtt_selection = True
+        res.rtt_probe_probability = 0.0
+        # Both are unknown, so the configured order is used.
+        res.resolve("www.example.")
+        self.assertEqual((slow.count, fast.count), (1, 0))
+        # The fast server is unknown, so it is probed next.
+        res.resolve("www.example.")
+        self.assertEqual((slow.count, fast.count), (1, 1))
+        for _ in range(5):
+            res.resolve("www.example.")
+        self.assertEqual((slow.count, fast.count), (1, 6))
+        # A failing nameserver goes to the back of the line.
+        fast.exception = OSError("unreachable")
+        res.resolve("www.example.")
+        self.assertEqual((slow.count, fast.count), (2, 7))
+        res.resolve("www.example.")
+        self.assertEqual((slow.count, fast.count), (3, 7))
+
+    def test_rtt_selection_probe(self):
+        nameservers = [tests.util.FakeNameserver(f"ns{i}") for i in range(3)]
+        res = dns.resolver.Resolver(configure=False)
+        res.rtt_selection = True
+        for i, nameserver in enumerate(nameservers):
+            res._record_nameserver_result(nameserver, 0.1 * (i + 1), True)
+        res.rtt_probe_probability = 0.0
+        self.assertEqual(res._order_nameservers(nameservers[::-1]), nameservers)
+        res.rtt_probe_probability = 1.0
+        for _ in range(10):
+            ordered = res._order_nameservers(nameservers)
+            self.assertIsNot(ordered[0], nameservers[0])
+            self.assertEqual(len(ordered), 3)
+            self.assertEqual(set(ordered), set(nameservers))
+
+    def test_resolve_name_concurrent(self):
+        nameserver = tests.util.FakeNameserver(delay=0.2)
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [nameserver]
+        start = time.time()
+        answers = res.resolve_name("www.example.")
+        elapsed = time.time() - start
+        self.assertEqual(set(answers.addresses()), {"10.0.0.1", "::1"})
+        self.assertEqual(nameserver.count, 2)
+        self.assertLess(elapsed, 0.35)
+
+    def test_resolve_name_joins_thread_on_error(self):
+        nameserver = tests.util.FakeNameserver(delay=0.1)
+        nameserver.exception = OSError("unreachable")
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [nameserver]
+        threads = threading.active_count()
+        with self.assertRaises(dns.resolver.NoNameservers):
+            res.resolve_name("www.example.", lifetime=1)
+        # The A lookup's thread has finished by the time the error is raised.
+        self.assertEqual(threading.active_count(), threads)
+        self.assertEqual(nameserver.count, 2)
+
+    def test_resolve_name_v4_thread_without_result(self):
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [tests.util.FakeNameserver()]
+        resolve = res.resolve
+        main_thread = threading.current_thread()
+
+        def thread_exiting_resolve(qname, rdtype, **kwargs):
+            # The A lookup's thread ends without a result.
+            if threading.current_thread() is not main_thread:
+                raise KeyboardInterrupt
+            return resolve(qname, rdtype, **kwargs)
+
+        with (
+            patch.object(res, "resolve", thread_exiting_resolve),
+            patch.object(threading, "excepthook", lambda args: None),
+        ):
+            answers = res.resolve_name("www.example.")
+        self.assertEqual(set(answers.addresses()), {"10.0.0.1", "::1"})
+
+    def test_resolve_name_check_v4_result(self):
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [tests.util.FakeNameserver()]
+        v6 = res.resolve("www.example.", "AAAA")
+        v4 = res.resolve("www.example.", "A")
+        other = res.resolve("www.other.", "A")
+        self.assertEqual(res._check_v4_result(v4, v6), (v4, False))
+        # An A query for a different name, or one which ended without a
+        # result, must be redone at the name the AAAA query found.
+        self.assertEqual(res._check_v4_result(other, v6), (None, True))
+        self.assertEqual(res._check_v4_result(None, v6), (None, True))
+        # NXDOMAIN or no answer at that name means there are no A records.
+        nxdomain = dns.resolver.NXDOMAIN(qnames=[v6.qname])
+        self.assertEqual(res._check_v4_result(nxdomain, v6), (None, False))
+        nxdomain = dns.resolver.NXDOMAIN(qnames=[other.qname])
+        self.assertEqual(res._check_v4_result(nxdomain, v6), (None, True))
+        no_answer = dns.resolver.NoAnswer(response=v4.response)
+        self.assertEqual(res._check_v4_result(no_answer, v6), (None, False))
+        # Other errors are raised.
+        with self.assertRaises(dns.resolver.NoNameservers):
+            res._check_v4_result(dns.resolver.NoNameservers(), v6)
+
+    def test_resolve_name_failed_v4_not_redone(self):
+        nameserver = tests.util.FakeNameserver()
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [nameserver]
+        resolve = res.resolve
+
+        def failing_v4_resolve(qname, rdtype, **kwargs):
+            if rdtype == dns.rdatatype.A:
+                raise dns.resolver.LifetimeTimeout(timeout=1.0, errors=[])
+            return resolve(qname, rdtype, **kwargs)
+
+        with patch.object(res, "resolve", failing_v4_resolve):
+            with self.assertRaises(dns.resolver.LifetimeTimeout):
+                res.resolve_name("www.example.")
+        # Only the AAAA query was sent; the failed A query was not redone.
+        self.assertEqual(nameserver.count, 1)
+
+    def test_resolve_many(self):
+        nameserver = tests.util.FakeNameserver(delay=0.1)
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [nameserver]
+        consumed = []
+
+        def queries():
+            for i in range(10):
+                consumed.append(i)
+                yield (f"www{i}.example.", "A")
+            yield ("www.example.", "ANY")
+
+        start = time.time()
+        results = res.resolve_many(queries(), concurrency=5)
+        qname, rdtype, answer = next(results)
+        # The input is consumed only as resolutions complete.
+        self.assertLessEqual(len(consumed), 6)
+        self.assertEqual(answer.qname, dns.name.from_text(qname))
+        rest = list(results)
+        elapsed = time.time() - start
+        self.assertEqual(len(rest), 10)
+        errors = [result for _, _, result in rest if isinstance(result, Exception)]
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], dns.resolver.NoMetaqueries)
+        self.assertEqual(nameserver.count, 10)
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, 0.5)
+
+    def test_resolve_many_rate(self):
+        nameserver = tests.util.FakeNameserver()
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = [nameserver]
+        queries = [(f"www{i}.example.", "A") for i in range(5)]
+        start = time.time()
+        results = list(res.resolve_many(queries, concurrency=5, rate=20))
+        elapsed = time.time() - start
+        self.assertEqual(len(results), 5)
+        self.assertEqual(nameserver.count, 5)
+        # Five queries at 20 per second take at least 0.2 seconds.
+        self.assertGreaterEqual(elapsed, 0.19)
+        with self.assertRaises(ValueError):
+            next(res.resolve_many(queries, concurrency=0))
+
+    def test_rate_limiter(self):
+        nameserver = tests.util.FakeNameserver()
+        limiter = dns.resolver._RateLimiter(10, burst=2)
+        self.assertEqual(limiter.reserve(nameserver, 100.0), 100.0)
+        self.assertEqual(limiter.reserve(nameserver, 100.0), 100.0)
+        self.assertAlmostEqual(limiter.reserve(nameserver, 100.0), 100.1)
+        self.assertAlmostEqual(limiter.reserve(nameserver, 100.0), 100.2)
+        # Other nameservers are limited separately.
+        other = tests.util.FakeNameserver("other")
+        self.assertEqual(limiter.reserve(other, 100.0), 100.0)
+        # Unused capacity does not accumulate beyond the burst.
+        self.assertEqual(limiter.reserve(nameserver, 200.0), 200.0)
+        self.assertEqual(limiter.reserve(nameserver, 200.0), 200.0)
+        self.assertAlmostEqual(limiter.reserve(nameserver, 200.0), 200.1)
+
+    def test_ShardedLRUCache_set_max_size(self):
+        cache = dns.resolver.ShardedLRUCache(10, 4)
+        self.assertEqual(cache.max_size, 10)
+        self.assertEqual([shard.max_size for shard in cache.shards], [3, 3, 2, 2])
+        cache.set_max_size(0)
+        self.assertEqual(cache.max_size, 1)
+        self.assertEqual([shard.max_size for shard in cache.shards], [1, 0, 0, 0])
+        cache = dns.resolver.ShardedLRUCache(1, 16)
+        for i in range(100):
+            key = (dns.name.from_text(f"example{i}."), dns.rdatatype.A, 1)
+            cache.put(key, FakeAnswer(time.time() + 10))
+        self.assertEqual(sum(len(shard.data) for shard in cache.shards), 1)
+        cache = dns.resolver.ShardedLRUCache(100, 4, max_bytes=10001)
+        self.assertEqual(sum(shard.max_bytes for shard in cache.shards), 10001)
+        with self.assertRaises(ValueError):
+            dns.resolver.ShardedLRUCache(10, 0)
+
+    def test_ShardedLRUCache_shards(self):
+        cache = dns.resolver.ShardedLRUCache(1000, 8)
+        keys = []
+        for i in range(100):
+            name = dns.name.from_text(f"example{i}.")
+            key = (name, dns.rdatatype.A, dns.rdataclass.IN)
+            keys.append(key)
+            cache.put(key, FakeAnswer(time.time() + 10))
+        self.assertEqual(sum(len(shard.data) for shard in cache.shards), 100)
+        # The keys should be spread over more than one shard.
+        self.assertGreater(sum(1 for shard in cache.shards if shard.data), 1)
+        for key in keys:
+            self.assertIsNotNone(cache.get(key))
+            self.assertIn(key, cache._shard(key).data)
+        self.assertEqual(cache.hits(), 100)
+
+    def test_ShardedLRUCache_threads(self):
+        cache = dns.resolver.ShardedLRUCache(1000, 8)
+        keys = [
+            (dns.name.from_text(f"example{i}."), dns.rdatatype.A, dns.rdataclass.IN)
+            for i in range(50)
+        ]
+
+        def worker():
+            for key in keys:
+                if cache.get(key) is None:
+                    cache.put(key, FakeAnswer(time.time() + 10))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.get_statistics_snapshot()
+        self.assertEqual(stats.hits + stats.misses, 8 * 50)
+        self.assertEqual(sum(len(shard.data) for shard in cache.shards), 50)
+
     def testEmptyAnswerSection(self):
         # TODO: dangling_cname_0_message_text was the only sample message
         #       with an empty answer section. Other than that it doesn't
@@ -1033,6 +1704,39 @@ class ResolverNameserverValidTypeTestCase(unittest.TestCase):
             with self.assertRaises(ValueError):
                 resolver.nameservers = invalid_nameserver
 
+    def test_doh_nameservers_kept(self):
+        # DoH nameservers given as URLs are kept by the resolver, so their
+        # HTTP clients keep their connections open across resolutions.
+        res = dns.resolver.Resolver(configure=False)
+        res.nameservers = ["https://ns.example/dns-query"]
+        (ns1,) = res._enrich_nameservers(res.nameservers, {}, 53, res._doh_nameservers)
+        (ns2,) = res._enrich_nameservers(res.nameservers, {}, 53, res._doh_nameservers)
+        self.assertIsInstance(ns1, dns.nameserver.DoHNameserver)
+        self.assertIs(ns1, ns2)
+        # Other resolvers have their own.
+        res2 = dns.resolver.Resolver(configure=False)
+        res2.nameservers = ["https://ns.example/dns-query"]
+        self.assertIsNot(res2._doh_nameservers["https://ns.example/dns-query"], ns1)
+        # Setting the nameservers again keeps the ones still used, and closes
+        # the others.
+        with patch.object(dns.nameserver.DoHNameserver, "close") as close:
+            res.nameservers = [
+                "https://ns.example/dns-query",
+                "https://ns2.example/dns-query",
+            ]
+            self.assertIs(res._doh_nameservers["https://ns.example/dns-query"], ns1)
+            close.assert_not_called()
+            res.nameservers = ["https://ns2.example/dns-query"]
+            close.assert_called_once()
+            self.assertNotIn("https://ns.example/dns-query", res._doh_nameservers)
+        # A URL added to the list in place gets a nameserver for each
+        # resolution, which does not keep a client open.
+        res.nameservers.append("https://ns3.example/dns-query")
+        _, ns3 = res._enrich_nameservers(res.nameservers, {}, 53, res._doh_nameservers)
+        self.assertFalse(ns3._share_client)
+        ns2 = res._doh_nameservers["https://ns2.example/dns-query"]
+        self.assertTrue(ns2._share_client)
+
 
 class NaptrNanoNameserver(Server):
     def handle(self, request):
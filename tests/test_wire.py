@@ -88,6 +88,40 @@ class BinaryTestCase(unittest.TestCase):
             with p.restrict_to(5):
                 raise NotImplementedError
 
+    def test_restriction_restores_end(self):
+        wire = bytes.fromhex("0102010203040102")
+        p = dns.wire.Parser(wire)
+        with self.assertRaises(NotImplementedError):
+            with p.restrict_to(5):
+                raise NotImplementedError
+        self.assertEqual(p.end, len(wire))
+        with self.assertRaises(dns.exception.FormError):
+            with p.restrict_to(5):
+                pass
+        self.assertEqual(p.end, len(wire))
+
+    def test_bytes_like(self):
+        wire = b"\x03www\x09dnspython\x03org\x00\x00\x02\x00\x01\x00\x03abc"
+        for w in (bytearray(wire), memoryview(wire), memoryview(b"xx" + wire)[2:]):
+            p = dns.wire.Parser(w)
+            self.assertEqual(p.get_name(), dns.name.from_text("www.dnspython.org"))
+            self.assertEqual(p.get_struct("!HH"), (2, 1))
+            self.assertEqual(p.get_uint8(), 0)
+            value = p.get_counted_bytes()
+            self.assertEqual(value, b"abc")
+            self.assertIsInstance(value, bytes)
+            self.assertEqual(p.remaining(), 0)
+
+    def test_get_struct(self):
+        wire = bytes.fromhex("0102010203040102")
+        p = dns.wire.Parser(wire)
+        self.assertEqual(p.get_struct("!HI"), (0x0102, 0x01020304))
+        self.assertEqual(p.get_struct("!H"), (0x0102,))
+        p.seek(2)
+        with self.assertRaises(dns.exception.FormError):
+            p.get_struct("!II")
+        self.assertEqual(p.current, 2)
+
     def test_prefixed_length(self):
         out = io.BytesIO()
         with dns._render_util.prefixed_length(out, 1):
@@ -535,6 +535,20 @@ class ZoneTestCase(unittest.TestCase):
             f.write("\n")
         self.assertEqual(f.getvalue(), example_text_output)
 
+    def testFromTextWithPool(self):
+        pool = dns.name.NamePool()
+        z = dns.zone.from_text(example_text, "example.", relativize=True, pool=pool)
+        self.assertEqual(
+            z.to_text(), dns.zone.from_text(example_text, "example.").to_text()
+        )
+        ns1 = z.find_rdataset("@", "NS")[0].target
+        for name in z.nodes:
+            if name == ns1:
+                self.assertIs(name, ns1)
+        self.assertIs(pool.intern(dns.name.from_text("ns1", None)), ns1)
+        z2 = dns.zone.from_text(example_text, "example.", relativize=True, pool=pool)
+        self.assertIs(z2.find_rdataset("@", "NS")[0].target, ns1)
+
     def testGenerate(self):
         z = dns.zone.from_text(example_generate, "example.", relativize=True)
         f = StringIO()
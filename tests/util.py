@@ -19,11 +19,17 @@ import enum
 import functools
 import inspect
 import os
+import random
+import socket
+import threading
+import time
 
 import dns.exception
 import dns.message
 import dns.name
+import dns.nameserver
 import dns.query
+import dns.rdata
 import dns.rdataclass
 import dns.rdatatype
 
@@ -150,3 +156,227 @@ def retry_on_timeout(f):
             raise dns.exception.Timeout
 
     return wrapper
+
+
+class FakeNameserver(dns.nameserver.Nameserver):
+    """A nameserver which answers address queries without any I/O.
+
+    Every A query is answered with 10.0.0.1 and every AAAA query with
+    ::1, with the specified *ttl*, after waiting *delay* seconds.  If
+    *exception* is not ``None``, it is raised instead of answering.
+    The number of queries answered, or failed with *exception*, is kept in
+    *count*; queries which time out are not counted.
+    """
+
+    def __init__(self, name="fake", delay=0.0, ttl=300, exception=None):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.ttl = ttl
+        self.exception = exception
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __str__(self):
+        return self.name
+
+    def kind(self):
+        return "Fake"
+
+    def is_always_max_size(self):
+        return False
+
+    def answer_nameserver(self):
+        return self.name
+
+    def answer_port(self):
+        return 53
+
+    def _answer(self, request):
+        with self.lock:
+            self.count += 1
+        if self.exception is not None:
+            raise self.exception
+        response = dns.message.make_response(request)
+        question = request.question[0]
+        if question.rdtype == dns.rdatatype.A:
+            address = "10.0.0.1"
+        elif question.rdtype == dns.rdatatype.AAAA:
+            address = "::1"
+        else:
+            return response
+        rrset = response.find_rrset(
+            response.answer,
+            question.name,
+            question.rdclass,
+            question.rdtype,
+            create=True,
+        )
+        rrset.add(
+            dns.rdata.from_text(question.rdclass, question.rdtype, address), self.ttl
+        )
+        return response
+
+    def query(self, request, timeout, source, source_port, max_size, *args, **kwargs):
+        if self.delay:
+            time.sleep(min(self.delay, timeout))
+            if self.delay > timeout:
+                raise dns.exception.Timeout(timeout=timeout)
+        return self._answer(request)
+
+    async def async_query(
+        self, request, timeout, source, source_port, max_size, backend, *args, **kwargs
+    ):
+        if self.delay:
+            await backend.sleep(min(self.delay, timeout))
+            if self.delay > timeout:
+                raise dns.exception.Timeout(timeout=timeout)
+        return self._answer(request)
+
+
+class UDPResponder:
+    """A UDP nameserver on the loopback interface which answers like a
+    FakeNameserver.
+
+    Each query is answered after a random delay of up to *max_delay*
+    seconds, so responses are usually not sent in the order the queries
+    arrived.  If *bogus* is ``True``, each answer is preceded by a response
+    with the wrong ID.  The source addresses of the queries are collected in
+    *sources*.
+    """
+
+    def __init__(self, max_delay=0.0, bogus=False):
+        self.max_delay = max_delay
+        self.bogus = bogus
+        self.fake = FakeNameserver("udp")
+        self.sources = set()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.05)
+        self.address, self.port = self.sock.getsockname()
+        self.done = False
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.done = True
+        self.thread.join()
+        self.sock.close()
+
+    def _respond(self, request, source):
+        response = self.fake._answer(request)
+        if self.bogus:
+            bogus = dns.message.make_response(request)
+            bogus.id = (request.id + 1) % 65536
+            self.sock.sendto(bogus.to_wire(), source)
+        self.sock.sendto(response.to_wire(), source)
+
+    def _serve(self):
+        while not self.done:
+            try:
+                wire, source = self.sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            self.sources.add(source)
+            request = dns.message.from_wire(wire)
+            timer = threading.Timer(
+                random.uniform(0, self.max_delay),
+                self._respond,
+                (request, source),
+            )
+            timer.start()
+
+
+class TCPResponder:
+    """A TCP nameserver on the loopback interface which answers like a
+    FakeNameserver, for testing connection reuse and pipelining.
+
+    Each query is answered after a random delay of up to *max_delay*
+    seconds, so responses on a connection are usually out of order.  If
+    *tls* is ``True``, connections use TLS with the test certificate.  The
+    number of connections accepted is kept in *connections*.
+    """
+
+    def __init__(self, max_delay=0.0, tls=False):
+        self.max_delay = max_delay
+        self.fake = FakeNameserver("tcp")
+        self.connections = 0
+        self.sock = socket.create_server(("127.0.0.1", 0))
+        self.sock.settimeout(0.05)
+        self.address, self.port = self.sock.getsockname()
+        self.ssl_context = None
+        if tls:
+            import ssl
+
+            self.ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            self.ssl_context.load_cert_chain(
+                here("tls/public.crt"), here("tls/private.pem")
+            )
+        self.done = False
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.done = True
+        self.thread.join()
+        self.sock.close()
+
+    def _serve(self):
+        while not self.done:
+            try:
+                conn, _ = self.sock.accept()
+            except socket.timeout:
+                continue
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _respond(self, conn, lock, request):
+        wire = self.fake._answer(request).to_wire(prepend_length=True)
+        with lock:
+            try:
+                conn.sendall(wire)
+            except OSError:
+                pass
+
+    def _handle(self, conn):
+        # An SSL socket must not be used by two threads at once, so reads are
+        # done with the lock held and a short timeout, letting responses be
+        # written in between.
+        lock = threading.Lock()
+        buffer = b""
+        try:
+            if self.ssl_context is not None:
+                conn = self.ssl_context.wrap_socket(conn, server_side=True)
+            conn.settimeout(0.01)
+            with conn:
+                while not self.done:
+                    if len(buffer) >= 2:
+                        l = int.from_bytes(buffer[:2], "big")
+                        if len(buffer) >= l + 2:
+                            request = dns.message.from_wire(buffer[2 : l + 2])
+                            buffer = buffer[l + 2 :]
+                            threading.Timer(
+                                random.uniform(0, self.max_delay),
+                                self._respond,
+                                (conn, lock, request),
+                            ).start()
+                            continue
+                    with lock:
+                        try:
+                            data = conn.recv(65535)
+                        except socket.timeout:
+                            data = None
+                    if data is None:
+                        time.sleep(0.001)
+                        continue
+                    if not data:
+                        return
+                    buffer += data
+        except OSError:
+            pass